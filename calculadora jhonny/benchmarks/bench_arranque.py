@@ -0,0 +1,62 @@
+"""Mide el tiempo de importación en frío del módulo de cálculo frente a la GUI.
+
+Cada medición se hace en un intérprete nuevo para que no haya módulos en caché.
+Uso:  python benchmarks/bench_arranque.py [repeticiones]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+CARPETA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Escenarios: nombre -> código a importar en un intérprete limpio
+ESCENARIOS = {
+    "colas (cálculo)": "import colas",
+    "main (GUI, reportlab diferido)": "import main",
+    # Exactamente lo que importaba main.py antes de separar el cálculo (sin numpy)
+    "main original (tkinter + reportlab)": (
+        "import tkinter as tk\n"
+        "from tkinter import ttk, messagebox\n"
+        "from reportlab.lib.pagesizes import letter\n"
+        "from reportlab.lib import colors\n"
+        "from reportlab.lib.styles import getSampleStyleSheet\n"
+        "from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer\n"
+        "import math\n"
+        "from tkinter import font\n"
+        "import os\n"
+        "import sys\n"
+        "from datetime import datetime"
+    ),
+}
+
+PLANTILLA = (
+    "import time\n"
+    "t0 = time.perf_counter()\n"
+    "{codigo}\n"
+    "print(time.perf_counter() - t0)\n"
+)
+
+def medir(codigo, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, "-c", PLANTILLA.format(codigo=codigo)],
+            cwd=CARPETA_APP, capture_output=True, text=True, check=True,
+        )
+        tiempos.append(float(salida.stdout.strip()))
+    return tiempos
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"Importación en frío ({repeticiones} repeticiones, mediana / mínimo en ms)")
+    for nombre, codigo in ESCENARIOS.items():
+        try:
+            tiempos = medir(codigo, repeticiones)
+        except subprocess.CalledProcessError as error:
+            print(f"  {nombre:<40} no disponible: {error.stderr.strip().splitlines()[-1]}")
+            continue
+        print(f"  {nombre:<40} {statistics.median(tiempos) * 1000:8.1f} {min(tiempos) * 1000:8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Tiempo de arranque del ejecutable hasta la primera ventana, comparando builds.
+
+Cada programa se lanza con CALCULADORA_SALIR_AL_MOSTRAR=<archivo>: la
+aplicación anota en ese archivo la hora en que se dibuja la ventana principal
+y se cierra. El tiempo medido va del lanzamiento a esa hora, así que incluye
+la descompresión del ejecutable de un solo archivo pero no su limpieza al
+salir. La primera corrida de cada programa es la "fría" (con --vaciar-cache,
+en Linux y como root, se vacía antes la caché de páginas); las demás se
+resumen con la mediana.
+
+    pyinstaller --noconfirm main.spec           # dist/main.exe (un archivo, UPX)
+    pyinstaller --noconfirm main_rapido.spec    # dist/main_rapido/main.exe (carpeta)
+    python benchmarks/bench_ejecutable.py dist/main.exe dist/main_rapido/main.exe
+    python benchmarks/bench_ejecutable.py --python --repeticiones 10
+
+Para el tiempo de importación de los módulos (sin ventana) está bench_arranque.py.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CARPETA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def vaciar_cache():
+    subprocess.run(["sync"], check=True)
+    with open("/proc/sys/vm/drop_caches", "w") as archivo:
+        archivo.write("3\n")
+
+def arrancar(comando):
+    """Segundos desde el lanzamiento hasta que se dibuja la primera ventana."""
+    with tempfile.TemporaryDirectory() as carpeta:
+        marca = os.path.join(carpeta, "mostrada")
+        entorno = dict(os.environ, CALCULADORA_SALIR_AL_MOSTRAR=marca)
+        inicio = time.time()
+        subprocess.run(comando, cwd=CARPETA_APP, env=entorno, check=True, timeout=120)
+        with open(marca) as archivo:
+            return float(archivo.read()) - inicio
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("ejecutables", nargs="*", help="programas a comparar (p. ej. dist/main.exe)")
+    parser.add_argument("--python", action="store_true", help="incluir main.py ejecutado con este intérprete")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--vaciar-cache", action="store_true", help="vaciar la caché de páginas antes de la corrida fría")
+    args = parser.parse_args()
+
+    programas = [(ruta, [os.path.abspath(ruta)]) for ruta in args.ejecutables]
+    if args.python:
+        programas.append(("python main.py", [sys.executable, "main.py"]))
+    if not programas:
+        parser.error("indicar ejecutables o --python")
+
+    print(f"{'programa':<40} {'frío':>9} {'tibio (mediana)':>16} {'mín':>9}")
+    for nombre, comando in programas:
+        if args.vaciar_cache:
+            vaciar_cache()
+        frio = arrancar(comando)
+        tibios = [arrancar(comando) for _ in range(max(args.repeticiones - 1, 1))]
+        print(f"{nombre:<40} {frio * 1000:>7.0f} ms {statistics.median(tibios) * 1000:>13.0f} ms "
+              f"{min(tibios) * 1000:>7.0f} ms")
+
+if __name__ == "__main__":
+    main()
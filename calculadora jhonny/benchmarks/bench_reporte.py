@@ -0,0 +1,43 @@
+"""Tiempo y memoria pico (RSS) de generar_reporte según el número de estados.
+
+Cada tamaño se mide en un proceso nuevo para que el RSS pico no se arrastre
+entre mediciones. Uso:  python benchmarks/bench_reporte.py [estados ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+CARPETA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se usa M/M/1/N con N = estados - 1 para fijar exactamente el número de filas
+MEDICION = """
+import resource, sys, time
+from colas import calcular_con_limite_cola
+from reporte import generar_reporte
+resultados = calcular_con_limite_cola(0.9, 1.0, {N})
+t0 = time.perf_counter()
+generar_reporte(resultados, filename=sys.argv[1], max_estados=None)
+t = time.perf_counter() - t0
+print(t, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def medir(estados):
+    with tempfile.TemporaryDirectory() as carpeta:
+        destino = os.path.join(carpeta, "reporte.pdf")
+        salida = subprocess.run(
+            [sys.executable, "-c", MEDICION.format(N=estados - 1), destino],
+            cwd=CARPETA_APP, capture_output=True, text=True, check=True,
+        )
+        tiempo, rss_kb = salida.stdout.split()
+        return float(tiempo), int(rss_kb) / 1024, os.path.getsize(destino) / 1024
+
+def main():
+    tamanos = [int(x) for x in sys.argv[1:]] or [100, 1000, 10000, 100000]
+    print(f"{'estados':>10} {'tiempo (s)':>12} {'RSS pico (MB)':>14} {'PDF (KB)':>10}")
+    for estados in tamanos:
+        tiempo, rss, tamano = medir(estados)
+        print(f"{estados:>10} {tiempo:>12.2f} {rss:>14.1f} {tamano:>10.0f}")
+
+if __name__ == "__main__":
+    main()
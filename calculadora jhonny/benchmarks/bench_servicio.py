@@ -0,0 +1,123 @@
+"""Generador de carga contra el modo servicio en localhost.
+
+Levanta ``main.py --servicio`` en un proceso aparte (puerto libre), abre
+varias conexiones keep-alive concurrentes y mide rendimiento y latencia del
+lado del cliente; al final muestra las métricas del servicio (tamaño medio de
+lote, peticiones pesadas). Con --ventana-ms 0 se ve el efecto de no agrupar:
+
+    python benchmarks/bench_servicio.py --conexiones 64 --peticiones 20000
+    python benchmarks/bench_servicio.py --ventana-ms 0
+    python benchmarks/bench_servicio.py --pesadas 0.01
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+CARPETA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def peticion_aleatoria(rng, fraccion_pesadas):
+    rho = rng.uniform(0.1, 0.999)
+    if rng.random() < fraccion_pesadas:
+        return {"modelo": "con_limite", "lambda": rho, "mu": 1.0, "N": 10 ** 6, "estados": [0, 20000]}
+    modelo = rng.choice(["sin_limite", "con_limite", "multiservidor"])
+    if modelo == "sin_limite":
+        return {"modelo": modelo, "lambda": rho, "mu": 1.0, "cuantiles": [0.99]}
+    if modelo == "con_limite":
+        return {"modelo": modelo, "lambda": rho, "mu": 1.0, "N": rng.randint(1, 10 ** 6)}
+    c = rng.randint(1, 200)
+    return {"modelo": modelo, "lambda": rho * c, "mu": 1.0, "c": c}
+
+async def pedir(reader, writer, metodo, ruta, cuerpo=b""):
+    writer.write(
+        f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1") + cuerpo
+    )
+    await writer.drain()
+    estado = (await reader.readline()).split()[1]
+    longitud = 0
+    while True:
+        linea = await reader.readline()
+        if linea in (b"\r\n", b""):
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        if nombre.lower() == "content-length":
+            longitud = int(valor)
+    return int(estado), json.loads(await reader.readexactly(longitud))
+
+async def conectar(destino):
+    if destino.startswith("unix:"):
+        return await asyncio.open_unix_connection(destino[5:])
+    host, puerto = destino.rsplit(":", 1)
+    return await asyncio.open_connection(host, int(puerto))
+
+async def cliente(destino, cuerpos, latencias, errores):
+    reader, writer = await conectar(destino)
+    for cuerpo in cuerpos:
+        t0 = time.perf_counter()
+        estado, _ = await pedir(reader, writer, "POST", "/calcular", cuerpo)
+        latencias.append(time.perf_counter() - t0)
+        if estado != 200:
+            errores.append(estado)
+    writer.close()
+
+async def generar_carga(destino, conexiones, peticiones, fraccion_pesadas, semilla):
+    rng = random.Random(semilla)
+    cuerpos = [json.dumps(peticion_aleatoria(rng, fraccion_pesadas)).encode() for _ in range(peticiones)]
+    latencias, errores = [], []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(cliente(destino, cuerpos[i::conexiones], latencias, errores) for i in range(conexiones)))
+    total = time.perf_counter() - t0
+
+    reader, writer = await conectar(destino)
+    _, metricas = await pedir(reader, writer, "GET", "/metricas")
+    writer.close()
+    return total, sorted(latencias), errores, metricas
+
+def iniciar_servicio(ventana_ms, socket):
+    comando = [sys.executable, os.path.join(CARPETA_APP, "main.py"), "--servicio", "--ventana-ms", str(ventana_ms)]
+    comando += ["--socket", socket] if socket else ["--puerto", "0"]
+    proceso = subprocess.Popen(comando, cwd=CARPETA_APP, stdout=subprocess.PIPE, text=True)
+    linea = proceso.stdout.readline()  # "Servicio de colas escuchando en ..."
+    if not linea:
+        raise RuntimeError("el servicio no arrancó")
+    direccion = linea.strip().rsplit(" ", 1)[1]
+    return proceso, f"unix:{direccion}" if socket else direccion.removeprefix("http://")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conexiones", type=int, default=64)
+    parser.add_argument("--peticiones", type=int, default=20000)
+    parser.add_argument("--pesadas", type=float, default=0.0, help="fracción de peticiones pesadas")
+    parser.add_argument("--ventana-ms", type=float, default=2.0)
+    parser.add_argument("--socket", help="usar un socket Unix en esta ruta")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    proceso, destino = iniciar_servicio(args.ventana_ms, args.socket)
+    try:
+        total, latencias, errores, metricas = asyncio.run(
+            generar_carga(destino, args.conexiones, args.peticiones, args.pesadas, args.semilla)
+        )
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+    def percentil(p):
+        return latencias[min(int(p * len(latencias)), len(latencias) - 1)] * 1000
+
+    print(f"{args.peticiones} peticiones, {args.conexiones} conexiones, ventana {args.ventana_ms} ms")
+    print(f"  rendimiento: {args.peticiones / total:,.0f} peticiones/s ({total:.2f} s)")
+    print(f"  latencia cliente: p50 {percentil(0.5):.2f} ms  p90 {percentil(0.9):.2f} ms  "
+          f"p99 {percentil(0.99):.2f} ms  media {statistics.fmean(latencias) * 1000:.2f} ms")
+    print(f"  errores: {len(errores)}")
+    print(f"  servicio: {metricas['lotes']} lotes, {metricas['tamano_medio_lote']:.1f} peticiones por lote, "
+          f"{metricas['pesadas']} pesadas")
+
+if __name__ == "__main__":
+    main()
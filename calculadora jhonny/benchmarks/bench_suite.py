@@ -0,0 +1,195 @@
+"""Suite de benchmarks de los caminos críticos de la calculadora.
+
+Mide tiempo de pared, memoria pico (tracemalloc) y bloques asignados para:
+cálculo de ambos modelos, construcción y recorrido de la distribución,
+generar_reporte y el llenado de la tabla de mostrar_resultados (este último
+solo si hay display, p. ej. bajo Xvfb). Los resultados se guardan en JSON y
+pueden compararse con una corrida anterior:
+
+    python benchmarks/bench_suite.py -o actual.json
+    python benchmarks/bench_suite.py -o nueva.json --comparar actual.json --umbral 0.2
+
+Con --comparar el proceso termina con código 1 si algún caso se hizo más lento
+que el umbral relativo.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from colas import DistribucionEstados, calcular_sin_limite_cola, calcular_con_limite_cola
+
+RHOS = [0.5, 0.9, 0.99, 0.999, 0.9999]
+NS = [10, 1000, 100000, 1000000]
+# generar_reporte es lineal en estados y lento por página; se limita la grilla
+NS_REPORTE = [10, 1000, 10000]
+
+def medir(funcion, repeticiones):
+    """Devuelve tiempo mediano, memoria pico y bloques netos asignados de funcion()."""
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t0)
+
+    # Memoria en una corrida aparte para que tracemalloc no afecte los tiempos
+    bloques_antes = sys.getallocatedblocks()
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "tiempo_s": statistics.median(tiempos),
+        "tiempo_min_s": min(tiempos),
+        "memoria_pico_bytes": pico,
+        "bloques_asignados": sys.getallocatedblocks() - bloques_antes,
+    }
+
+def casos_calculo():
+    for rho in RHOS:
+        yield "calcular_sin_limite_cola", {"rho": rho}, lambda rho=rho: calcular_sin_limite_cola(rho, 1.0)
+    for rho in RHOS:
+        for N in NS:
+            yield "calcular_con_limite_cola", {"rho": rho, "N": N}, lambda rho=rho, N=N: calcular_con_limite_cola(rho, 1.0, N)
+
+def casos_distribucion():
+    def recorrer(distribucion):
+        for _ in distribucion:
+            pass
+
+    for rho in RHOS:
+        yield "distribucion_sin_limite", {"rho": rho}, lambda rho=rho: recorrer(DistribucionEstados(rho))
+    for rho in RHOS:
+        for N in NS:
+            yield "distribucion_con_limite", {"rho": rho, "N": N}, lambda rho=rho, N=N: recorrer(DistribucionEstados(rho, N))
+            yield "cuantil_con_limite", {"rho": rho, "N": N}, lambda rho=rho, N=N: DistribucionEstados(rho, N).cuantil(0.99)
+
+def casos_reporte(carpeta):
+    from reporte import generar_reporte
+
+    destino = os.path.join(carpeta, "reporte.pdf")
+    for N in NS_REPORTE:
+        resultados = calcular_con_limite_cola(0.9, 1.0, N)
+        yield "generar_reporte", {"rho": 0.9, "N": N}, lambda r=resultados: generar_reporte(r, filename=destino, max_estados=None)
+
+def clase_ventana_prueba():
+    """Ventana mínima con lo que usa mostrar_resultados, sin crear la ventana completa."""
+    from componentes import CAMPOS_CON_LIMITE
+    from main import VentanaModelo
+
+    class VentanaPrueba:
+        campos = CAMPOS_CON_LIMITE
+        mostrar_resultados = VentanaModelo.mostrar_resultados
+        mostrar_simulacion = VentanaModelo.mostrar_simulacion
+
+        def __init__(self, resultados_frame):
+            self.panel_resultados = None
+            self.tabla_simulacion = None
+            self.resultados_frame = resultados_frame
+
+    return VentanaPrueba
+
+def casos_tabla():
+    import tkinter as tk
+
+    try:
+        raiz = tk.Tk()
+    except tk.TclError:
+        print("Sin display: se omite mostrar_resultados (usar xvfb-run).", file=sys.stderr)
+        return
+    raiz.withdraw()
+
+    VentanaPrueba = clase_ventana_prueba()
+    for rho in RHOS:
+        for N in NS:
+            ventana = VentanaPrueba(tk.Frame(raiz))
+            ventana.resultados = calcular_con_limite_cola(rho, 1.0, N)
+
+            def mostrar(ventana=ventana):
+                ventana.mostrar_resultados()
+                raiz.update_idletasks()
+            yield "mostrar_resultados", {"rho": rho, "N": N}, mostrar
+            ventana.resultados_frame.destroy()
+    raiz.destroy()
+
+def comparar(actual, base, umbral, minimo_s=0.0):
+    """Lista los casos cuyo tiempo supera al de la base en más del umbral relativo.
+
+    Los casos que en ambas corridas duran menos de ``minimo_s`` se ignoran
+    porque a esa escala domina el ruido de medición.
+    """
+    indice = {(r["caso"], json.dumps(r["parametros"], sort_keys=True)): r for r in base["resultados"]}
+    regresiones = []
+    for r in actual["resultados"]:
+        anterior = indice.get((r["caso"], json.dumps(r["parametros"], sort_keys=True)))
+        if anterior is None or anterior["tiempo_s"] <= 0:
+            continue
+        if max(anterior["tiempo_s"], r["tiempo_s"]) < minimo_s:
+            continue
+        cambio = r["tiempo_s"] / anterior["tiempo_s"] - 1
+        if cambio > umbral:
+            regresiones.append((r["caso"], r["parametros"], anterior["tiempo_s"], r["tiempo_s"], cambio))
+    return regresiones
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--salida", default="bench_resultados.json")
+    parser.add_argument("-r", "--repeticiones", type=int, default=5)
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    parser.add_argument("--umbral", type=float, default=0.2, help="lentitud relativa tolerada (0.2 = 20%%)")
+    parser.add_argument("--minimo-ms", type=float, default=1.0, help="ignorar casos más rápidos que esto al comparar")
+    parser.add_argument("--sin-reporte", action="store_true")
+    parser.add_argument("--sin-gui", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        grupos = [casos_calculo(), casos_distribucion()]
+        if not args.sin_reporte:
+            grupos.append(casos_reporte(carpeta))
+        if not args.sin_gui:
+            grupos.append(casos_tabla())
+
+        resultados = []
+        for grupo in grupos:
+            for caso, parametros, funcion in grupo:
+                medicion = medir(funcion, args.repeticiones)
+                resultados.append({"caso": caso, "parametros": parametros, **medicion})
+                print(f"{caso:<26} {json.dumps(parametros):<28} {medicion['tiempo_s'] * 1000:10.3f} ms "
+                      f"{medicion['memoria_pico_bytes'] / 1024:10.1f} KiB")
+
+    informe = {
+        "metadatos": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "repeticiones": args.repeticiones,
+        },
+        "resultados": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2)
+    print(f"Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(informe, base, args.umbral, args.minimo_ms / 1000)
+        for caso, parametros, antes, ahora, cambio in regresiones:
+            print(f"REGRESIÓN {caso} {json.dumps(parametros)}: {antes * 1000:.3f} ms -> {ahora * 1000:.3f} ms (+{cambio:.0%})")
+        if regresiones:
+            sys.exit(1)
+        print(f"Sin regresiones por encima de {args.umbral:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Caché LRU de resultados de los modelos de colas compartida por toda la aplicación.
+
+La clave es la tupla normalizada (modelo, λ, μ, N, c), donde N es la
+capacidad del sistema (N en M/M/1/N, K en M/M/c/K) y c el número de
+servidores del modelo "multiservidor". Puede usarse tanto desde las ventanas
+de la GUI como desde código sin interfaz gráfica:
+
+    from cache_resultados import calcular_con_cache
+    resultados = calcular_con_cache("con_limite", 2, 3, 10)
+    resultados = calcular_con_cache("multiservidor", 40, 1, None, 50, registrar=True)
+
+Si la clave no está en memoria se busca en el historial persistente (caché
+tibia entre sesiones) antes de calcular; solo se reconstruye la distribución.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from colas import DistribucionEstados, calcular_sin_limite_cola, calcular_con_limite_cola
+from historial import COLUMNAS_METRICAS, obtener_historial
+from instrumentacion import contar, etapa
+from multiservidor import DistribucionMultiservidor, calcular_mmc, calcular_mmck
+
+# Funciones de cálculo por modelo; reciben los parámetros de la clave sin el modelo
+MODELOS = {
+    "sin_limite": lambda lambda_, mu, N, c: calcular_sin_limite_cola(lambda_, mu),
+    "con_limite": lambda lambda_, mu, N, c: calcular_con_limite_cola(lambda_, mu, N),
+    "multiservidor": lambda lambda_, mu, N, c: calcular_mmc(lambda_, mu, c) if N is None else calcular_mmck(lambda_, mu, c, N),
+}
+
+def normalizar_clave(modelo, lambda_, mu, N=None, c=None):
+    """Clave canónica: 2, 2.0 y "2" producen la misma entrada.
+
+    Los parámetros que el modelo no usa (N en sin_limite, c fuera de
+    multiservidor) se descartan para no guardar dos veces el mismo resultado.
+    """
+    if modelo not in MODELOS:
+        raise KeyError(f"modelo desconocido: {modelo}")
+    if modelo == "sin_limite":
+        N = None
+    if modelo != "multiservidor":
+        c = None
+    return (modelo, float(lambda_), float(mu), None if N is None else int(N), None if c is None else int(c))
+
+def desde_historial(fila):
+    """Reconstruye el dict de resultados de una fila del historial.
+
+    Los escalares vienen de la base; solo se crea la distribución, que es
+    perezosa y no recorre estados.
+    """
+    modelo, lambda_, mu, N, c = fila["modelo"], fila["lambda"], fila["mu"], fila["N"], fila["c"]
+    resultados = {"lambda": lambda_, "mu": mu}
+    resultados.update((clave, fila[clave]) for clave in COLUMNAS_METRICAS if fila[clave] is not None)
+    if modelo == "multiservidor":
+        resultados["c"] = c
+        if N is not None:
+            resultados["K"] = N
+        resultados["distribucion"] = DistribucionMultiservidor(lambda_, mu, c, N)
+    else:
+        resultados["distribucion"] = DistribucionEstados(resultados["rho"], N)
+    return resultados
+
+def tamano_aproximado(resultados):
+    """Estimación en bytes de la memoria que ocupa un dict de resultados.
+
+    Las distribuciones son perezosas: no guardan estados, pero M/M/c guarda
+    arreglos de c valores (los estados n < c), que se cuentan por su nbytes.
+    """
+    total = sys.getsizeof(resultados)
+    for valor in resultados.values():
+        total += sys.getsizeof(valor)
+        if isinstance(valor, DistribucionEstados):
+            atributos = vars(valor)
+            total += sys.getsizeof(atributos)
+            total += sum(a.nbytes if isinstance(a, np.ndarray) else sys.getsizeof(a) for a in atributos.values())
+    return total
+
+class CacheResultados:
+    """Caché LRU con límite de entradas y de memoria, y contadores de uso; segura entre hilos."""
+
+    def __init__(self, max_entradas=128, memoria_maxima=64 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.memoria_maxima = memoria_maxima
+        self._entradas = OrderedDict()  # clave -> (resultados, tamaño)
+        self._memoria = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.aciertos_historial = 0
+
+    def configurar(self, max_entradas=None, memoria_maxima=None):
+        with self._lock:
+            if max_entradas is not None:
+                self.max_entradas = max_entradas
+            if memoria_maxima is not None:
+                self.memoria_maxima = memoria_maxima
+            self._desalojar()
+
+    def obtener(self, modelo, lambda_, mu, N=None, c=None, historial=None):
+        """Devuelve el resultado en caché o lo calcula y lo guarda.
+
+        Con ``historial`` un fallo en memoria se busca primero en la base
+        persistente. Las excepciones del cálculo (p. ej.
+        SistemaInestableError) se propagan y no se guardan.
+        """
+        clave = normalizar_clave(modelo, lambda_, mu, N, c)
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                contar("aciertos_cache")
+                return self._entradas[clave][0]
+            self.fallos += 1
+
+        fila = historial.buscar(*clave) if historial is not None else None
+        if fila is not None:
+            with self._lock:
+                self.aciertos_historial += 1
+            contar("aciertos_historial")
+            resultados = desde_historial(fila)
+        else:
+            resultados = MODELOS[modelo](*clave[1:])
+        self.guardar(clave, resultados)
+        return resultados
+
+    def guardar(self, clave, resultados):
+        tamano = tamano_aproximado(resultados)
+        with self._lock:
+            if clave in self._entradas:
+                self._memoria -= self._entradas.pop(clave)[1]
+            self._entradas[clave] = (resultados, tamano)
+            self._memoria += tamano
+            self._desalojar()
+
+    def _desalojar(self):
+        # Quita las entradas menos usadas hasta respetar ambos límites (deja al menos una)
+        while len(self._entradas) > 1 and (
+            len(self._entradas) > self.max_entradas or self._memoria > self.memoria_maxima
+        ):
+            _, (_, tamano) = self._entradas.popitem(last=False)
+            self._memoria -= tamano
+            self.desalojos += 1
+
+    def __contains__(self, clave):
+        with self._lock:
+            return clave in self._entradas
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entradas)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._memoria = 0
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "memoria": self._memoria,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "aciertos_historial": self.aciertos_historial,
+            }
+
+# Instancia compartida por toda la aplicación
+cache = CacheResultados()
+
+def calcular_con_cache(modelo, lambda_, mu, N=None, c=None, registrar=False):
+    """Resultado desde la caché en memoria, el historial persistente o calculado.
+
+    Con ``registrar`` el cálculo se agrega al historial (como hace la GUI
+    con cada cálculo pedido por el usuario).
+    """
+    historial = obtener_historial()
+    with etapa("calcular", modelo=modelo):
+        resultados = cache.obtener(modelo, lambda_, mu, N, c, historial=historial)
+    if registrar:
+        _, _, _, N, c = normalizar_clave(modelo, lambda_, mu, N, c)
+        with etapa("registrar", modelo=modelo):
+            historial.registrar(modelo, resultados, N=N, c=c)
+    return resultados
@@ -0,0 +1,276 @@
+"""Modelos de colas M/M/1 y M/M/1/N sin dependencias de interfaz gráfica ni PDF.
+
+Este módulo puede importarse desde servicios o procesos por lotes sin cargar
+tkinter ni reportlab. Los errores se reportan con excepciones tipadas.
+"""
+import math
+import numpy as np
+
+# Excepciones de los modelos de colas
+class ErrorModeloColas(Exception):
+    """Error base de los cálculos de modelos de colas."""
+
+class SistemaInestableError(ErrorModeloColas):
+    """El sistema no alcanza estado estacionario (μ ≤ λ en el modelo sin límite)."""
+
+# Columnas que devuelven los evaluadores por lotes
+COLUMNAS_RESULTADOS = ("lambda", "mu", "rho", "Po", "Ls", "Lq", "Ws", "Wq", "lambda_efectiva")
+
+# Evaluación vectorizada de los modelos de colas sobre arreglos de parámetros
+def evaluar_lote_sin_limite(lambda_, mu):
+    """Evalúa M/M/1 para arreglos (o escalares) de λ y μ compatibles por broadcasting.
+
+    Devuelve un dict de arreglos columnares más la máscara "estable" (μ > λ);
+    los escenarios inestables quedan en NaN en lugar de mostrar un error.
+    """
+    lambda_, mu = np.broadcast_arrays(np.asarray(lambda_, dtype=float), np.asarray(mu, dtype=float))
+    estable = mu > lambda_
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = lambda_ / mu
+        Po = np.where(estable, 1 - rho, np.nan)
+        Ls = np.where(estable, lambda_ / (mu - lambda_), np.nan)
+        Lq = Ls - rho
+        Ws = Ls / lambda_
+        Wq = Lq / lambda_
+    lambda_efectiva = np.where(estable, lambda_, np.nan)
+
+    return {
+        "lambda": lambda_,
+        "mu": mu,
+        "rho": rho,
+        "Po": Po,
+        "Ls": Ls,
+        "Lq": Lq,
+        "Ws": Ws,
+        "Wq": Wq,
+        "lambda_efectiva": lambda_efectiva,
+        "estable": estable
+    }
+
+def _geometrica_truncada(rho, N):
+    """P₀, P_N y Ls de la distribución geométrica truncada en 0..N, sin desbordes.
+
+    Con ρ > 1 se trabaja con r = 1/ρ y los estados contados desde N, así
+    r ≤ 1 siempre. Las diferencias 1 - r^k se evalúan con expm1 y, cuando
+    x(N + 1) es muy chico (r = e^-x ≈ 1, incluido ρ = 1), Ls usa su
+    desarrollo N/2 - x·N(N + 2)/12 para evitar la cancelación.
+    """
+    invertida = rho > 1
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        x = np.abs(np.log(rho))  # r = e^-x con r = min(ρ, 1/ρ)
+        cerca_de_uno = x * (N + 1) < 1e-4
+        # base = (1 - r) / (1 - r^(N+1)); con r = 1 vale 1 / (N + 1)
+        base = np.where(x == 0, 1 / (N + 1), np.expm1(-x) / np.expm1(-x * (N + 1)))
+        r_N = np.exp(-x * N)
+        # Media de la geométrica truncada con razón r
+        media = np.where(
+            cerca_de_uno,
+            N / 2 - x * N * (N + 2) / 12,
+            1 / np.expm1(x) - (N + 1) / np.expm1(x * (N + 1))
+        )
+    Po = np.where(invertida, base * r_N, base)
+    P_N = np.where(invertida, base, base * r_N)
+    Ls = np.where(invertida, N - media, media)
+    return Po, P_N, Ls
+
+def evaluar_lote_con_limite(lambda_, mu, N):
+    """Evalúa M/M/1/N para arreglos (o escalares) de λ, μ y N compatibles por broadcasting.
+
+    Es estable para ρ = 1 (límite uniforme) y para ρ > 1 con N grande.
+    """
+    lambda_, mu, N = np.broadcast_arrays(
+        np.asarray(lambda_, dtype=float), np.asarray(mu, dtype=float), np.asarray(N, dtype=float)
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = lambda_ / mu
+        Po, prob_bloqueo, Ls = _geometrica_truncada(rho, N)
+        Lq = Ls - (1 - Po)
+        lambda_efectiva = lambda_ * (1 - prob_bloqueo)  # Solo entran las llegadas que no encuentran N clientes
+        Ws = Ls / lambda_efectiva
+        Wq = Lq / lambda_efectiva
+
+    return {
+        "lambda": lambda_,
+        "mu": mu,
+        "N": N,
+        "rho": rho,
+        "Po": Po,
+        "Ls": Ls,
+        "Lq": Lq,
+        "Ws": Ws,
+        "Wq": Wq,
+        "lambda_efectiva": lambda_efectiva,
+        "prob_bloqueo": prob_bloqueo,
+        "estable": np.ones(rho.shape, dtype=bool)  # Con capacidad finita siempre hay estado estacionario
+    }
+
+def curva_capacidad(lambda_, mu, N_max):
+    """Evalúa M/M/1/N para todo N = 1..N_max en una sola pasada O(N_max).
+
+    Usa sumas acumuladas de r^n y n·r^n con r = min(ρ, 1/ρ) ≤ 1, de modo que
+    no hay desbordes para ρ > 1 ni división por cero con ρ = 1. Devuelve un
+    dict de arreglos de largo N_max indexados por "N".
+    """
+    rho = lambda_ / mu
+    n = np.arange(N_max + 1, dtype=float)
+    if rho == 1:
+        potencias = np.ones(N_max + 1)
+    elif rho == 0:
+        potencias = (n == 0).astype(float)
+    else:
+        potencias = np.exp(-abs(math.log(rho)) * n)  # r^n, se anula sin error si r^n < 1e-308
+
+    # A_N = Σ r^n y B_N = Σ n·r^n para n = 0..N, acumuladas incrementalmente
+    A = np.cumsum(potencias)[1:]
+    B = np.cumsum(n * potencias)[1:]
+    N = n[1:]
+    r_N = potencias[1:]
+    if rho > 1:
+        # Estados contados desde N: el peso de n es r^(N-n)
+        prob_bloqueo = 1 / A
+        Po = r_N / A
+        Ls = N - B / A
+    else:
+        Po = 1 / A
+        prob_bloqueo = r_N / A
+        Ls = B / A
+
+    Lq = Ls - (1 - Po)
+    lambda_efectiva = lambda_ * (1 - prob_bloqueo)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Ws = Ls / lambda_efectiva
+        Wq = Lq / lambda_efectiva
+
+    return {
+        "N": N.astype(int),
+        "rho": rho,
+        "Po": Po,
+        "Ls": Ls,
+        "Lq": Lq,
+        "Ws": Ws,
+        "Wq": Wq,
+        "lambda_efectiva": lambda_efectiva,
+        "prob_bloqueo": prob_bloqueo
+    }
+
+def _escalares(lote):
+    # Convierte un lote de un solo escenario en valores escalares de Python
+    return {clave: lote[clave].item() for clave in COLUMNAS_RESULTADOS}
+
+# Distribución de probabilidad de estados evaluada bajo demanda
+class DistribucionEstados:
+    """Distribución geométrica (truncada si hay límite N) de los estados del sistema.
+
+    P(n) y P(≤n) se calculan en O(1) con las fórmulas cerradas; las filas se
+    generan solo cuando se recorren o se piden por índice o rebanada.
+    """
+
+    def __init__(self, rho, N=None, umbral=0.9999):
+        self.rho = rho
+        self.N = N
+        self.umbral = umbral
+        if N is not None:
+            self.ultimo_estado = int(N)
+        else:
+            self.ultimo_estado = self.cuantil(umbral)
+
+    def probabilidad(self, n):
+        """P(n): probabilidad de que haya exactamente n clientes en el sistema."""
+        rho = self.rho
+        if n < 0 or (self.N is not None and n > self.N):
+            return 0.0
+        if self.N is None:
+            return (1 - rho) * rho ** n
+        if rho == 1:
+            return 1 / (self.N + 1)
+        if rho < 1:
+            return (1 - rho) * rho ** n / (1 - rho ** (self.N + 1))
+        # Con ρ > 1 se trabaja con s = 1/ρ para no desbordar ρ ** N
+        s = 1 / rho
+        return s ** (self.N - n) * (1 - s) / (1 - s ** (self.N + 1))
+
+    def acumulada(self, n):
+        """P(≤n): probabilidad de que haya a lo sumo n clientes en el sistema."""
+        rho = self.rho
+        if n < 0:
+            return 0.0
+        if self.N is None:
+            return 1 - rho ** (n + 1)
+        if n >= self.N:
+            return 1.0
+        if rho == 1:
+            return (n + 1) / (self.N + 1)
+        if rho < 1:
+            return (1 - rho ** (n + 1)) / (1 - rho ** (self.N + 1))
+        s = 1 / rho
+        return 1 - (1 - s ** (self.N - n)) / (1 - s ** (self.N + 1))
+
+    def cuantil(self, q):
+        """Menor estado n tal que P(≤n) ≥ q."""
+        if self.N is None:
+            if self.rho <= 0:
+                return 0
+            # 1 - ρ^(n+1) ≥ q  <=>  n + 1 ≥ log(1 - q) / log(ρ)
+            n = max(math.ceil(math.log(1 - q) / math.log(self.rho)) - 1, 0)
+        else:
+            # P(≤n) es creciente en n: búsqueda binaria sobre 0..N
+            inferior, superior = 0, int(self.N)
+            while inferior < superior:
+                medio = (inferior + superior) // 2
+                if self.acumulada(medio) >= q:
+                    superior = medio
+                else:
+                    inferior = medio + 1
+            n = inferior
+        # Corrección por redondeo de punto flotante
+        while n > 0 and self.acumulada(n - 1) >= q:
+            n -= 1
+        while self.acumulada(n) < q and (self.N is None or n < self.N):
+            n += 1
+        return n
+
+    def fila(self, n):
+        return (n, self.probabilidad(n), self.acumulada(n))
+
+    def estados(self, inicio=0, fin=None):
+        """Genera las filas (n, P(n), P(≤n)) en el rango [inicio, fin)."""
+        if fin is None or fin > len(self):
+            fin = len(self)
+        for n in range(max(inicio, 0), fin):
+            yield self.fila(n)
+
+    def __len__(self):
+        return self.ultimo_estado + 1
+
+    def __iter__(self):
+        return self.estados()
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self.fila(n) for n in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("estado fuera de la distribución")
+        return self.fila(indice)
+
+# Funciones para calcular los modelos de colas
+def calcular_sin_limite_cola(lambda_, mu):
+    lote = evaluar_lote_sin_limite(lambda_, mu)
+    if lote["estable"].item():
+        resultados = _escalares(lote)
+        # Distribución de probabilidad (truncada cuando P(Acum) alcanza 0.9999)
+        resultados["distribucion"] = DistribucionEstados(resultados["rho"])
+        return resultados
+    else:
+        raise SistemaInestableError("mu (μ) tiene que ser mayor que lambda (λ)")
+
+def calcular_con_limite_cola(lambda_, mu, N):
+    lote = evaluar_lote_con_limite(lambda_, mu, N)
+    resultados = _escalares(lote)
+    resultados["prob_bloqueo"] = lote["prob_bloqueo"].item()
+    # Distribución de probabilidad sobre los estados 0..N
+    resultados["distribucion"] = DistribucionEstados(resultados["rho"], N)
+    return resultados
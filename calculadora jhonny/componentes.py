@@ -0,0 +1,308 @@
+"""Componentes de interfaz reutilizados por las ventanas de los modelos."""
+from tkinter import ttk, messagebox
+
+import instrumentacion
+from historial import FILAS_POR_PAGINA
+
+# Campos mostrados en el panel de resultados: (clave, etiqueta, formato)
+CAMPOS_SIN_LIMITE = [
+    ("lambda", "Tasa de llegada (λ)", "{}"),
+    ("mu", "Tasa de servicio (μ)", "{}"),
+    ("rho", "Rho (ρ)", "{:.4f}"),
+    ("Po", "Probabilidad de sistema vacío (P₀)", "{:.4f}"),
+    ("Ls", "Número esperado en el sistema (L)", "{:.4f}"),
+    ("Lq", "Número esperado en la cola (Lq)", "{:.4f}"),
+    ("Ws", "Tiempo esperado en el sistema (W)", "{:.4f}"),
+    ("Wq", "Tiempo esperado en la cola (Wq)", "{:.4f}"),
+]
+CAMPOS_CON_LIMITE = CAMPOS_SIN_LIMITE + [
+    ("lambda_efectiva", "Tasa de llegada efectiva (λ_efectiva)", "{:.4f}"),
+]
+# Los campos que no aplican al modelo (p. ej. K en M/M/c) se muestran con "—"
+CAMPOS_MULTISERVIDOR = CAMPOS_CON_LIMITE + [
+    ("c", "Servidores (c)", "{}"),
+    ("K", "Capacidad del sistema (K)", "{}"),
+    ("erlang_b", "Erlang B", "{:.6f}"),
+    ("erlang_c", "Erlang C (probabilidad de esperar)", "{:.6f}"),
+    ("prob_bloqueo", "Probabilidad de bloqueo", "{:.6f}"),
+]
+
+class PanelResultados(ttk.Frame):
+    """Etiquetas de resultados creadas una sola vez y actualizadas en cada cálculo."""
+
+    def __init__(self, parent, campos):
+        super().__init__(parent)
+        self.campos = campos
+        ttk.Label(self, text="Resultados", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=2, pady=10)
+
+        self.etiquetas = {}
+        for fila, (clave, _, _) in enumerate(campos, start=1):
+            self.etiquetas[clave] = ttk.Label(self)
+            self.etiquetas[clave].grid(row=fila, column=0, sticky="w", padx=10, pady=5)
+
+    def actualizar(self, resultados):
+        for clave, etiqueta, formato in self.campos:
+            valor = formato.format(resultados[clave]) if clave in resultados else "—"
+            self.etiquetas[clave].configure(text=f"{etiqueta}: {valor}")
+
+class BarraProgreso(ttk.Frame):
+    """Texto, barra de progreso y botón de cancelar para trabajos en segundo plano."""
+
+    def __init__(self, parent, al_cancelar):
+        super().__init__(parent)
+        self.etiqueta = ttk.Label(self)
+        self.etiqueta.grid(row=0, column=0, columnspan=2, pady=5)
+        self.barra = ttk.Progressbar(self, length=250, maximum=100)
+        self.barra.grid(row=1, column=0, padx=10)
+        self.boton_cancelar = ttk.Button(self, text="Cancelar", command=al_cancelar)
+        self.boton_cancelar.grid(row=1, column=1, padx=10)
+
+    def iniciar(self, texto):
+        # Sin avance conocido se muestra en modo indeterminado
+        self.etiqueta.configure(text=texto)
+        self.barra.configure(mode="indeterminate", value=0)
+        self.barra.start(10)
+        self.grid()
+
+    def actualizar(self, fraccion=None, texto=None):
+        if fraccion is not None:
+            self.barra.stop()
+            self.barra.configure(mode="determinate", value=fraccion * 100)
+        if texto is not None:
+            self.etiqueta.configure(text=texto)
+
+    def terminar(self):
+        self.barra.stop()
+        self.grid_remove()
+
+class BarraEstado(ttk.Frame):
+    """Últimos tiempos de la instrumentación y botón para perfilar el próximo cálculo.
+
+    Solo se crea con CALCULADORA_INSTRUMENTACION activa; se refresca sondeando
+    ``instrumentacion.version()`` porque las etapas terminan en otros hilos.
+    """
+
+    def __init__(self, parent, intervalo_ms=500):
+        super().__init__(parent)
+        self.intervalo_ms = intervalo_ms
+        self.etiqueta = ttk.Label(self, text="Instrumentación activa", font=("Arial", 9))
+        self.etiqueta.pack(side="left", padx=10, pady=2)
+        self.boton_perfil = ttk.Button(self, text="Perfilar próximo cálculo", command=self.pedir_perfil)
+        self.boton_perfil.pack(side="right", padx=10, pady=2)
+        self._version = None
+        self._after_id = None
+        self._sondear()
+
+    def pedir_perfil(self):
+        instrumentacion.perfilar_siguiente()
+        self.boton_perfil.state(["disabled"])
+
+    def _sondear(self):
+        version = instrumentacion.version()
+        if version != self._version:
+            self._version = version
+            self.etiqueta.configure(text=instrumentacion.resumen() or "Instrumentación activa")
+        if not instrumentacion.perfil_pendiente():
+            self.boton_perfil.state(["!disabled"])
+        self._after_id = self.after(self.intervalo_ms, self._sondear)
+
+    def destroy(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        super().destroy()
+
+class TablaDistribucion(ttk.Frame):
+    """Tabla virtualizada de la distribución de probabilidad.
+
+    Solo existen `filas_visibles` filas en el Treeview; al desplazarse se
+    reescriben sus valores con los estados de la ventana actual, así que el
+    costo no depende del número de estados de la distribución.
+    """
+
+    def __init__(self, parent, filas_visibles=10):
+        super().__init__(parent)
+        self.filas_visibles = filas_visibles
+        self.distribucion = None
+        self.inicio = 0
+
+        self.tree = ttk.Treeview(self, columns=("Estado", "P(n)", "P(Acum)"), show="headings", height=filas_visibles)
+        self.tree.heading("Estado", text="Estado")
+        self.tree.heading("P(n)", text="P(n)")
+        self.tree.heading("P(Acum)", text="P(Acum)")
+        self.tree.grid(row=0, column=0, columnspan=4, padx=10, pady=10)
+
+        # La barra representa la distribución completa, no las filas del Treeview
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.desplazar)
+        self.scrollbar.grid(row=0, column=4, sticky="ns")
+        self.tree.bind("<MouseWheel>", self._rueda)
+        self.tree.bind("<Button-4>", lambda e: self.desplazar("scroll", -1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.desplazar("scroll", 1, "units"))
+
+        # Navegación directa
+        ttk.Label(self, text="Ir a estado:").grid(row=1, column=0, sticky="e", padx=5)
+        self.entry_estado = ttk.Entry(self, width=10)
+        self.entry_estado.grid(row=1, column=1, sticky="w", padx=5)
+        self.entry_estado.bind("<Return>", lambda e: self.ir_a_estado_ingresado())
+        ttk.Label(self, text="Ir a cuantil:").grid(row=1, column=2, sticky="e", padx=5)
+        self.entry_cuantil = ttk.Entry(self, width=10)
+        self.entry_cuantil.grid(row=1, column=3, sticky="w", padx=5)
+        self.entry_cuantil.bind("<Return>", lambda e: self.ir_a_cuantil_ingresado())
+
+    def mostrar(self, distribucion):
+        """Muestra la distribución desde el estado 0; con None deja la tabla vacía."""
+        self.distribucion = distribucion
+        self.inicio = 0
+        if distribucion is None:
+            self.tree.delete(*self.tree.get_children())
+            return
+        self._pintar()
+
+    def _pintar(self, seleccionado=None):
+        filas = self.distribucion[self.inicio:self.inicio + self.filas_visibles]
+        items = list(self.tree.get_children())
+
+        # Reutilizar las filas existentes; crear o borrar solo la diferencia
+        for item in items[len(filas):]:
+            self.tree.delete(item)
+        for _ in range(len(items), len(filas)):
+            items.append(self.tree.insert("", "end"))
+            instrumentacion.contar("filas_insertadas")
+        instrumentacion.contar("filas", len(filas))
+        for item, (i, p_abs, p_acum) in zip(items, filas):
+            self.tree.item(item, values=(i, f"{p_abs:.4f}", f"{p_acum:.4f}"))
+
+        self.tree.selection_set([items[seleccionado - self.inicio]] if seleccionado is not None else [])
+        total = len(self.distribucion)
+        self.scrollbar.set(self.inicio / total, min((self.inicio + self.filas_visibles) / total, 1.0))
+
+    def desplazar(self, accion, cantidad, unidad=None):
+        if self.distribucion is None:
+            return
+        total = len(self.distribucion)
+        if accion == "moveto":
+            self.inicio = int(float(cantidad) * total)
+        elif accion == "scroll":
+            paso = self.filas_visibles if unidad == "pages" else 1
+            self.inicio += int(cantidad) * paso
+        self.inicio = max(0, min(self.inicio, total - self.filas_visibles))
+        self._pintar()
+
+    def _rueda(self, event):
+        self.desplazar("scroll", -1 if event.delta > 0 else 1, "units")
+        return "break"
+
+    def ir_a_estado(self, n):
+        """Desplaza la tabla para mostrar y seleccionar el estado n."""
+        total = len(self.distribucion)
+        n = max(0, min(n, total - 1))
+        self.inicio = max(0, min(n, total - self.filas_visibles))
+        self._pintar(seleccionado=n)
+
+    def ir_a_cuantil(self, q):
+        """Muestra el menor estado n con P(≤n) ≥ q."""
+        self.ir_a_estado(self.distribucion.cuantil(q))
+
+    def ir_a_estado_ingresado(self):
+        if self.distribucion is None:
+            return
+        try:
+            self.ir_a_estado(int(self.entry_estado.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Ingresa un número de estado entero.")
+
+    def ir_a_cuantil_ingresado(self):
+        if self.distribucion is None:
+            return
+        try:
+            q = float(self.entry_cuantil.get())
+            if not 0 < q < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "El cuantil debe estar entre 0 y 1.")
+            return
+        self.ir_a_cuantil(q)
+
+class PanelHistorial(ttk.Frame):
+    """Historial de cálculos leído por páginas desde ``HistorialCalculos``.
+
+    Al abrirse solo se carga la primera página (los cálculos más recientes);
+    las siguientes se piden cuando la barra de desplazamiento llega al final.
+    ``columnas`` es una lista de (encabezado, clave, formato) y
+    ``al_seleccionar(fila)`` recibe el dict de la fila elegida.
+    """
+
+    def __init__(self, parent, historial, modelo, columnas, al_seleccionar):
+        super().__init__(parent)
+        self.historial = historial
+        self.modelo = modelo
+        self.columnas = columnas
+        self.al_seleccionar = al_seleccionar
+        self.filas = {}  # item del Treeview -> fila del historial
+        self.ultimo_id = None
+        self.agotado = False
+        self.rango_rho = (None, None)
+
+        encabezados = [encabezado for encabezado, _, _ in columnas]
+        self.tree = ttk.Treeview(self, columns=encabezados, show="headings")
+        for encabezado in encabezados:
+            self.tree.heading(encabezado, text=encabezado)
+        self.tree.grid(row=0, column=0, columnspan=5, padx=10, pady=10)
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.scrollbar.grid(row=0, column=5, sticky="ns")
+        self.tree.configure(yscrollcommand=self._al_desplazar)
+        self.tree.bind("<<TreeviewSelect>>", self._seleccionar)
+
+        # Filtro por rango de ρ (límites exclusivos, vacío = sin límite)
+        ttk.Label(self, text="ρ entre:").grid(row=1, column=0, sticky="e", padx=5)
+        self.entry_rho_min = ttk.Entry(self, width=8)
+        self.entry_rho_min.grid(row=1, column=1, padx=5)
+        ttk.Label(self, text="y").grid(row=1, column=2)
+        self.entry_rho_max = ttk.Entry(self, width=8)
+        self.entry_rho_max.grid(row=1, column=3, padx=5)
+        ttk.Button(self, text="Filtrar", command=self.filtrar).grid(row=1, column=4, padx=5)
+
+        self.recargar()
+
+    def recargar(self):
+        """Vuelve a la primera página (p. ej. después de registrar un cálculo)."""
+        with instrumentacion.etapa("historial"):
+            self.tree.delete(*self.tree.get_children())
+            self.filas.clear()
+            self.ultimo_id = None
+            self.agotado = False
+            self.cargar_pagina()
+
+    def cargar_pagina(self):
+        if self.agotado:
+            return
+        rho_min, rho_max = self.rango_rho
+        pagina = self.historial.consultar(self.modelo, rho_min, rho_max, antes_de=self.ultimo_id)
+        for fila in pagina:
+            valores = [formato.format(fila[clave]) if fila[clave] is not None else "—" for _, clave, formato in self.columnas]
+            self.filas[self.tree.insert("", "end", values=valores)] = fila
+        instrumentacion.contar("filas_insertadas", len(pagina))
+        if pagina:
+            self.ultimo_id = pagina[-1]["id"]
+        self.agotado = len(pagina) < FILAS_POR_PAGINA
+
+    def filtrar(self):
+        try:
+            rho_min = float(self.entry_rho_min.get()) if self.entry_rho_min.get().strip() else None
+            rho_max = float(self.entry_rho_max.get()) if self.entry_rho_max.get().strip() else None
+        except ValueError:
+            messagebox.showerror("Error", "Los límites de ρ deben ser numéricos.")
+            return
+        self.rango_rho = (rho_min, rho_max)
+        self.recargar()
+
+    def _al_desplazar(self, primero, ultimo):
+        self.scrollbar.set(primero, ultimo)
+        # Cerca del final se pide la página siguiente
+        if float(ultimo) >= 0.95:
+            self.cargar_pagina()
+
+    def _seleccionar(self, event=None):
+        seleccion = self.tree.selection()
+        if seleccion:
+            self.al_seleccionar(self.filas[seleccion[0]])
@@ -0,0 +1,140 @@
+"""Diseño inverso: menor μ o menor N que cumple objetivos de servicio.
+
+Todas las métricas usadas son monótonas en el parámetro buscado, así que la
+búsqueda se hace acotando un intervalo y refinándolo. Para μ cada paso evalúa
+una grilla de puntos con los evaluadores vectorizados de ``colas`` y revisa
+todas las restricciones a la vez; para N se hace bisección entera.
+
+    from diseno import mu_minimo, N_minimo
+    mu_minimo(2.0, Wq=0.5, utilizacion=0.8)          # M/M/1
+    mu_minimo(2.0, N=10, prob_bloqueo=0.01)          # M/M/1/N
+    N_minimo(2.0, 2.5, prob_bloqueo=0.01)
+"""
+import numpy as np
+
+from colas import (
+    ErrorModeloColas,
+    calcular_sin_limite_cola,
+    calcular_con_limite_cola,
+    evaluar_lote_sin_limite,
+    evaluar_lote_con_limite,
+)
+
+# Objetivos admitidos: todos son cotas superiores (métrica ≤ valor)
+OBJETIVOS = ("Wq", "Ws", "Lq", "Ls", "prob_bloqueo", "utilizacion")
+
+class SinSolucionError(ErrorModeloColas, ValueError):
+    """Ningún valor del parámetro buscado cumple los objetivos pedidos."""
+
+def _validar_objetivos(objetivos, N):
+    objetivos = {clave: valor for clave, valor in objetivos.items() if valor is not None}
+    desconocidos = set(objetivos) - set(OBJETIVOS)
+    if desconocidos:
+        raise ValueError(f"objetivos desconocidos: {', '.join(sorted(desconocidos))}")
+    if not objetivos:
+        raise ValueError("hay que indicar al menos un objetivo")
+    for clave, valor in objetivos.items():
+        # Con cota 0 solo se cumpliría con μ o N infinitos (o por redondeo a 0)
+        if not valor > 0:
+            raise ValueError(f"el objetivo {clave} tiene que ser positivo")
+    if "prob_bloqueo" in objetivos and N is None:
+        raise ValueError("el objetivo de bloqueo requiere un límite N")
+    return objetivos
+
+def _metrica(lote, clave):
+    return 1 - lote["Po"] if clave == "utilizacion" else lote[clave]
+
+def _cumple(lote, objetivos):
+    # Máscara de escenarios que cumplen todas las cotas; NaN (inestable) nunca cumple
+    cumple = np.ones(np.shape(lote["rho"]), dtype=bool)
+    for clave, valor in objetivos.items():
+        cumple &= _metrica(lote, clave) <= valor
+    return cumple
+
+def mu_minimo(lambda_, N=None, puntos=64, rtol=1e-10, **objetivos):
+    """Menor tasa de servicio μ que cumple todos los objetivos.
+
+    Sin N se usa el modelo M/M/1 y con N el M/M/1/N. Devuelve el dict de
+    resultados del escenario encontrado (como ``calcular_*_cola``).
+    """
+    objetivos = _validar_objetivos(objetivos, N)
+
+    def factible(mu):
+        if N is None:
+            lote = evaluar_lote_sin_limite(lambda_, mu)
+        else:
+            lote = evaluar_lote_con_limite(lambda_, mu, N)
+        return _cumple(lote, objetivos)
+
+    # Acotar: al aumentar μ todas las métricas bajan
+    inferior = float(lambda_) if N is None else 0.0
+    superior = max(2.0 * lambda_, lambda_ + 1.0)
+    for _ in range(200):
+        if factible(superior).item():
+            break
+        inferior, superior = superior, superior * 2
+    else:
+        raise SinSolucionError("no hay tasa de servicio que cumpla los objetivos")
+
+    # Refinar con una grilla por paso: el intervalo se reduce ~puntos veces
+    while superior - inferior > rtol * superior:
+        grilla = np.linspace(inferior, superior, puntos)
+        ok = factible(grilla)
+        primero = int(np.argmax(ok))  # ok[-1] siempre es verdadero
+        if primero == 0:
+            superior = grilla[0]
+            break
+        inferior, superior = grilla[primero - 1], grilla[primero]
+
+    mu = float(superior)
+    # La grilla supone monotonía; si el redondeo la rompe no se devuelve un μ que no cumple
+    if not (np.isfinite(mu) and factible(mu).item()):
+        raise SinSolucionError("ninguna tasa de servicio finita cumple los objetivos")
+    # Lq, Wq y la utilización restan cantidades casi iguales cuando ρ es muy chico: si la
+    # métrica pasa de superar el objetivo a valer 0, se cumplió por redondeo y no de verdad
+    extremos = evaluar_lote_sin_limite(lambda_, [inferior, mu]) if N is None else evaluar_lote_con_limite(lambda_, [inferior, mu], N)
+    for clave, valor in objetivos.items():
+        antes, despues = _metrica(extremos, clave)
+        if antes > valor and despues <= 0:
+            raise ValueError(f"el objetivo {clave} ≤ {valor:g} es demasiado chico: ninguna μ finita lo alcanza con precisión de punto flotante")
+    if N is None:
+        return calcular_sin_limite_cola(lambda_, mu)
+    return calcular_con_limite_cola(lambda_, mu, N)
+
+def N_minimo(lambda_, mu, N_max=10 ** 9, **objetivos):
+    """Menor límite N que cumple todos los objetivos en un M/M/1/N.
+
+    El bloqueo baja al aumentar N pero Wq, Ws, Lq, Ls y la utilización
+    suben, así que se busca el menor N que cumple el bloqueo y luego se
+    verifica el resto en ese N.
+    """
+    objetivos = _validar_objetivos(objetivos, N=0)
+
+    def factible(N):
+        return _cumple(evaluar_lote_con_limite(lambda_, mu, N), objetivos).item()
+
+    if "prob_bloqueo" not in objetivos:
+        # Sin objetivo de bloqueo el menor N posible es 1
+        inferior = superior = 1
+    else:
+        bloqueo = {"prob_bloqueo": objetivos["prob_bloqueo"]}
+
+        def bloqueo_ok(N):
+            return _cumple(evaluar_lote_con_limite(lambda_, mu, N), bloqueo).item()
+
+        # Búsqueda exponencial para acotar y luego bisección entera
+        inferior, superior = 0, 1
+        while not bloqueo_ok(superior):
+            if superior >= N_max:
+                raise SinSolucionError("ningún límite N alcanza la probabilidad de bloqueo pedida")
+            inferior, superior = superior, min(superior * 2, N_max)
+        while superior - inferior > 1:
+            medio = (inferior + superior) // 2
+            if bloqueo_ok(medio):
+                superior = medio
+            else:
+                inferior = medio
+
+    if not factible(superior):
+        raise SinSolucionError(f"con N = {superior} no se cumplen los demás objetivos y un N mayor los empeora")
+    return calcular_con_limite_cola(lambda_, mu, superior)
@@ -0,0 +1,204 @@
+"""Historial persistente de cálculos en SQLite.
+
+Cada cálculo guarda sus parámetros y resultados escalares en una tabla
+indexada por modelo y parámetros, de modo que el historial sobrevive al
+cerrar las ventanas, se puede consultar por rangos y sirve como caché
+"tibia" entre sesiones (ver ``cache_resultados``):
+
+    from historial import HistorialCalculos
+    historial = HistorialCalculos("historial.db")
+    historial.registrar("con_limite", calcular_con_limite_cola(2, 3, 10), N=10)
+    historial.consultar(modelo="con_limite", rho_min=0.9, rho_max=0.99)
+
+La base usa WAL, así que las lecturas del hilo de Tk no esperan a las
+escrituras de los trabajos en segundo plano. En la columna N se guarda la
+capacidad del sistema: N en M/M/1/N y K en M/M/c/K. Cada fila lleva la
+versión de las fórmulas con que se calculó y ``buscar`` solo devuelve las de
+la versión actual, así una corrección no sirve resultados viejos como caché.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from instrumentacion import contar
+
+# Resultados escalares que se guardan; los que un modelo no tiene quedan en NULL
+COLUMNAS_METRICAS = (
+    "rho", "Po", "Ls", "Lq", "Ws", "Wq", "lambda_efectiva",
+    "prob_bloqueo", "erlang_b", "erlang_c",
+)
+COLUMNAS = ("fecha", "version", "modelo", "lambda", "mu", "N", "c") + COLUMNAS_METRICAS
+# Versión de las fórmulas de los resultados guardados; subirla con cada cambio
+# que altere resultados ya guardados (2: λ_efectiva = λ(1 - P_N) en M/M/1/N)
+VERSION_RESULTADOS = 2
+
+# Filas por página del panel de historial
+FILAS_POR_PAGINA = 50
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS calculos (
+    id INTEGER PRIMARY KEY,
+    fecha REAL NOT NULL,
+    version INTEGER,
+    modelo TEXT NOT NULL,
+    lambda REAL NOT NULL,
+    mu REAL NOT NULL,
+    N INTEGER,
+    c INTEGER,
+    rho REAL, Po REAL, Ls REAL, Lq REAL, Ws REAL, Wq REAL,
+    lambda_efectiva REAL, prob_bloqueo REAL, erlang_b REAL, erlang_c REAL
+);
+CREATE INDEX IF NOT EXISTS idx_calculos_parametros ON calculos (modelo, lambda, mu, N, c);
+CREATE INDEX IF NOT EXISTS idx_calculos_rho ON calculos (modelo, rho);
+CREATE INDEX IF NOT EXISTS idx_calculos_modelo ON calculos (modelo);
+"""
+
+def ruta_predeterminada():
+    """Archivo del historial: $CALCULADORA_HISTORIAL o ~/.calculadora_colas/historial.db."""
+    ruta = os.environ.get("CALCULADORA_HISTORIAL")
+    if ruta:
+        return ruta
+    return os.path.join(os.path.expanduser("~"), ".calculadora_colas", "historial.db")
+
+def _valor(x):
+    # NaN/inf (escenarios inestables) se guardan como NULL
+    if x is None:
+        return None
+    x = float(x)
+    return x if math.isfinite(x) else None
+
+class HistorialCalculos:
+    """Almacén de cálculos sobre un archivo SQLite, seguro entre hilos."""
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta_predeterminada() if ruta is None else ruta
+        if self.ruta != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+        self._lock = threading.Lock()
+        # Una sola conexión compartida; el lock serializa su uso entre hilos
+        self._conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        self._conexion.row_factory = sqlite3.Row
+        with self._lock:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")  # Seguro con WAL
+            self._conexion.executescript(ESQUEMA)
+            # Bases creadas antes de guardar la versión: sus filas quedan en NULL y no se reusan
+            columnas = {fila["name"] for fila in self._conexion.execute("PRAGMA table_info(calculos)")}
+            if "version" not in columnas:
+                with self._conexion:
+                    self._conexion.execute("ALTER TABLE calculos ADD COLUMN version INTEGER")
+
+    def registrar(self, modelo, resultados, N=None, c=None):
+        """Guarda un cálculo y devuelve su id."""
+        fila = (time.time(), VERSION_RESULTADOS, modelo, float(resultados["lambda"]), float(resultados["mu"]),
+                None if N is None else int(N), None if c is None else int(c))
+        fila += tuple(_valor(resultados.get(clave)) for clave in COLUMNAS_METRICAS)
+        with self._lock, self._conexion:
+            cursor = self._conexion.execute(
+                f"INSERT INTO calculos ({', '.join(COLUMNAS)}) VALUES ({', '.join('?' * len(COLUMNAS))})", fila
+            )
+        contar("filas_historial")
+        return cursor.lastrowid
+
+    def registrar_lote(self, modelo, lote, N=None, c=None):
+        """Inserta en una sola transacción todos los escenarios de un lote columnar.
+
+        ``lote`` es el dict de ``evaluar_lote_*``; N y c se toman del lote si
+        están ahí ("N"/"K" y "c") o de los argumentos. Devuelve las filas insertadas.
+        """
+        N = lote.get("N", lote.get("K", N))
+        c = lote.get("c", c)
+        columnas = {"lambda": lote["lambda"], "mu": lote["mu"]}
+        columnas.update((clave, lote[clave]) for clave in COLUMNAS_METRICAS if clave in lote)
+        if N is not None:
+            columnas["N"] = N
+        if c is not None:
+            columnas["c"] = c
+
+        nombres = list(columnas)
+        arreglos = np.broadcast_arrays(*(np.asarray(columnas[nombre], dtype=float) for nombre in nombres))
+        # NaN e infinitos a NULL columna por columna, sin recorrer celda por celda en Python
+        valores = []
+        for nombre, arreglo in zip(nombres, arreglos):
+            plano = arreglo.ravel()
+            with np.errstate(invalid="ignore"):
+                lista = (plano.astype(np.int64) if nombre in ("N", "c") else plano).astype(object)
+            lista[~np.isfinite(plano)] = None
+            valores.append(lista.tolist())
+        fecha = time.time()
+        filas = ((fecha, VERSION_RESULTADOS, modelo) + fila for fila in zip(*valores))
+
+        sql = f"INSERT INTO calculos (fecha, version, modelo, {', '.join(nombres)}) VALUES ({', '.join('?' * (len(nombres) + 3))})"
+        with self._lock, self._conexion:
+            self._conexion.executemany(sql, filas)
+        insertadas = len(valores[0]) if valores else 0
+        contar("filas_historial", insertadas)
+        return insertadas
+
+    def buscar(self, modelo, lambda_, mu, N=None, c=None):
+        """Último cálculo guardado con exactamente esos parámetros y la versión actual, o None."""
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT * FROM calculos WHERE modelo = ? AND lambda = ? AND mu = ? AND N IS ? AND c IS ? "
+                "AND version = ? AND rho IS NOT NULL AND Ls IS NOT NULL ORDER BY id DESC LIMIT 1",
+                (modelo, float(lambda_), float(mu), None if N is None else int(N), None if c is None else int(c),
+                 VERSION_RESULTADOS)
+            ).fetchone()
+        return None if fila is None else dict(fila)
+
+    def _filtro(self, modelo, rho_min, rho_max):
+        condiciones, parametros = [], []
+        if modelo is not None:
+            condiciones.append("modelo = ?")
+            parametros.append(modelo)
+        if rho_min is not None:
+            condiciones.append("rho > ?")
+            parametros.append(rho_min)
+        if rho_max is not None:
+            condiciones.append("rho < ?")
+            parametros.append(rho_max)
+        return condiciones, parametros
+
+    def consultar(self, modelo=None, rho_min=None, rho_max=None, antes_de=None, limite=FILAS_POR_PAGINA):
+        """Página de cálculos, del más reciente al más antiguo.
+
+        Los límites de ρ son exclusivos (0.9 < ρ < 0.99). Para la página
+        siguiente se pasa ``antes_de`` = id de la última fila recibida, así
+        cada página cuesta lo mismo sin importar cuántas filas hay antes.
+        """
+        condiciones, parametros = self._filtro(modelo, rho_min, rho_max)
+        if antes_de is not None:
+            condiciones.append("id < ?")
+            parametros.append(antes_de)
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        sql = f"SELECT * FROM calculos {donde} ORDER BY id DESC"
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros.append(limite)
+        with self._lock:
+            return [dict(fila) for fila in self._conexion.execute(sql, parametros)]
+
+    def contar(self, modelo=None, rho_min=None, rho_max=None):
+        condiciones, parametros = self._filtro(modelo, rho_min, rho_max)
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        with self._lock:
+            return self._conexion.execute(f"SELECT COUNT(*) FROM calculos {donde}", parametros).fetchone()[0]
+
+    def cerrar(self):
+        with self._lock:
+            self._conexion.close()
+
+# Instancia compartida, creada al primer uso para no tocar el disco al importar
+_historial = None
+_historial_lock = threading.Lock()
+
+def obtener_historial():
+    global _historial
+    with _historial_lock:
+        if _historial is None:
+            _historial = HistorialCalculos()
+        return _historial
@@ -0,0 +1,186 @@
+"""Tiempos y contadores por etapa (cálculo, tabla, historial, reporte).
+
+Se activa con la variable de entorno CALCULADORA_INSTRUMENTACION=1. Cada
+etapa medida agrega una línea JSON al log (CALCULADORA_INSTRUMENTACION_LOG o
+~/.calculadora_colas/instrumentacion.jsonl) con su duración, su etapa padre y
+los contadores que se sumaron adentro (estados, filas insertadas, páginas
+del PDF...). Apagada, ``etapa()`` devuelve un contexto vacío compartido y
+``contar()`` vuelve enseguida, así que las llamadas pueden quedar en el
+código sin costo apreciable.
+
+``perfilar_siguiente()`` pide que la próxima etapa perfilable (los trabajos
+de las ventanas) corra bajo cProfile y tracemalloc; el perfil se guarda en un
+.prof junto al log y la línea JSON incluye las funciones y líneas que más
+tiempo y memoria usaron. json, cProfile y tracemalloc se importan recién
+cuando hacen falta para no sumar tiempo al arranque con la instrumentación
+apagada.
+"""
+import os
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+ACTIVA = os.environ.get("CALCULADORA_INSTRUMENTACION", "") not in ("", "0")
+# Funciones y líneas de asignación que se guardan en el log al perfilar
+TOP_PERFIL = 15
+
+_NULO = nullcontext()
+_local = threading.local()  # Pila de etapas abiertas en cada hilo
+_lock = threading.Lock()
+_ultimas = {}  # nombre -> último registro de esa etapa
+_version = 0
+_perfil_pedido = False
+
+def ruta_log():
+    ruta = os.environ.get("CALCULADORA_INSTRUMENTACION_LOG")
+    if ruta:
+        return ruta
+    return os.path.join(os.path.expanduser("~"), ".calculadora_colas", "instrumentacion.jsonl")
+
+class _Etapa:
+    __slots__ = ("nombre", "datos", "contadores", "perfilable", "perfil", "inicio")
+
+    def __init__(self, nombre, datos, perfilable):
+        self.nombre = nombre
+        self.datos = datos
+        self.contadores = {}
+        self.perfilable = perfilable
+        self.perfil = None
+
+    def __enter__(self):
+        global _perfil_pedido
+        pila = _pila()
+        if self.perfilable and not pila:
+            with _lock:
+                pedido, _perfil_pedido = _perfil_pedido, False
+            if pedido:
+                import cProfile
+                import tracemalloc
+
+                self.perfil = cProfile.Profile()
+                tracemalloc.start()
+                self.perfil.enable()
+        pila.append(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        segundos = time.perf_counter() - self.inicio
+        pila = _pila()
+        pila.pop()
+        registro = {
+            "fecha": datetime.now().isoformat(timespec="milliseconds"),
+            "etapa": self.nombre,
+            "padre": pila[-1].nombre if pila else None,
+            "segundos": segundos,
+            "hilo": threading.current_thread().name,
+            **self.datos,
+            "contadores": self.contadores,
+        }
+        if tipo is not None:
+            registro["error"] = tipo.__name__
+        if pila:
+            # Los contadores también cuentan para la etapa que la contiene
+            padre = pila[-1].contadores
+            for clave, cantidad in self.contadores.items():
+                padre[clave] = padre.get(clave, 0) + cantidad
+        if self.perfil is not None:
+            registro.update(_cerrar_perfil(self.perfil, self.nombre))
+        _registrar(registro)
+        return False
+
+def _pila():
+    pila = getattr(_local, "pila", None)
+    if pila is None:
+        pila = _local.pila = []
+    return pila
+
+def etapa(nombre, perfilable=False, **datos):
+    """Contexto que mide una etapa; ``datos`` se copian tal cual a la línea del log."""
+    if not ACTIVA:
+        return _NULO
+    return _Etapa(nombre, datos, perfilable)
+
+def contar(nombre, cantidad=1):
+    """Suma ``cantidad`` al contador ``nombre`` de la etapa abierta en este hilo."""
+    if not ACTIVA:
+        return
+    pila = getattr(_local, "pila", None)
+    if pila:
+        contadores = pila[-1].contadores
+        contadores[nombre] = contadores.get(nombre, 0) + cantidad
+
+def perfilar_siguiente():
+    """Perfila (cProfile + tracemalloc) la próxima etapa perfilable; solo con la instrumentación activa."""
+    global _perfil_pedido
+    if ACTIVA:
+        with _lock:
+            _perfil_pedido = True
+
+def perfil_pendiente():
+    return _perfil_pedido
+
+def _cerrar_perfil(perfil, nombre):
+    import pstats
+    import tracemalloc
+
+    perfil.disable()
+    _, pico = tracemalloc.get_traced_memory()
+    instantanea = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    ruta = os.path.join(os.path.dirname(ruta_log()), f"perfil_{nombre}_{datetime.now():%Y%m%d_%H%M%S_%f}.prof")
+    perfil.dump_stats(ruta)
+    estadisticas = pstats.Stats(perfil).stats  # (archivo, línea, función) -> (primitivas, llamadas, propio, acumulado, ...)
+    funciones = sorted(estadisticas.items(), key=lambda item: item[1][3], reverse=True)[:TOP_PERFIL]
+    return {
+        "perfil": ruta,
+        "memoria_pico": pico,
+        "top_tiempo": [
+            {"funcion": f"{archivo}:{linea}({funcion})", "llamadas": llamadas, "propio": propio, "acumulado": acumulado}
+            for (archivo, linea, funcion), (_, llamadas, propio, acumulado, _) in funciones
+        ],
+        "top_memoria": [
+            {"linea": str(estadistica.traceback), "bytes": estadistica.size, "bloques": estadistica.count}
+            for estadistica in instantanea.statistics("lineno")[:TOP_PERFIL]
+        ],
+    }
+
+def _registrar(registro):
+    global _version
+    import json
+
+    linea = json.dumps(registro, ensure_ascii=False, default=str)
+    with _lock:
+        _ultimas[registro["etapa"]] = registro
+        _version += 1
+        try:
+            os.makedirs(os.path.dirname(ruta_log()) or ".", exist_ok=True)
+            with open(ruta_log(), "a", encoding="utf-8") as archivo:
+                archivo.write(linea + "\n")
+        except OSError:
+            pass  # Sin log en disco la barra de estado sigue funcionando
+
+def version():
+    """Cambia cada vez que se registra una etapa (para refrescar la barra de estado)."""
+    return _version
+
+def ultimas():
+    with _lock:
+        return dict(_ultimas)
+
+def resumen(etapas=("calculo", "calcular", "registrar", "tabla", "historial", "reporte", "pdf")):
+    """Texto corto con la última duración y contadores de cada etapa."""
+    registros = ultimas()
+    partes = []
+    for nombre in etapas:
+        registro = registros.get(nombre)
+        if registro is None:
+            continue
+        segundos = registro["segundos"]
+        texto = f"{nombre} {segundos * 1000:.1f} ms" if segundos < 1 else f"{nombre} {segundos:.2f} s"
+        if registro["contadores"]:
+            texto += " (" + ", ".join(f"{clave} {cantidad:,}" for clave, cantidad in registro["contadores"].items()) + ")"
+        partes.append(texto)
+    return " · ".join(partes)
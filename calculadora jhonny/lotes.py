@@ -0,0 +1,381 @@
+"""Modo lote: escenarios desde un CSV/JSONL, resultados a CSV/JSONL.
+
+    python lotes.py escenarios.csv -o resultados.csv [--pdf resumen.pdf] [--procesos 4]
+    python main.py --lote escenarios.jsonl -o resultados.jsonl
+
+Cada escenario tiene "lambda", "mu" y opcionalmente "N" (capacidad del
+sistema) y "c" (servidores); "modelo" puede indicarse o se deduce: con c es
+"multiservidor", con N "con_limite" y si no "sin_limite". La entrada se lee
+en bloques de líneas que se envían crudos a un pool de procesos; cada proceso
+los interpreta, los evalúa con ``evaluar_lote_*`` y devuelve el texto de
+salida. Los bloques se escriben en orden y nunca hay más de unos pocos en
+vuelo, así que la memoria no depende del tamaño del archivo. Con
+``--historial`` los escenarios estables de cada bloque se guardan además en
+el historial, en una sola transacción por bloque y modelo.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from colas import evaluar_lote_sin_limite, evaluar_lote_con_limite
+from historial import HistorialCalculos, ruta_predeterminada
+from multiservidor import evaluar_lote_mmck
+
+# Filas por bloque enviado a un proceso
+FILAS_POR_BLOQUE = 50000
+# Columnas de la salida, en orden
+COLUMNAS_SALIDA = (
+    "fila", "modelo", "lambda", "mu", "N", "c", "rho", "Po", "Ls", "Lq", "Ws", "Wq",
+    "lambda_efectiva", "prob_bloqueo", "erlang_b", "erlang_c", "estable", "error",
+)
+COLUMNAS_METRICAS = ("rho", "Po", "Ls", "Lq", "Ws", "Wq", "lambda_efectiva", "prob_bloqueo", "erlang_b", "erlang_c")
+MODELOS = ("sin_limite", "con_limite", "multiservidor")
+# Las métricas del CSV van con 12 cifras significativas; λ y μ se repiten exactos
+FORMATO_METRICAS = "%.12g"
+
+def formato_de(ruta):
+    return "jsonl" if ruta.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+def _leer_filas(lineas, formato, encabezado):
+    """Columnas de texto/valores crudos: ({"lambda": [...], "mu": [...], ...}, n, posiciones, errores).
+
+    Las líneas en blanco se saltean; ``posiciones`` es el registro de cada
+    fila dentro del bloque y ``errores`` {fila: motivo} marca las líneas que no
+    se pudieron leer, que salen como filas con error sin frenar el resto.
+    """
+    posiciones, errores = [], {}
+    if formato == "csv":
+        # Cada elemento es un registro completo (ver _registros_csv)
+        filas = list(csv.reader(lineas))
+        posiciones = [i for i, fila in enumerate(filas) if "".join(fila).strip()]
+        if len(posiciones) < len(filas):
+            filas = [filas[i] for i in posiciones]
+        columnas = {nombre: [fila[i] if i < len(fila) else "" for fila in filas] for i, nombre in enumerate(encabezado)}
+        return columnas, len(filas), np.array(posiciones, dtype=np.int64), errores
+
+    registros = []
+    for posicion, linea in enumerate(lineas):
+        if not linea.strip():
+            continue
+        try:
+            registro = json.loads(linea)
+        except ValueError as error:
+            registro, errores[len(registros)] = {}, f"JSON inválido: {error}"
+        else:
+            if not isinstance(registro, dict):
+                registro, errores[len(registros)] = {}, "la línea no es un objeto JSON"
+        posiciones.append(posicion)
+        registros.append(registro)
+    nombres = ("modelo", "lambda", "mu", "N", "c")
+    columnas = {nombre: [registro.get(nombre, "") for registro in registros] for nombre in nombres}
+    return columnas, len(registros), np.array(posiciones, dtype=np.int64), errores
+
+def _numeros(valores, n):
+    # Texto o números a float; vacío o inválido queda NaN
+    if valores is None:
+        return np.full(n, np.nan)
+    try:
+        # Camino rápido: la conversión la hace NumPy en C
+        return np.array(["nan" if valor in ("", None) else valor for valor in valores], dtype=float)
+    except (TypeError, ValueError):
+        pass
+    salida = np.full(n, np.nan)
+    for i, valor in enumerate(valores):
+        if valor not in ("", None):
+            try:
+                salida[i] = float(valor)
+            except (TypeError, ValueError):
+                pass
+    return salida
+
+def _no_numericos(valores, numeros):
+    # {fila: valor crudo} de los valores no vacíos que no se pudieron convertir
+    if valores is None:
+        return {}
+    return {i: valores[i] for i in np.nonzero(np.isnan(numeros))[0].tolist()
+            if not isinstance(valores[i], (int, float)) and valores[i] not in ("", None)
+            and not (isinstance(valores[i], str) and valores[i].strip().lower() == "nan")}
+
+def evaluar_bloque(lineas, formato_entrada, encabezado, formato_salida, primera_fila, modelo_predeterminado=None,
+                   escenarios=False):
+    """Interpreta, evalúa y formatea un bloque de líneas; se ejecuta en un proceso del pool.
+
+    Devuelve (texto de salida, filas, errores, inestables, escenarios). Con
+    ``escenarios`` el último es un dict modelo -> lote columnar de las filas
+    estables, listo para ``HistorialCalculos.registrar_lote``; si no, None.
+    """
+    columnas, n, posiciones, errores_lectura = _leer_filas(lineas, formato_entrada, encabezado)
+    lambda_ = _numeros(columnas.get("lambda"), n)
+    mu = _numeros(columnas.get("mu"), n)
+    N = _numeros(columnas.get("N"), n)
+    c = _numeros(columnas.get("c"), n)
+    # Los valores que no son números se repiten tal cual en la salida
+    originales = {nombre: _no_numericos(columnas.get(nombre), valores)
+                  for nombre, valores in (("lambda", lambda_), ("mu", mu), ("N", N), ("c", c))}
+
+    modelos = np.array([str(m).strip() for m in columnas.get("modelo", [""] * n)], dtype=object)
+    sin_modelo = modelos == ""
+    deducido = np.where(~np.isnan(c), "multiservidor", np.where(~np.isnan(N), "con_limite", modelo_predeterminado or "sin_limite"))
+    modelos[sin_modelo] = deducido[sin_modelo]
+
+    # Validación vectorizada; las filas inválidas llevan el motivo en "error"
+    error = np.full(n, "", dtype=object)
+    for fila, motivo in errores_lectura.items():
+        modelos[fila], error[fila] = "", motivo
+    for nombre, valores in originales.items():
+        for fila in valores:
+            if error[fila] == "":
+                error[fila] = f"{nombre} no es un número"
+    error[(error == "") & ~np.isin(modelos, MODELOS)] = "modelo desconocido"
+    error[(error == "") & ~((lambda_ > 0) & (mu > 0) & np.isfinite(lambda_) & np.isfinite(mu))] = "lambda y mu deben ser positivos"
+    con_limite = modelos == "con_limite"
+    error[(error == "") & con_limite & ~(N >= 1)] = "con_limite requiere N >= 1"
+    multi = modelos == "multiservidor"
+    error[(error == "") & multi & ~(c >= 1)] = "multiservidor requiere c >= 1"
+    error[(error == "") & multi & (N < c)] = "la capacidad N tiene que ser al menos c"
+    validas = error == ""
+
+    metricas = {clave: np.full(n, np.nan) for clave in COLUMNAS_METRICAS}
+    estable = np.zeros(n, dtype=bool)
+    for modelo in MODELOS:
+        filas = np.nonzero(validas & (modelos == modelo))[0]
+        if filas.size == 0:
+            continue
+        if modelo == "sin_limite":
+            lote = evaluar_lote_sin_limite(lambda_[filas], mu[filas])
+        elif modelo == "con_limite":
+            lote = evaluar_lote_con_limite(lambda_[filas], mu[filas], np.floor(N[filas]))
+        else:
+            K = np.where(np.isnan(N[filas]), np.inf, np.floor(N[filas]))
+            lote = evaluar_lote_mmck(lambda_[filas], mu[filas], c[filas].astype(np.int64), K)
+            lote["erlang_c"] = np.where(np.isinf(K), lote["prob_espera"], np.nan)
+            lote["prob_bloqueo"] = np.where(np.isinf(K), np.nan, lote["prob_bloqueo"])
+        for clave in COLUMNAS_METRICAS:
+            if clave in lote:
+                metricas[clave][filas] = lote[clave]
+        estable[filas] = lote["estable"]
+    inestables = int(np.count_nonzero(validas & ~estable))
+    error[validas & ~estable] = "sistema inestable"
+
+    columnas_salida = {
+        "fila": primera_fila + posiciones,
+        "modelo": modelos,
+        "lambda": lambda_,
+        "mu": mu,
+        "N": np.where(multi | con_limite, np.floor(N), np.nan),
+        "c": np.where(multi, c, np.nan),
+        **metricas,
+        "estable": estable.astype(int),
+        "error": error,
+    }
+    if formato_salida == "csv":
+        texto = _texto_csv(columnas_salida, n, originales)
+    else:
+        texto = _texto_jsonl(columnas_salida, originales)
+    por_modelo = _escenarios_por_modelo(columnas_salida, validas & estable) if escenarios else None
+    return texto, n, int(np.count_nonzero(~validas)), inestables, por_modelo
+
+def _escenarios_por_modelo(columnas, estables):
+    # Lotes columnares para el historial; N y c solo en los modelos que los usan
+    por_modelo = {}
+    for modelo, parametros in (("sin_limite", ()), ("con_limite", ("N",)), ("multiservidor", ("N", "c"))):
+        filas = np.nonzero(estables & (columnas["modelo"] == modelo))[0]
+        if filas.size:
+            por_modelo[modelo] = {clave: columnas[clave][filas]
+                                  for clave in ("lambda", "mu") + parametros + COLUMNAS_METRICAS}
+    return por_modelo
+
+def _texto_csv(columnas, n, originales):
+    # Una lista de textos por columna y un join por fila: mucho más rápido que
+    # csv.writer con floats, cuyo repr domina el tiempo del bloque
+    textos = []
+    for nombre in COLUMNAS_SALIDA:
+        valores = columnas[nombre]
+        if valores.dtype == object:
+            # Modelo y error: pocos valores distintos, se escapan una vez cada uno
+            lista = valores.tolist()
+            escapados = {valor: _campo_csv(valor) for valor in set(lista)}
+            textos.append([escapados[valor] for valor in lista])
+            continue
+        if valores.dtype.kind in "iub":
+            textos.append(list(map(str, valores.tolist())))
+            continue
+        formato = repr if nombre in ("lambda", "mu") else ("%.0f" if nombre in ("N", "c") else FORMATO_METRICAS).__mod__
+        columna = np.full(n, "", dtype=object)
+        presentes = ~np.isnan(valores)
+        columna[presentes] = list(map(formato, valores[presentes].tolist()))
+        for fila, valor in originales.get(nombre, {}).items():
+            columna[fila] = _campo_csv(str(valor))
+        textos.append(columna.tolist())
+    return "".join([",".join(fila) + "\n" for fila in zip(*textos)])
+
+def _campo_csv(texto):
+    if any(caracter in texto for caracter in ',"\r\n'):
+        return '"' + texto.replace('"', '""') + '"'
+    return texto
+
+def _texto_jsonl(columnas, originales):
+    def lista(valores):
+        if valores.dtype.kind != "f":
+            return valores.tolist()
+        objetos = valores.astype(object)
+        objetos[np.isnan(valores)] = None
+        return objetos.tolist()
+
+    listas = [lista(columnas[nombre]) for nombre in COLUMNAS_SALIDA]
+    for i in (COLUMNAS_SALIDA.index("N"), COLUMNAS_SALIDA.index("c")):
+        listas[i] = [None if valor is None else int(valor) for valor in listas[i]]
+    for nombre, valores in originales.items():
+        for fila, valor in valores.items():
+            listas[COLUMNAS_SALIDA.index(nombre)][fila] = valor
+    codificar = json.JSONEncoder(allow_nan=False).encode  # Un solo codificador para todo el bloque
+    return "".join([codificar(dict(zip(COLUMNAS_SALIDA, fila))) + "\n" for fila in zip(*listas)])
+
+def _registros_csv(archivo):
+    """Registros del CSV: un campo entre comillas con saltos de línea queda en un solo registro.
+
+    Las comillas de un campo se escapan duplicándolas, así que mientras un
+    registro tenga una cantidad impar de comillas sigue en la línea siguiente.
+    """
+    lineas = iter(archivo)
+    for linea in lineas:
+        if '"' in linea:
+            while linea.count('"') % 2:
+                siguiente = next(lineas, None)
+                if siguiente is None:
+                    break  # Comilla sin cerrar al final: csv.reader la lee igual
+                linea += siguiente
+        yield linea
+
+def _bloques(registros, filas_por_bloque):
+    while True:
+        lineas = list(islice(registros, filas_por_bloque))
+        if not lineas:
+            return
+        yield lineas
+
+def procesar_archivo(entrada, salida, procesos=None, filas_por_bloque=FILAS_POR_BLOQUE,
+                     modelo=None, al_progreso=None, historial=None):
+    """Evalúa todos los escenarios de ``entrada`` y escribe ``salida``.
+
+    ``al_progreso(filas, segundos)`` se llama después de cada bloque escrito.
+    Con ``historial`` (un HistorialCalculos) los escenarios estables se
+    registran bloque a bloque con ``registrar_lote``.
+    Devuelve un resumen con filas, errores, inestables, segundos y filas por segundo.
+    """
+    formato_entrada, formato_salida = formato_de(entrada), formato_de(salida)
+    procesos = procesos or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    filas = errores = inestables = 0
+
+    with open(entrada, newline="", encoding="utf-8") as archivo_entrada, \
+            open(salida, "w", newline="", encoding="utf-8") as archivo_salida, \
+            ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("spawn")) as ejecutor:
+        encabezado = None
+        if formato_entrada == "csv":
+            encabezado = [nombre.strip() for nombre in next(csv.reader([archivo_entrada.readline()]))]
+            if "lambda" not in encabezado or "mu" not in encabezado:
+                raise ValueError("el CSV necesita las columnas lambda y mu")
+        if formato_salida == "csv":
+            archivo_salida.write(",".join(COLUMNAS_SALIDA) + "\n")
+
+        # A lo sumo dos bloques por proceso en vuelo: memoria acotada y escritura en orden
+        en_vuelo = deque()
+        siguiente_fila = 1
+        # Los bloques se cortan entre registros, nunca dentro de un campo de varias líneas
+        registros = _registros_csv(archivo_entrada) if formato_entrada == "csv" else archivo_entrada
+        for lineas in _bloques(registros, filas_por_bloque):
+            en_vuelo.append(ejecutor.submit(
+                evaluar_bloque, lineas, formato_entrada, encabezado, formato_salida, siguiente_fila, modelo,
+                historial is not None
+            ))
+            siguiente_fila += len(lineas)
+            while len(en_vuelo) >= 2 * procesos:
+                filas, errores, inestables = _escribir(en_vuelo.popleft(), archivo_salida, historial, filas, errores, inestables)
+                if al_progreso is not None:
+                    al_progreso(filas, time.perf_counter() - inicio)
+        while en_vuelo:
+            filas, errores, inestables = _escribir(en_vuelo.popleft(), archivo_salida, historial, filas, errores, inestables)
+            if al_progreso is not None:
+                al_progreso(filas, time.perf_counter() - inicio)
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "filas": filas,
+        "errores": errores,
+        "inestables": inestables,
+        "segundos": segundos,
+        "filas_por_s": filas / segundos if segundos > 0 else 0.0,
+    }
+
+def _escribir(futuro, archivo_salida, historial, filas, errores, inestables):
+    texto, n, n_errores, n_inestables, escenarios = futuro.result()
+    archivo_salida.write(texto)
+    if historial is not None:
+        for modelo, lote in escenarios.items():
+            historial.registrar_lote(modelo, lote)
+    return filas + n, errores + n_errores, inestables + n_inestables
+
+def leer_resultados(ruta):
+    """Genera los resultados escritos por ``procesar_archivo`` como dicts, sin cargarlos todos."""
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        if formato_de(ruta) == "jsonl":
+            for linea in archivo:
+                yield json.loads(linea)
+        else:
+            for fila in csv.DictReader(archivo):
+                yield {clave: (valor if valor != "" else None) for clave, valor in fila.items()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evalúa un archivo de escenarios de colas (CSV o JSONL)")
+    parser.add_argument("entrada")
+    parser.add_argument("-o", "--salida", required=True, help="CSV o JSONL de resultados (según la extensión)")
+    parser.add_argument("--pdf", help="reporte PDF consolidado con todos los escenarios")
+    parser.add_argument("--pdf-max-filas", type=int, help="limitar las filas del PDF")
+    parser.add_argument("--procesos", type=int)
+    parser.add_argument("--filas-por-bloque", type=int, default=FILAS_POR_BLOQUE)
+    parser.add_argument("--modelo", choices=MODELOS, help="modelo de las filas sin N ni c")
+    parser.add_argument("--historial", nargs="?", const=ruta_predeterminada(), metavar="RUTA",
+                        help="guardar los escenarios estables en el historial (por defecto el de la aplicación)")
+    args = parser.parse_args(argv)
+
+    ultimo_aviso = [0.0]
+
+    def progreso(filas, segundos):
+        # Como mucho un aviso por segundo en stderr
+        if segundos - ultimo_aviso[0] >= 1:
+            ultimo_aviso[0] = segundos
+            print(f"\r{filas:,} filas  {filas / segundos:,.0f} filas/s", end="", file=sys.stderr, flush=True)
+
+    historial = HistorialCalculos(args.historial) if args.historial else None
+    try:
+        resumen = procesar_archivo(args.entrada, args.salida, args.procesos, args.filas_por_bloque, args.modelo,
+                                   progreso, historial)
+    finally:
+        if historial is not None:
+            historial.cerrar()
+    print(f"\r{resumen['filas']:,} filas en {resumen['segundos']:.2f} s ({resumen['filas_por_s']:,.0f} filas/s), "
+          f"{resumen['errores']:,} con errores, {resumen['inestables']:,} inestables -> {args.salida}", file=sys.stderr)
+
+    if args.pdf:
+        from reporte import generar_reporte_lote
+
+        t0 = time.perf_counter()
+        escenarios = leer_resultados(args.salida)
+        if args.pdf_max_filas is not None:
+            escenarios = islice(escenarios, args.pdf_max_filas)
+        generar_reporte_lote(escenarios, filename=args.pdf, total=resumen["filas"], origen=args.entrada)
+        print(f"Reporte consolidado en {args.pdf} ({time.perf_counter() - t0:.2f} s)", file=sys.stderr)
+    return resumen
+
+if __name__ == "__main__":
+    main()
@@ -1,154 +1,29 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-import math
 from tkinter import font
 import os
-import sys
-from datetime import datetime  # Para generar nombres únicos de archivos
-
-# Funciones para calcular los modelos de colas
-def calcular_sin_limite_cola(lambda_, mu):
-    if mu > lambda_:
-        rho = lambda_ / mu
-        Po = 1 - rho
-        Ls = lambda_ / (mu - lambda_)
-        Lq = Ls - rho
-        Ws = Ls / lambda_
-        Wq = Lq / lambda_
-        lambda_efectiva = lambda_
-
-        # Distribución de probabilidad
-        n = 0
-        probabilidades_absolutas = []
-        probabilidades_acumuladas = []
-        while True:
-            p_abs = Po * (rho ** n)
-            p_acum = sum(probabilidades_absolutas) + p_abs
-            probabilidades_absolutas.append(p_abs)
-            probabilidades_acumuladas.append(p_acum)
-            if p_acum >= 0.9999:
-                break
-            n += 1
-
-        return {
-            "lambda": lambda_,
-            "mu": mu,
-            "rho": rho,
-            "Po": Po,
-            "Ls": Ls,
-            "Lq": Lq,
-            "Ws": Ws,
-            "Wq": Wq,
-            "lambda_efectiva": lambda_efectiva,
-            "probabilidades_absolutas": probabilidades_absolutas,
-            "probabilidades_acumuladas": probabilidades_acumuladas
-        }
-    else:
-        messagebox.showerror("Critical Error", "mu (μ) tiene que ser mayor que lambda (λ)")
-
-def calcular_con_limite_cola(lambda_, mu, N):
-    rho = lambda_ / mu
-    Po = (1 - rho) / (1 - rho ** (N + 1))
-    Ls = (rho * (1 - (N + 1) * rho ** N + N * rho ** (N + 1))) / ((1 - rho) * (1 - rho ** (N + 1)))
-    Lq = Ls - (1 - Po)
-    lambda_efectiva = lambda_ * (1 - Po)
-    Ws = Ls / lambda_efectiva
-    Wq = Lq / lambda_efectiva
-
-    # Distribución de probabilidad
-    n = N + 1  # Número de estados a considerar
-    probabilidades_absolutas = [Po * (rho ** i) for i in range(n)]
-    probabilidades_acumuladas = [sum(probabilidades_absolutas[:i + 1]) for i in range(n)]
-
-    return {
-        "lambda": lambda_,
-        "mu": mu,
-        "rho": rho,
-        "Po": Po,
-        "Ls": Ls,
-        "Lq": Lq,
-        "Ws": Ws,
-        "Wq": Wq,
-        "lambda_efectiva": lambda_efectiva,
-        "probabilidades_absolutas": probabilidades_absolutas,
-        "probabilidades_acumuladas": probabilidades_acumuladas
-    }
-
-# Función para generar el reporte en PDF mejorado
-def generar_reporte(resultados):
-    # Generar un nombre de archivo único usando la fecha y hora actual
-    fecha_hora = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"reporte_{fecha_hora}.pdf"
-
-    # Crear un documento PDF
-    doc = SimpleDocTemplate(filename, pagesize=letter)
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # Título del reporte
-    elements.append(Paragraph("Reporte de Modelo de Colas", styles['Title']))
-    elements.append(Spacer(1, 12))  # Espacio después del título
-
-    # Datos generales
-    data_general = [
-        ["Parámetro", "Valor"],
-        ["Tasa de llegada (λ)", f"{resultados['lambda']}"],
-        ["Tasa de servicio (μ)", f"{resultados['mu']}"],
-        ["Rho (ρ)", f"{resultados['rho']:.4f}"],
-        ["Probabilidad de sistema vacío (P₀)", f"{resultados['Po']:.4f}"],
-        ["Número esperado en el sistema (L)", f"{resultados['Ls']:.4f}"],
-        ["Número esperado en la cola (Lq)", f"{resultados['Lq']:.4f}"],
-        ["Tiempo esperado en el sistema (W)", f"{resultados['Ws']:.4f}"],
-        ["Tiempo esperado en la cola (Wq)", f"{resultados['Wq']:.4f}"],
-        ["Tasa de llegada efectiva (λ_efectiva)", f"{resultados['lambda_efectiva']:.4f}"]  # Nueva línea
-    ]
-
-    # Crear tabla de datos generales
-    table_general = Table(data_general)
-    table_general.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(table_general)
-    elements.append(Spacer(1, 12))  # Espacio después de la tabla
-
-    # Distribución de probabilidad
-    elements.append(Paragraph("Distribución de Probabilidad", styles['Heading2']))
-    elements.append(Spacer(1, 12))  # Espacio después del subtítulo
-
-    # Crear tabla de distribución de probabilidad
-    data_prob = [["Estado", "P(n)", "P(Acum)"]] + [
-        [str(i), f"{p_abs:.4f}", f"{p_acum:.4f}"] for i, (p_abs, p_acum) in enumerate(zip(resultados["probabilidades_absolutas"], resultados["probabilidades_acumuladas"]))
-    ]
-
-    table_prob = Table(data_prob)
-    table_prob.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(table_prob)
-
-    # Generar el PDF
-    doc.build(elements)
-    messagebox.showinfo("Reporte Generado", f"El reporte se ha guardado en {filename}")
+from colas import (
+    SistemaInestableError,
+    calcular_sin_limite_cola,
+    calcular_con_limite_cola,
+)
+from cache_resultados import calcular_con_cache
+from componentes import CAMPOS_SIN_LIMITE, CAMPOS_CON_LIMITE, CAMPOS_MULTISERVIDOR, BarraEstado, BarraProgreso, PanelHistorial, PanelResultados, TablaDistribucion
+from trabajos import GestorTrabajos
+from historial import obtener_historial
+import instrumentacion
+from recursos import FAMILIA_FUENTE, FUENTE, registrar_fuente, ruta_recurso
+from reporte import generar_reporte
+from diseno import mu_minimo, N_minimo
+from transitorio import distribucion_en, interpretar_tiempos, transitorio_con_limite
+from incertidumbre import ETIQUETAS_METRICAS, interpretar_distribucion, propagar_incertidumbre, valores_centrales
+from simulacion import CLIENTES_COMPARACION, METRICAS_COMPARADAS, comparar, simular_resultados
 
 # Interfaz gráfica mejorada con estilos
 class CalculadoraColas(tk.Tk):
     def __init__(self):
+        # La fuente se registra para este proceso antes de crear la ventana
+        registrar_fuente(ruta_recurso(FUENTE))
         super().__init__()
         self.title("Calculadora de Modelos de Colas")
         self.geometry("1000x600")  # Tamaño inicial fijo
@@ -157,12 +32,9 @@ class CalculadoraColas(tk.Tk):
         # Centrar la ventana en la pantalla
         self.center_window(1000, 600)
 
-        # Ruta de la fuente local (relativa a la carpeta del script)
-        fuente_path = os.path.join(os.path.dirname(__file__), "resources", "PressStart2P-Regular.ttf")
-
-        # Cargar la fuente en Tkinter
-        if os.path.exists(fuente_path):
-            self.custom_font = font.Font(family="Press Start 2P", size=12)
+        # Cargar la fuente en Tkinter (Tk la reemplaza en silencio si no la encuentra)
+        self.custom_font = font.Font(family=FAMILIA_FUENTE, size=12)
+        if self.custom_font.actual("family") == FAMILIA_FUENTE:
             self.option_add("*Font", self.custom_font)  # Aplicar a todos los widgets por defecto
         else:
             print("⚠️ No se encontró la fuente. Usando fuente predeterminada.")
@@ -183,7 +55,7 @@ class CalculadoraColas(tk.Tk):
 
         # Selección de modelo
         self.label_modelo = ttk.Label(self.main_frame, text="Selecciona el modelo de colas:")
-        self.label_modelo.grid(row=0, column=0, columnspan=2, pady=10)
+        self.label_modelo.grid(row=0, column=0, columnspan=6, pady=10)
 
         self.boton_sin_limite = ttk.Button(self.main_frame, text="Sin límite en cola", command=self.abrir_sin_limite)
         self.boton_sin_limite.grid(row=1, column=0, padx=10, pady=10)
@@ -191,6 +63,18 @@ class CalculadoraColas(tk.Tk):
         self.boton_con_limite = ttk.Button(self.main_frame, text="Con límite en cola", command=self.abrir_con_limite)
         self.boton_con_limite.grid(row=1, column=1, padx=10, pady=10)
 
+        self.boton_diseno = ttk.Button(self.main_frame, text="Diseño por objetivo", command=self.abrir_diseno)
+        self.boton_diseno.grid(row=1, column=2, padx=10, pady=10)
+
+        self.boton_multiservidor = ttk.Button(self.main_frame, text="Multiservidor", command=self.abrir_multiservidor)
+        self.boton_multiservidor.grid(row=1, column=3, padx=10, pady=10)
+
+        self.boton_transitorio = ttk.Button(self.main_frame, text="Transitorio", command=self.abrir_transitorio)
+        self.boton_transitorio.grid(row=1, column=4, padx=10, pady=10)
+
+        self.boton_incertidumbre = ttk.Button(self.main_frame, text="Incertidumbre", command=self.abrir_incertidumbre)
+        self.boton_incertidumbre.grid(row=1, column=5, padx=10, pady=10)
+
     def abrir_sin_limite(self):
         self.withdraw()  # Oculta la ventana principal
         VentanaSinLimite(self)
@@ -199,6 +83,22 @@ class CalculadoraColas(tk.Tk):
         self.withdraw()  # Oculta la ventana principal
         VentanaConLimite(self)
 
+    def abrir_diseno(self):
+        self.withdraw()  # Oculta la ventana principal
+        VentanaDiseno(self)
+
+    def abrir_multiservidor(self):
+        self.withdraw()  # Oculta la ventana principal
+        VentanaMultiservidor(self)
+
+    def abrir_transitorio(self):
+        self.withdraw()  # Oculta la ventana principal
+        VentanaTransitorio(self)
+
+    def abrir_incertidumbre(self):
+        self.withdraw()  # Oculta la ventana principal
+        VentanaIncertidumbre(self)
+
     def center_window(self, width, height):
         """Centrar la ventana en la pantalla con un tamaño específico."""
         screen_width = self.winfo_screenwidth()
@@ -207,12 +107,29 @@ class CalculadoraColas(tk.Tk):
         y = (screen_height // 2) - (height // 2)
         self.geometry(f"{width}x{height}+{x}+{y}")  # Aplica la nueva posición centrada
 
-class VentanaSinLimite(tk.Toplevel):
+class VentanaModelo(tk.Toplevel):
+    """Comportamiento común de las ventanas de modelos.
+
+    Arma la ventana desplazable con la columna izquierda (entradas, Calcular,
+    resultados, descarga, Volver y progreso) y la derecha; cada subclase solo
+    define ``etiquetas`` o ``crear_entradas`` y ``crear_panel_derecho``. Los
+    cálculos y reportes se ejecutan con un GestorTrabajos para no bloquear el
+    bucle de Tk.
+    """
+    campos = CAMPOS_SIN_LIMITE
+    titulo = "Calculadora de Modelos de Colas"
+    # (clave, texto) de las entradas; quedan en self.entradas[clave]
+    etiquetas = [("lambda", "Tasa de llegada (λ):"), ("mu", "Tasa de servicio (μ):")]
+    # Parámetros de calcular_con_cache (λ, μ, N, c) como (clave de la entrada, tipo, obligatorio)
+    parametros = [("lambda", float, True), ("mu", float, True)]
+    # Con True aparece el botón para comparar el resultado con la simulación
+    simulable = False
+
     def __init__(self, parent):
         super().__init__(parent)
-        self.title("Modelo sin límite en cola")
+        self.title(self.titulo)
         self.state('zoomed')  # Abrir en pantalla completa
-        self.configure(bg="#f0f0f0")
+        self.configure(bg="#2C2F33")
 
         # Frame principal con barra de desplazamiento
         self.canvas = tk.Canvas(self, bg="#2C2F33")
@@ -236,176 +153,266 @@ class VentanaSinLimite(tk.Toplevel):
         self.left_frame = ttk.Frame(self.scrollable_frame)
         self.left_frame.grid(row=0, column=0, padx=10, pady=10, sticky="n")
 
-        # Frame para el historial
+        # Frame para el historial (o la tabla propia de cada ventana)
         self.right_frame = ttk.Frame(self.scrollable_frame)
         self.right_frame.grid(row=0, column=1, padx=10, pady=10, sticky="n")
 
-        # Entradas
-        self.label_lambda = ttk.Label(self.left_frame, text="Tasa de llegada (λ):")
-        self.label_lambda.grid(row=0, column=0, padx=10, pady=10)
-        self.entry_lambda = ttk.Entry(self.left_frame)
-        self.entry_lambda.grid(row=0, column=1, padx=10, pady=10)
-
-        self.label_mu = ttk.Label(self.left_frame, text="Tasa de servicio (μ):")
-        self.label_mu.grid(row=1, column=0, padx=10, pady=10)
-        self.entry_mu = ttk.Entry(self.left_frame)
-        self.entry_mu.grid(row=1, column=1, padx=10, pady=10)
+        fila = self.crear_entradas()
 
         # Botón de cálculo
         self.boton_calcular = ttk.Button(self.left_frame, text="Calcular", command=self.calcular)
-        self.boton_calcular.grid(row=2, column=0, columnspan=2, pady=20)
+        self.boton_calcular.grid(row=fila, column=0, columnspan=2, pady=20)
 
-        # Frame de resultados
+        # Frame de resultados (su contenido se crea en el primer cálculo)
+        self.panel_resultados = None
+        self.tabla_simulacion = None
         self.resultados_frame = ttk.Frame(self.left_frame)
-        self.resultados_frame.grid(row=3, column=0, columnspan=2, pady=20)
+        self.resultados_frame.grid(row=fila + 1, column=0, columnspan=2, pady=20)
 
         # Botón de descarga
         self.boton_descargar = ttk.Button(self.left_frame, text="Descargar resultados", command=self.descargar_resultados)
-        self.boton_descargar.grid(row=4, column=0, columnspan=2, pady=10)
+        self.boton_descargar.grid(row=fila + 2, column=0, columnspan=2, pady=10)
         self.boton_descargar.grid_remove()  # Ocultar inicialmente
 
+        # Comparación con la simulación de eventos discretos
+        if self.simulable:
+            self.boton_simular = ttk.Button(self.left_frame, text="Comparar con simulación", command=self.simular)
+            self.boton_simular.grid(row=fila + 3, column=0, columnspan=2, pady=10)
+            self.boton_simular.grid_remove()
+
         # Botón de retroceso
         self.boton_retroceso = ttk.Button(self.left_frame, text="Volver", command=self.volver)
-        self.boton_retroceso.grid(row=5, column=0, columnspan=2, pady=10)
-
-        # Historial
-        self.label_historial = ttk.Label(self.right_frame, text="Historial", font=("Arial", 14, "bold"))
-        self.label_historial.grid(row=0, column=0, pady=10)
-
-        self.tree_historial = ttk.Treeview(self.right_frame, columns=("λ", "μ", "ρ"), show="headings")
-        self.tree_historial.heading("λ", text="λ")
-        self.tree_historial.heading("μ", text="μ")
-        self.tree_historial.heading("ρ", text="ρ")
-        self.tree_historial.grid(row=1, column=0, padx=10, pady=10)
-
-        # Barra de desplazamiento para el historial
-        scrollbar_historial = ttk.Scrollbar(self.right_frame, orient="vertical", command=self.tree_historial.yview)
-        scrollbar_historial.grid(row=1, column=1, sticky="ns")
-        self.tree_historial.configure(yscrollcommand=scrollbar_historial.set)
+        self.boton_retroceso.grid(row=fila + 4, column=0, columnspan=2, pady=10)
+
+        # Progreso de los trabajos en segundo plano
+        self.iniciar_trabajos(fila=fila + 5)
+
+        self.crear_panel_derecho()
+
+    def crear_entradas(self, fila=0):
+        """Una etiqueta y un Entry por cada elemento de ``etiquetas``; devuelve la siguiente fila libre."""
+        self.entradas = {}
+        for i, (clave, texto) in enumerate(self.etiquetas):
+            ttk.Label(self.left_frame, text=texto).grid(row=fila + i, column=0, padx=10, pady=10)
+            self.entradas[clave] = ttk.Entry(self.left_frame)
+            self.entradas[clave].grid(row=fila + i, column=1, padx=10, pady=10)
+        return fila + len(self.etiquetas)
+
+    def crear_panel_derecho(self):
+        """Contenido de right_frame; por defecto nada."""
+
+    def leer(self, clave, tipo=float):
+        """Valor de la entrada ``clave`` convertido a ``tipo``; None si está vacía."""
+        texto = self.entradas[clave].get().strip()
+        return tipo(texto) if texto else None
+
+    def leer_parametros(self):
+        """Valores de ``parametros`` en orden; ValueError si uno obligatorio falta o no es un número."""
+        valores = []
+        for clave, tipo, obligatorio in self.parametros:
+            valor = self.leer(clave, tipo)
+            if valor is None and obligatorio:
+                raise ValueError(clave)
+            valores.append(valor)
+        return valores
 
     def calcular(self):
+        """Calcula con la caché y el historial del modelo; las ventanas sin historial lo redefinen."""
         try:
-            lambda_ = float(self.entry_lambda.get())
-            mu = float(self.entry_mu.get())
-            self.resultados = calcular_sin_limite_cola(lambda_, mu)
-            self.mostrar_resultados()
-            self.boton_descargar.grid()  # Mostrar botón de descarga
-
-            # Agregar al historial
-            self.tree_historial.insert("", "end", values=(lambda_, mu, f"{self.resultados['rho']:.4f}"))
+            parametros = self.leer_parametros()
         except ValueError:
             messagebox.showerror("Error", "Por favor, ingresa valores numéricos válidos.")
+            return
 
-    def mostrar_resultados(self):
-        # Limpiar frame de resultados
-        for widget in self.resultados_frame.winfo_children():
-            widget.destroy()
-
-        # Mostrar resultados
-        ttk.Label(self.resultados_frame, text="Resultados", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=2, pady=10)
-
-        ttk.Label(self.resultados_frame, text=f"Tasa de llegada (λ): {self.resultados['lambda']}").grid(row=1, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Tasa de servicio (μ): {self.resultados['mu']}").grid(row=2, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Rho (ρ): {self.resultados['rho']:.4f}").grid(row=3, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Probabilidad de sistema vacío (P₀): {self.resultados['Po']:.4f}").grid(row=4, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Número esperado en el sistema (L): {self.resultados['Ls']:.4f}").grid(row=5, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Número esperado en la cola (Lq): {self.resultados['Lq']:.4f}").grid(row=6, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Tiempo esperado en el sistema (W): {self.resultados['Ws']:.4f}").grid(row=7, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Tiempo esperado en la cola (Wq): {self.resultados['Wq']:.4f}").grid(row=8, column=0, sticky="w", padx=10, pady=5)
-
-        # Mostrar distribución de probabilidad
-        ttk.Label(self.resultados_frame, text="Distribución de Probabilidad", font=("Arial", 14, "bold")).grid(row=9, column=0, columnspan=2, pady=10)
-
-        # Crear Treeview para la tabla
-        self.tree = ttk.Treeview(self.resultados_frame, columns=("Estado", "P(n)", "P(Acum)"), show="headings")
-        self.tree.heading("Estado", text="Estado")
-        self.tree.heading("P(n)", text="P(n)")
-        self.tree.heading("P(Acum)", text="P(Acum)")
-        self.tree.grid(row=10, column=0, columnspan=2, padx=10, pady=10)
-
-        # Agregar barra de desplazamiento
-        scrollbar = ttk.Scrollbar(self.resultados_frame, orient="vertical", command=self.tree.yview)
-        scrollbar.grid(row=10, column=2, sticky="ns")
-        self.tree.configure(yscrollcommand=scrollbar.set)
-
-        # Llenar la tabla con los datos
-        for i, (p_abs, p_acum) in enumerate(zip(self.resultados["probabilidades_absolutas"], self.resultados["probabilidades_acumuladas"])):
-            self.tree.insert("", "end", values=(i, f"{p_abs:.4f}", f"{p_acum:.4f}"))
-
-    def descargar_resultados(self):
-        generar_reporte(self.resultados)
-
-    def volver(self):
-        self.destroy()  # Cierra esta ventana
-        self.master.state('zoomed')
-        self.master.deiconify()  # Muestra la ventana principal
+        self.calcular_y_registrar(*parametros)
 
-class VentanaConLimite(tk.Toplevel):
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.title("Modelo con límite en cola")
-        self.state('zoomed')  # Abrir en pantalla completa
-        self.configure(bg="#2C2F33")
+    def iniciar_trabajos(self, fila):
+        # Trabajos en segundo plano con barra de progreso y botón de cancelar
+        self.trabajos = GestorTrabajos(self)
+        self.barra_progreso = BarraProgreso(self.left_frame, al_cancelar=self.cancelar_trabajos)
+        self.barra_progreso.grid(row=fila, column=0, columnspan=2, pady=10)
+        self.barra_progreso.grid_remove()  # Ocultar inicialmente
 
-        # Frame principal con barra de desplazamiento
-        self.canvas = tk.Canvas(self, bg="#2C2F33")
-        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = ttk.Frame(self.canvas)
+        # Últimos tiempos medidos, al pie de la ventana (solo con la instrumentación activa)
+        if instrumentacion.ACTIVA:
+            self.barra_estado = BarraEstado(self)
+            self.barra_estado.pack(side="bottom", fill="x", before=self.canvas)
 
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(
-                scrollregion=self.canvas.bbox("all")
-            )
+    def iniciar_historial(self, modelo, columnas):
+        # Historial persistente leído por páginas; al seleccionar se recarga desde la caché
+        self.modelo = modelo
+        self.label_historial = ttk.Label(self.right_frame, text="Historial", font=("Arial", 14, "bold"))
+        self.label_historial.grid(row=0, column=0, pady=10)
+        self.panel_historial = PanelHistorial(self.right_frame, obtener_historial(), modelo, columnas, self.cargar_historial)
+        self.panel_historial.grid(row=1, column=0)
+        self.tree_historial = self.panel_historial.tree
+
+    def calcular_y_registrar(self, *parametros):
+        """Calcula en segundo plano, guarda el cálculo en el historial y lo muestra."""
+        def terminado(resultados):
+            self.mostrar_calculo(resultados)
+            self.panel_historial.recargar()
+
+        self.ejecutar("calculo", "Calculando...", lambda trabajo: calcular_con_cache(self.modelo, *parametros, registrar=True), terminado)
+
+    def cargar_historial(self, fila):
+        parametros = (fila["lambda"], fila["mu"], fila["N"], fila["c"])
+        self.ejecutar("calculo", "Cargando...", lambda trabajo: calcular_con_cache(self.modelo, *parametros), self.mostrar_calculo)
+
+    def ejecutar(self, canal, texto, funcion, al_terminar):
+        """Ejecuta funcion(trabajo) en segundo plano; un trabajo nuevo reemplaza al anterior del canal."""
+        def terminado(valor):
+            self.fin_trabajo()
+            al_terminar(valor)
+
+        def medida(trabajo):
+            # Cada trabajo es una etapa de la instrumentación ("calculo", "reporte")
+            with instrumentacion.etapa(canal, perfilable=True, ventana=type(self).__name__):
+                return funcion(trabajo)
+
+        self.barra_progreso.iniciar(texto)
+        self.trabajos.enviar(
+            canal, medida,
+            al_terminar=terminado,
+            al_fallar=self.trabajo_fallido,
+            al_progreso=self.barra_progreso.actualizar
         )
 
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        self.canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
+    def fin_trabajo(self):
+        if not self.trabajos.ocupado():
+            self.barra_progreso.terminar()
 
-        # Frame para los campos de entrada y resultados
-        self.left_frame = ttk.Frame(self.scrollable_frame)
-        self.left_frame.grid(row=0, column=0, padx=10, pady=10, sticky="n")
-
-        # Frame para el historial
-        self.right_frame = ttk.Frame(self.scrollable_frame)
-        self.right_frame.grid(row=0, column=1, padx=10, pady=10, sticky="n")
-
-        # Entradas
-        self.label_lambda = ttk.Label(self.left_frame, text="Tasa de llegada (λ):")
-        self.label_lambda.grid(row=0, column=0, padx=10, pady=10)
-        self.entry_lambda = ttk.Entry(self.left_frame)
-        self.entry_lambda.grid(row=0, column=1, padx=10, pady=10)
+    def trabajo_fallido(self, error):
+        self.fin_trabajo()
+        if isinstance(error, SistemaInestableError):
+            messagebox.showerror("Critical Error", str(error))
+        else:
+            messagebox.showerror("Error", str(error))
 
-        self.label_mu = ttk.Label(self.left_frame, text="Tasa de servicio (μ):")
-        self.label_mu.grid(row=1, column=0, padx=10, pady=10)
-        self.entry_mu = ttk.Entry(self.left_frame)
-        self.entry_mu.grid(row=1, column=1, padx=10, pady=10)
+    def cancelar_trabajos(self):
+        self.trabajos.cancelar_todos()
+        self.barra_progreso.terminar()
 
-        self.label_N = ttk.Label(self.left_frame, text="Límite de cola (N):")
-        self.label_N.grid(row=2, column=0, padx=10, pady=10)
-        self.entry_N = ttk.Entry(self.left_frame)
-        self.entry_N.grid(row=2, column=1, padx=10, pady=10)
+    def mostrar_calculo(self, resultados):
+        self.resultados = resultados
+        with instrumentacion.etapa("tabla", ventana=type(self).__name__):
+            self.mostrar_resultados()
+        self.boton_descargar.grid()  # Mostrar botón de descarga
+        if self.simulable:
+            self.boton_simular.grid()
 
-        # Botón de cálculo
-        self.boton_calcular = ttk.Button(self.left_frame, text="Calcular", command=self.calcular)
-        self.boton_calcular.grid(row=3, column=0, columnspan=2, pady=20)
+    def mostrar_resultados(self):
+        # Los widgets de resultados se crean la primera vez y luego solo se actualizan
+        if self.panel_resultados is None:
+            self.panel_resultados = PanelResultados(self.resultados_frame, self.campos)
+            self.panel_resultados.grid(row=0, column=0, columnspan=2)
+
+            # Mostrar distribución de probabilidad
+            ttk.Label(self.resultados_frame, text="Distribución de Probabilidad", font=("Arial", 14, "bold")).grid(row=1, column=0, columnspan=2, pady=10)
+            self.tabla_distribucion = TablaDistribucion(self.resultados_frame)
+            self.tabla_distribucion.grid(row=2, column=0, columnspan=2)
+            self.tree = self.tabla_distribucion.tree
+
+        self.panel_resultados.actualizar(self.resultados)
+        self.tabla_distribucion.mostrar(self.resultados.get("distribucion"))
+        self.mostrar_simulacion()
+
+    def mostrar_simulacion(self):
+        # Tabla analítico vs. simulado, solo si se simuló este resultado
+        simulacion = self.resultados.get("simulacion")
+        if simulacion is None:
+            if self.tabla_simulacion is not None:
+                self.label_simulacion.grid_remove()
+                self.tabla_simulacion.grid_remove()
+            return
+        if self.tabla_simulacion is None:
+            self.label_simulacion = ttk.Label(self.resultados_frame, font=("Arial", 14, "bold"))
+            self.label_simulacion.grid(row=3, column=0, columnspan=2, pady=10)
+            columnas = ("Métrica", "Analítico", "Simulado", "Diferencia")
+            self.tabla_simulacion = ttk.Treeview(self.resultados_frame, columns=columnas, show="headings", height=len(METRICAS_COMPARADAS))
+            for columna in columnas:
+                self.tabla_simulacion.heading(columna, text=columna)
+                self.tabla_simulacion.column(columna, width=140)
+            self.tabla_simulacion.grid(row=4, column=0, columnspan=2)
+
+        self.label_simulacion.configure(text=f"Simulación ({simulacion['clientes']:,} clientes)")
+        self.label_simulacion.grid()
+        self.tabla_simulacion.grid()
+        self.tabla_simulacion.delete(*self.tabla_simulacion.get_children())
+        for etiqueta, analitico, simulado, diferencia in comparar(self.resultados, simulacion):
+            texto = "—" if diferencia != diferencia else f"{diferencia:+.2%}"
+            self.tabla_simulacion.insert("", "end", values=(etiqueta, f"{analitico:.4f}", f"{simulado:.4f}", texto))
+
+    def simular(self):
+        """Simula el resultado mostrado y lo vuelve a mostrar con la comparación."""
+        resultados = self.resultados
+
+        def terminado(simulacion):
+            if self.resultados is resultados:  # Si mientras tanto se calculó otro, se descarta
+                self.mostrar_calculo(dict(resultados, simulacion=simulacion))
+
+        self.ejecutar(
+            "simulacion", f"Simulando {CLIENTES_COMPARACION:,} clientes...",
+            lambda trabajo: simular_resultados(resultados), terminado
+        )
 
-        # Frame de resultados
-        self.resultados_frame = ttk.Frame(self.left_frame)
-        self.resultados_frame.grid(row=4, column=0, columnspan=2, pady=20)
+    def descargar_resultados(self):
+        resultados = self.resultados
+        self.ejecutar(
+            "reporte", "Generando reporte...",
+            lambda trabajo: generar_reporte(resultados, al_progreso=trabajo.informar),
+            lambda filename: messagebox.showinfo("Reporte Generado", f"El reporte se ha guardado en {filename}")
+        )
 
-        # Botón de descarga
-        self.boton_descargar = ttk.Button(self.left_frame, text="Descargar resultados", command=self.descargar_resultados)
-        self.boton_descargar.grid(row=5, column=0, columnspan=2, pady=10)
-        self.boton_descargar.grid_remove()  # Ocultar inicialmente
+    def volver(self):
+        self.trabajos.cerrar()  # Descarta los trabajos pendientes de esta ventana
+        self.destroy()  # Cierra esta ventana
+        self.master.state('zoomed')
+        self.master.deiconify()  # Muestra la ventana principal
 
-        # Botón de retroceso
-        self.boton_retroceso = ttk.Button(self.left_frame, text="Volver", command=self.volver)
-        self.boton_retroceso.grid(row=6, column=0, columnspan=2, pady=10)
+class VentanaSinLimite(VentanaModelo):
+    titulo = "Modelo sin límite en cola"
+    simulable = True
+
+    def crear_panel_derecho(self):
+        self.iniciar_historial("sin_limite", [("λ", "lambda", "{}"), ("μ", "mu", "{}"), ("ρ", "rho", "{:.4f}")])
+
+class VentanaConLimite(VentanaModelo):
+    campos = CAMPOS_CON_LIMITE
+    titulo = "Modelo con límite en cola"
+    simulable = True
+    etiquetas = VentanaModelo.etiquetas + [("N", "Límite de cola (N):")]
+    parametros = VentanaModelo.parametros + [("N", int, True)]
+
+    def crear_panel_derecho(self):
+        self.iniciar_historial("con_limite", [("λ", "lambda", "{}"), ("μ", "mu", "{}"), ("N", "N", "{}"), ("ρ", "rho", "{:.4f}")])
+
+class VentanaDiseno(VentanaModelo):
+    campos = CAMPOS_CON_LIMITE
+    titulo = "Diseño por objetivo"
+    # Las que se dejan vacías no se usan
+    etiquetas = [
+        ("lambda", "Tasa de llegada (λ):"),
+        ("mu", "Tasa de servicio (μ) [buscar N]:"),
+        ("N", "Límite de cola (N) [opcional]:"),
+        ("Wq", "Wq máximo:"),
+        ("Ws", "Ws máximo:"),
+        ("prob_bloqueo", "P(bloqueo) máxima:"),
+        ("utilizacion", "Utilización máxima:"),
+    ]
 
+    def crear_entradas(self, fila=0):
+        # Parámetro a buscar
+        self.buscar = tk.StringVar(value="mu")
+        self.label_buscar = ttk.Label(self.left_frame, text="Buscar:")
+        self.label_buscar.grid(row=fila, column=0, padx=10, pady=10)
+        buscar_frame = ttk.Frame(self.left_frame)
+        buscar_frame.grid(row=fila, column=1, padx=10, pady=10)
+        ttk.Radiobutton(buscar_frame, text="μ mínimo", variable=self.buscar, value="mu").grid(row=0, column=0, padx=5)
+        ttk.Radiobutton(buscar_frame, text="N mínimo", variable=self.buscar, value="N").grid(row=0, column=1, padx=5)
+        return super().crear_entradas(fila + 1)
+
+    def crear_panel_derecho(self):
         # Historial
         self.label_historial = ttk.Label(self.right_frame, text="Historial", font=("Arial", 14, "bold"))
         self.label_historial.grid(row=0, column=0, pady=10)
@@ -422,67 +429,255 @@ class VentanaConLimite(tk.Toplevel):
         scrollbar_historial.grid(row=1, column=1, sticky="ns")
         self.tree_historial.configure(yscrollcommand=scrollbar_historial.set)
 
+        # Las soluciones se guardan por fila para recargarlas al seleccionarlas
+        self.soluciones = {}
+        self.tree_historial.bind("<<TreeviewSelect>>", self.cargar_historial)
+
     def calcular(self):
         try:
-            lambda_ = float(self.entry_lambda.get())
-            mu = float(self.entry_mu.get())
-            N = int(self.entry_N.get())
-            self.resultados = calcular_con_limite_cola(lambda_, mu, N)
-            self.mostrar_resultados()
-            self.boton_descargar.grid()  # Mostrar botón de descarga
+            lambda_ = self.leer("lambda")
+            mu = self.leer("mu")
+            N = self.leer("N", int)
+            objetivos = {clave: self.leer(clave) for clave in ("Wq", "Ws", "prob_bloqueo", "utilizacion")}
+            if lambda_ is None or (self.buscar.get() == "N" and mu is None):
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Por favor, ingresa valores numéricos válidos.")
+            return
+
+        if self.buscar.get() == "mu":
+            funcion = lambda trabajo: mu_minimo(lambda_, N=N, **objetivos)
+        else:
+            funcion = lambda trabajo: N_minimo(lambda_, mu, **objetivos)
 
+        def terminado(resultados):
+            self.mostrar_calculo(resultados)
             # Agregar al historial
-            self.tree_historial.insert("", "end", values=(lambda_, mu, N, f"{self.resultados['rho']:.4f}"))
+            N_solucion = resultados["distribucion"].N
+            item = self.tree_historial.insert("", "end", values=(
+                resultados["lambda"], f"{resultados['mu']:.6g}", "∞" if N_solucion is None else N_solucion, f"{resultados['rho']:.4f}"
+            ))
+            self.soluciones[item] = resultados
+
+        self.ejecutar("calculo", "Buscando...", funcion, terminado)
+
+    def cargar_historial(self, event=None):
+        seleccion = self.tree_historial.selection()
+        if seleccion:
+            self.mostrar_calculo(self.soluciones[seleccion[0]])
+
+class VentanaMultiservidor(VentanaModelo):
+    campos = CAMPOS_MULTISERVIDOR
+    titulo = "Modelo multiservidor (M/M/c y M/M/c/K)"
+    # K vacío = M/M/c (sin límite)
+    etiquetas = VentanaModelo.etiquetas + [("c", "Servidores (c):"), ("K", "Capacidad (K) [opcional]:")]
+    # En la clave de la caché y del historial N es la capacidad (K)
+    parametros = VentanaModelo.parametros + [("K", int, False), ("c", int, True)]
+
+    def crear_panel_derecho(self):
+        self.iniciar_historial("multiservidor", [("λ", "lambda", "{}"), ("μ", "mu", "{}"), ("c", "c", "{}"), ("K", "N", "{}"), ("ρ", "rho", "{:.4f}")])
+
+    def leer_parametros(self):
+        lambda_, mu, K, c = super().leer_parametros()
+        if c < 1:
+            raise ValueError("c")
+        return [lambda_, mu, K, c]
+
+class VentanaTransitorio(VentanaModelo):
+    """P(n, t) y E[L(t)] del M/M/1/N desde un estado inicial; el panel muestra el estado estacionario."""
+    campos = CAMPOS_CON_LIMITE
+    titulo = "Análisis transitorio (M/M/1/N)"
+    etiquetas = [
+        ("lambda", "Tasa de llegada (λ):"),
+        ("mu", "Tasa de servicio (μ):"),
+        ("N", "Límite de cola (N):"),
+        ("estado_inicial", "Clientes en t = 0:"),
+        ("tiempos", "Tiempos (inicio:fin:puntos o lista):"),
+    ]
+
+    def crear_entradas(self, fila=0):
+        fila = super().crear_entradas(fila)
+        self.entradas["estado_inicial"].insert(0, "0")
+        self.entradas["tiempos"].insert(0, "0:10:101")
+        return fila
+
+    def crear_panel_derecho(self):
+        # Evolución: una fila por tiempo; al seleccionarla se muestra P(n, t)
+        self.label_evolucion = ttk.Label(self.right_frame, text="Evolución en el tiempo", font=("Arial", 14, "bold"))
+        self.label_evolucion.grid(row=0, column=0, pady=10)
+
+        columnas = ("t", "E[L(t)]", "E[Lq(t)]", "P₀(t)", "P(N, t)")
+        self.tree_evolucion = ttk.Treeview(self.right_frame, columns=columnas, show="headings", height=20)
+        for columna in columnas:
+            self.tree_evolucion.heading(columna, text=columna)
+            self.tree_evolucion.column(columna, width=110)
+        self.tree_evolucion.grid(row=1, column=0, padx=10, pady=10)
+
+        scrollbar_evolucion = ttk.Scrollbar(self.right_frame, orient="vertical", command=self.tree_evolucion.yview)
+        scrollbar_evolucion.grid(row=1, column=1, sticky="ns")
+        self.tree_evolucion.configure(yscrollcommand=scrollbar_evolucion.set)
+        self.tree_evolucion.bind("<<TreeviewSelect>>", self.mostrar_instante)
+
+        self.label_instante = ttk.Label(self.right_frame, text="")
+        self.label_instante.grid(row=2, column=0, pady=10)
+
+    def calcular(self):
+        try:
+            lambda_ = float(self.entradas["lambda"].get())
+            mu = float(self.entradas["mu"].get())
+            N = int(self.entradas["N"].get())
+            estado_inicial = int(self.entradas["estado_inicial"].get())
+            tiempos = interpretar_tiempos(self.entradas["tiempos"].get())
         except ValueError:
             messagebox.showerror("Error", "Por favor, ingresa valores numéricos válidos.")
+            return
+
+        def calculo(trabajo):
+            transitorio = transitorio_con_limite(lambda_, mu, N, tiempos, estado_inicial)
+            resultados = dict(transitorio["estacionario"])
+            resultados["transitorio"] = transitorio
+            return resultados
+
+        self.ejecutar("calculo", "Calculando...", calculo, self.mostrar_calculo)
 
     def mostrar_resultados(self):
-        # Limpiar frame de resultados
-        for widget in self.resultados_frame.winfo_children():
-            widget.destroy()
-
-        # Mostrar resultados
-        ttk.Label(self.resultados_frame, text="Resultados", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=2, pady=10)
-
-        ttk.Label(self.resultados_frame, text=f"Tasa de llegada (λ): {self.resultados['lambda']}").grid(row=1, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Tasa de servicio (μ): {self.resultados['mu']}").grid(row=2, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Rho (ρ): {self.resultados['rho']:.4f}").grid(row=3, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Probabilidad de sistema vacío (P₀): {self.resultados['Po']:.4f}").grid(row=4, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Número esperado en el sistema (L): {self.resultados['Ls']:.4f}").grid(row=5, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Número esperado en la cola (Lq): {self.resultados['Lq']:.4f}").grid(row=6, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Tiempo esperado en el sistema (W): {self.resultados['Ws']:.4f}").grid(row=7, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Tiempo esperado en la cola (Wq): {self.resultados['Wq']:.4f}").grid(row=8, column=0, sticky="w", padx=10, pady=5)
-        ttk.Label(self.resultados_frame, text=f"Tasa de llegada efectiva (λ_efectiva): {self.resultados['lambda_efectiva']:.4f}").grid(row=9, column=0, sticky="w", padx=10, pady=5)  # Nueva línea
-
-        # Mostrar distribución de probabilidad
-        ttk.Label(self.resultados_frame, text="Distribución de Probabilidad", font=("Arial", 14, "bold")).grid(row=10, column=0, columnspan=2, pady=10)
-
-        # Crear Treeview para la tabla
-        self.tree = ttk.Treeview(self.resultados_frame, columns=("Estado", "P(n)", "P(Acum)"), show="headings")
-        self.tree.heading("Estado", text="Estado")
-        self.tree.heading("P(n)", text="P(n)")
-        self.tree.heading("P(Acum)", text="P(Acum)")
-        self.tree.grid(row=11, column=0, columnspan=2, padx=10, pady=10)
-
-        # Agregar barra de desplazamiento
-        scrollbar = ttk.Scrollbar(self.resultados_frame, orient="vertical", command=self.tree.yview)
-        scrollbar.grid(row=11, column=2, sticky="ns")
-        self.tree.configure(yscrollcommand=scrollbar.set)
-
-        # Llenar la tabla con los datos
-        for i, (p_abs, p_acum) in enumerate(zip(self.resultados["probabilidades_absolutas"], self.resultados["probabilidades_acumuladas"])):
-            self.tree.insert("", "end", values=(i, f"{p_abs:.4f}", f"{p_acum:.4f}"))
+        super().mostrar_resultados()
+        transitorio = self.resultados["transitorio"]
+        self.tree_evolucion.delete(*self.tree_evolucion.get_children())
+        columnas = [transitorio[clave] for clave in ("tiempos", "L", "Lq", "Po", "prob_bloqueo")]
+        for i, (t, *valores) in enumerate(zip(*columnas)):
+            self.tree_evolucion.insert("", "end", iid=str(i), values=[f"{t:.4g}"] + [f"{valor:.4f}" for valor in valores])
+        self.label_instante.configure(text="Distribución mostrada: estado estacionario")
+
+    def mostrar_instante(self, event=None):
+        seleccion = self.tree_evolucion.selection()
+        if not seleccion or self.resultados["transitorio"]["P"] is None:
+            return
+        i = int(seleccion[0])
+        transitorio = self.resultados["transitorio"]
+        self.tabla_distribucion.mostrar(distribucion_en(transitorio, i))
+        self.label_instante.configure(text=f"Distribución mostrada: P(n, t = {transitorio['tiempos'][i]:.4g})")
+
+class VentanaIncertidumbre(VentanaModelo):
+    """λ, μ y N como distribuciones: percentiles por Monte Carlo y el cálculo en los valores centrales."""
+    campos = CAMPOS_CON_LIMITE
+    titulo = "Incertidumbre de λ y μ (Monte Carlo)"
+    # Entradas: un número, "2 ± 0.1" o "familia(a, b[, c])"
+    etiquetas = [
+        ("lambda", "Tasa de llegada (λ):"),
+        ("mu", "Tasa de servicio (μ):"),
+        ("N", "Límite de cola (N, opcional):"),
+        ("muestras", "Muestras:"),
+    ]
 
-    def descargar_resultados(self):
-        generar_reporte(self.resultados)
+    def crear_entradas(self, fila=0):
+        fila = super().crear_entradas(fila)
+        self.entradas["lambda"].insert(0, "2 ± 0.2")
+        self.entradas["mu"].insert(0, "gamma(3, 0.3)")
+        self.entradas["muestras"].insert(0, "1000000")
+        ttk.Label(
+            self.left_frame, font=("Arial", 9),
+            text="Distribuciones: normal(media, desvío), lognormal(media, desvío), gamma(media, desvío),\n"
+                 "uniforme(mín, máx), triangular(mín, moda, máx); \"a ± d\" es normal."
+        ).grid(row=fila, column=0, columnspan=2, padx=10)
+        return fila + 1
+
+    def crear_panel_derecho(self):
+        # Percentiles por métrica
+        self.label_percentiles = ttk.Label(self.right_frame, text="Percentiles", font=("Arial", 14, "bold"))
+        self.label_percentiles.grid(row=0, column=0, pady=10)
+        self.tree_percentiles = None
+
+        self.label_inestabilidad = ttk.Label(self.right_frame, text="")
+        self.label_inestabilidad.grid(row=2, column=0, pady=10)
 
-    def volver(self):
-        self.destroy()  # Cierra esta ventana
-        self.master.state('zoomed')
-        self.master.deiconify()  # Muestra la ventana principal
+    def calcular(self):
+        try:
+            lambda_ = interpretar_distribucion(self.entradas["lambda"].get())
+            mu = interpretar_distribucion(self.entradas["mu"].get())
+            texto_N = self.entradas["N"].get().strip()
+            N = interpretar_distribucion(texto_N) if texto_N else None
+            muestras = int(self.entradas["muestras"].get())
+            # El cálculo puntual en los valores centrales divide por μ
+            lambda_c, mu_c, N_c = valores_centrales(lambda_, mu, N)
+        except ValueError as error:
+            messagebox.showerror("Error", f"Por favor, ingresa valores o distribuciones válidos.\n{error}")
+            return
+
+        def calculo(trabajo):
+            incertidumbre = propagar_incertidumbre(lambda_, mu, N, muestras, al_progreso=trabajo.informar)
+            # Cálculo puntual en los valores centrales; si es inestable solo quedan λ, μ y ρ
+            try:
+                resultados = calcular_sin_limite_cola(lambda_c, mu_c) if N is None else calcular_con_limite_cola(lambda_c, mu_c, N_c)
+            except SistemaInestableError:
+                resultados = {"lambda": lambda_c, "mu": mu_c, "rho": lambda_c / mu_c}
+            resultados["incertidumbre"] = incertidumbre
+            return resultados
+
+        self.ejecutar("calculo", "Muestreando...", calculo, self.mostrar_calculo)
+
+    def mostrar_resultados(self):
+        super().mostrar_resultados()
+        incertidumbre = self.resultados["incertidumbre"]
+
+        # Las columnas dependen de los percentiles pedidos: la tabla se arma una vez
+        if self.tree_percentiles is None:
+            columnas = ("Métrica", "Media", "Desvío") + tuple(f"P{p:g}" for p in incertidumbre["percentiles"])
+            self.tree_percentiles = ttk.Treeview(self.right_frame, columns=columnas, show="headings", height=3)
+            for columna in columnas:
+                self.tree_percentiles.heading(columna, text=columna)
+                self.tree_percentiles.column(columna, width=240 if columna == "Métrica" else 90)
+            self.tree_percentiles.grid(row=1, column=0, padx=10, pady=10)
+
+        self.tree_percentiles.delete(*self.tree_percentiles.get_children())
+        for clave, resumen in incertidumbre["metricas"].items():
+            valores = [resumen["media"], resumen["desvio"]] + resumen["percentiles"]
+            self.tree_percentiles.insert("", "end", values=[ETIQUETAS_METRICAS[clave]] + [f"{valor:.4g}" for valor in valores])
+
+        texto = f"P(ρ ≥ 1) = {incertidumbre['prob_rho_mayor_1']:.4f}   ({incertidumbre['validas']:,} muestras válidas"
+        if incertidumbre["descartadas"]:
+            texto += f", {incertidumbre['descartadas']:,} descartadas"
+        self.label_inestabilidad.configure(text=texto + ")")
+
+def leer_argumentos(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Calculadora de modelos de colas")
+    parser.add_argument("--servicio", action="store_true", help="servir los cálculos por HTTP/JSON sin abrir la GUI")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--socket", help="escuchar en un socket Unix en lugar de TCP")
+    parser.add_argument("--ventana-ms", type=float, default=2.0, help="ventana de agrupación de peticiones")
+    parser.add_argument("--procesos", type=int, help="procesos para las peticiones pesadas")
+    parser.add_argument("--lote", nargs=argparse.REMAINDER, metavar="ARGUMENTOS",
+                        help="evaluar un archivo de escenarios (ver python lotes.py --help)")
+    return parser.parse_args(argv)
 
 # Ejecutar la aplicación
 if __name__ == "__main__":
-    app = CalculadoraColas()
-    app.state('zoomed')  # Abrir en pantalla completa
-    app.mainloop()
\ No newline at end of file
+    import multiprocessing
+
+    # En el ejecutable empaquetado los procesos hijos (lotes, servicio) arrancan por aquí
+    multiprocessing.freeze_support()
+    argumentos = leer_argumentos()
+    if argumentos.lote is not None:
+        from lotes import main as ejecutar_lote
+        ejecutar_lote(argumentos.lote)
+    elif argumentos.servicio:
+        from servicio import ejecutar_servicio
+        ejecutar_servicio(argumentos.host, argumentos.puerto, argumentos.socket, argumentos.ventana_ms, argumentos.procesos)
+    else:
+        app = CalculadoraColas()
+        app.state('zoomed')  # Abrir en pantalla completa
+        if os.environ.get("CALCULADORA_SALIR_AL_MOSTRAR"):
+            # Para medir el arranque (benchmarks/bench_ejecutable.py): anotar cuándo se
+            # dibuja la primera ventana y cerrar
+            def al_mostrar(event):
+                if event.widget is app:
+                    import time
+                    with open(os.environ["CALCULADORA_SALIR_AL_MOSTRAR"], "w") as archivo:
+                        archivo.write(repr(time.time()))
+                    app.after_idle(app.destroy)
+
+            app.bind("<Map>", al_mostrar)
+        app.mainloop()
\ No newline at end of file
@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('resources/PressStart2P-Regular.ttf', 'resources')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
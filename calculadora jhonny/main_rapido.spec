@@ -0,0 +1,65 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Perfil de arranque rápido (comparar con main.spec usando benchmarks/bench_ejecutable.py):
+# - Carpeta (one-dir): el .exe no descomprime todo en un directorio temporal
+#   en cada arranque, los módulos se leen directo de dist/main_rapido/.
+# - Sin UPX: descomprimir las DLL al cargarlas cuesta más que leerlas.
+# - Se excluyen solo los módulos que el análisis de main.spec empaqueta y que
+#   la aplicación nunca importa (comprobado con sys.modules después de
+#   recorrer cálculo, reportes, lotes y servicio, y corriendo este build):
+#   numpy.testing trae unittest/doctest y numpy.info trae pydoc, pero la
+#   aplicación no los usa; reportlab importa doctest solo en sus autopruebas
+#   y charset_normalizer solo para metadatos XMP leídos de un archivo.
+#   reportlab (y PIL, que reportlab importa siempre) sigue incluido pero la
+#   aplicación lo importa recién al generar el primer reporte.
+# - La fuente va en datas y recursos.registrar_fuente la registra al arrancar.
+#
+#     pyinstaller --noconfirm main_rapido.spec
+
+EXCLUIDOS = [
+    # Pruebas y ayuda interactiva que arrastran numpy y reportlab
+    'unittest', 'doctest', 'pdb', 'pydoc', 'pydoc_data', 'numpy.f2py',
+    # Protocolos que la aplicación no usa
+    'xmlrpc', 'ftplib', 'charset_normalizer',
+]
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('resources/PressStart2P-Regular.ttf', 'resources')],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=EXCLUIDOS,
+    noarchive=False,
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='main',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='main_rapido',
+)
@@ -0,0 +1,237 @@
+"""Modelos multiservidor M/M/c y M/M/c/K.
+
+Se evitan factoriales y potencias grandes: Erlang B se obtiene con la
+recurrencia de su inverso en logaritmos, log(1/B(k) - 1) = log(k/a) +
+log(1/B(k-1)), y el resto de las cantidades se normaliza respecto del estado
+n = c, así que c = 2000, K - c grande o B menor que el menor float no
+desbordan ni se anulan. Los resultados tienen las
+mismas claves que ``calcular_sin_limite_cola`` / ``calcular_con_limite_cola``
+más "c", "K", "erlang_b", "erlang_c" y "prob_bloqueo" según el modelo.
+"""
+import math
+import numpy as np
+
+from colas import (
+    DistribucionEstados,
+    SistemaInestableError,
+    _escalares,
+    _geometrica_truncada,
+)
+
+# Menor 1 - q que se usa para acotar la búsqueda de cuantiles en M/M/c
+EPSILON_CUANTIL = 1e-16
+
+def _log1p_exp(z):
+    # log(1 + e^z) sin desbordar para z grande
+    return z + math.log1p(math.exp(-z)) if z > 0 else math.log1p(math.exp(z))
+
+def _log_inverso_erlang_b(a, c):
+    """log(1/B - 1) = log Σ_{n<c} p_n/p_c, sin pasar nunca por B.
+
+    Con carga liviana y c grande B es menor que el menor float y se anula;
+    su inverso cumple 1/B(k) - 1 = (k/a)·(1/B(k-1)), así que
+    z(k) = log(k/a) + log(1 + e^z(k-1)) con z(0) = -inf se mantiene finito.
+    Acepta arreglos compatibles por broadcasting. Con a escalar se calcula la
+    recurrencia una vez hasta max(c) y se indexa, útil para barridos de c.
+    """
+    a = np.asarray(a, dtype=float)
+    c = np.asarray(c, dtype=np.int64)
+    c_max = int(c.max()) if c.size else 0
+
+    if a.ndim == 0:
+        log_a = math.log(float(a)) if float(a) > 0 else -math.inf
+        z = [-math.inf]
+        for k in range(1, c_max + 1):
+            z.append(math.log(k) - log_a + _log1p_exp(z[-1]))
+        return np.asarray(z)[c]
+
+    # Ordenados por c descendente, los escenarios que siguen en el paso k
+    # (c ≥ k) son un prefijo: el trabajo total es Σc y no n·max(c)
+    a, c = np.broadcast_arrays(a, c)
+    orden = np.argsort(c, axis=None, kind="stable")[::-1]
+    with np.errstate(divide="ignore"):
+        log_a = np.log(a.ravel()[orden])
+    activos = np.searchsorted(-c.ravel()[orden], -np.arange(1, c_max + 1), side="right").tolist()
+    z = np.full(len(orden), -np.inf)
+    for k, n in enumerate(activos, start=1):
+        z[:n] = math.log(k) - log_a[:n] + np.logaddexp(0.0, z[:n])
+    salida = np.empty(a.size)
+    salida[orden] = z
+    return salida.reshape(a.shape)
+
+def erlang_b(a, c):
+    """Probabilidad de bloqueo de Erlang B para carga a = λ/μ y c servidores.
+
+    Se obtiene de ``_log_inverso_erlang_b`` y se exponencia al final: con
+    carga liviana y c grande el resultado puede ser 0 (menor que el menor
+    float), pero las cantidades que dependen de B no se ven afectadas.
+    """
+    return np.exp(-np.logaddexp(0.0, _log_inverso_erlang_b(a, c)))
+
+def _log_factorial(c):
+    # log(c!) para un arreglo de enteros, sin lgamma vectorizado
+    c = np.asarray(c, dtype=np.int64)
+    tabla = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, int(c.max(initial=0)) + 1)))])
+    return tabla[c]
+
+def _log_suma_geometrica(rho, m):
+    """log(Σ_{j=0..m} ρ^j) estable para cualquier ρ > 0 (m puede ser infinito con ρ < 1)."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        x = np.abs(np.log(rho))
+        suma = np.where(x == 0, np.log(m + 1.0), np.log(np.expm1(-x * (m + 1)) / np.expm1(-x)))
+        return suma + np.where(rho > 1, m * x, 0.0)
+
+def _normalizacion(a, c, m):
+    """Erlang B y logaritmos de los pesos relativos a p_c.
+
+    Σ_{n<c} p_n/p_c = 1/B - 1 y Σ_{n≥c} p_n/p_c = Σ_{j=0..m} ρ^j (log_W);
+    log_S es el logaritmo de la suma total, así que p_c = exp(-log_S). Todo se
+    arma en logaritmos: B se exponencia solo para devolverlo.
+    """
+    log_inverso = _log_inverso_erlang_b(a, c)
+    log_W = _log_suma_geometrica(a / c, m)
+    log_S = np.logaddexp(log_inverso, log_W)
+    return np.exp(-np.logaddexp(0.0, log_inverso)), log_W, log_S
+
+def evaluar_lote_mmck(lambda_, mu, c, K):
+    """Evalúa M/M/c/K (K = capacidad total del sistema, K ≥ c) sobre arreglos.
+
+    Con K = inf se obtiene M/M/c; los escenarios con λ ≥ cμ y K infinito se
+    marcan como inestables en la máscara "estable".
+    """
+    lambda_, mu, c, K = np.broadcast_arrays(
+        np.asarray(lambda_, dtype=float), np.asarray(mu, dtype=float),
+        np.asarray(c, dtype=np.int64), np.asarray(K, dtype=float)
+    )
+    a = lambda_ / mu
+    rho = a / c
+    m = K - c  # Lugares en la cola
+    infinito = np.isinf(K)
+    estable = ~infinito | (rho < 1)
+
+    B, log_W, log_S = _normalizacion(a, c, m)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        Po = np.exp(_log_factorial(c) - c * np.log(a) - log_S)
+        prob_espera = np.exp(log_W - log_S)  # P(n ≥ c)
+        prob_bloqueo = np.where(infinito, 0.0, np.exp(m * np.log(rho) - log_S))
+        media_cola = np.where(infinito, rho / (1 - rho), _geometrica_truncada(rho, np.where(infinito, 0.0, m))[2])
+
+        Lq = prob_espera * media_cola
+        lambda_efectiva = lambda_ * (1 - prob_bloqueo)
+        Ls = Lq + lambda_efectiva / mu  # Servidores ocupados en promedio = λ_ef/μ
+        Ws = Ls / lambda_efectiva
+        Wq = Lq / lambda_efectiva
+
+    def inestable_nan(valores):
+        return np.where(estable, valores, np.nan)
+
+    return {
+        "lambda": lambda_,
+        "mu": mu,
+        "c": c,
+        "K": K,
+        "rho": rho,
+        "Po": inestable_nan(Po),
+        "Ls": inestable_nan(Ls),
+        "Lq": inestable_nan(Lq),
+        "Ws": inestable_nan(Ws),
+        "Wq": inestable_nan(Wq),
+        "lambda_efectiva": inestable_nan(lambda_efectiva),
+        "erlang_b": B,
+        "prob_espera": inestable_nan(prob_espera),
+        "prob_bloqueo": inestable_nan(prob_bloqueo),
+        "estable": estable
+    }
+
+def evaluar_lote_mmc(lambda_, mu, c):
+    """Evalúa M/M/c sobre arreglos; "erlang_c" es la probabilidad de esperar."""
+    lote = evaluar_lote_mmck(lambda_, mu, c, np.inf)
+    lote["erlang_c"] = lote["prob_espera"]
+    return lote
+
+class DistribucionMultiservidor(DistribucionEstados):
+    """Distribución de estados de M/M/c (K=None) o M/M/c/K con la misma interfaz que DistribucionEstados.
+
+    Los estados n < c (a lo sumo c valores) se precalculan; la cola n ≥ c es
+    geométrica y se evalúa en forma cerrada.
+    """
+
+    def __init__(self, lambda_, mu, c, K=None, umbral=0.9999):
+        self.c = int(c)
+        self.N = None if K is None else int(K)
+        self.umbral = umbral
+        a = lambda_ / mu
+        self.rho = a / self.c
+        self.log_rho = math.log(self.rho) if self.rho > 0 else -math.inf
+
+        _, _, log_S = _normalizacion(a, self.c, math.inf if K is None else K - self.c)
+        self.p_c = math.exp(-float(log_S))
+        # p_n para n < c: p_c · c!/n! · a^(n-c)
+        n = np.arange(self.c)
+        self.prefijo = np.exp(_log_factorial(self.c) - _log_factorial(n) + (n - self.c) * math.log(a) - log_S)
+        self.prefijo_acumulado = np.cumsum(self.prefijo)
+        self.ultimo_estado = self.N if self.N is not None else self.cuantil(umbral)
+
+    def probabilidad(self, n):
+        if n < 0 or (self.N is not None and n > self.N):
+            return 0.0
+        if n < self.c:
+            return float(self.prefijo[n])
+        return self.p_c * math.exp((n - self.c) * self.log_rho) if n > self.c else self.p_c
+
+    def acumulada(self, n):
+        if n < 0:
+            return 0.0
+        if self.N is not None and n >= self.N:
+            return 1.0
+        if n < self.c:
+            return float(self.prefijo_acumulado[n])
+        previo = float(self.prefijo_acumulado[-1]) if self.c else 0.0
+        return min(previo + self.p_c * math.exp(float(_log_suma_geometrica(self.rho, float(n - self.c)))), 1.0)
+
+    def cuantil(self, q):
+        # Primero en los estados precalculados, luego búsqueda exponencial y binaria en la cola
+        if self.c and self.prefijo_acumulado[-1] >= q:
+            return int(np.searchsorted(self.prefijo_acumulado, q))
+        inferior, superior = self.c, self.c
+        tope = self._tope_cuantil(q)
+        while superior < tope and self.acumulada(superior) < q:
+            inferior, superior = superior, min(superior * 2 + 1, tope)
+        while inferior < superior:
+            medio = (inferior + superior) // 2
+            if self.acumulada(medio) >= q:
+                superior = medio
+            else:
+                inferior = medio + 1
+        return superior
+
+    def _tope_cuantil(self, q):
+        # Con K finito, K; sin límite la cola cumple P(n > c + j) ≤ ρ^(j+1), así
+        # que ningún cuantil pasa de c + log(1-q)/log ρ (aunque por redondeo la
+        # acumulada no llegue a q)
+        if self.N is not None:
+            return self.N
+        return self.c + math.ceil(math.log(max(1 - q, EPSILON_CUANTIL)) / self.log_rho)
+
+def calcular_mmc(lambda_, mu, c):
+    lote = evaluar_lote_mmc(lambda_, mu, c)
+    if not lote["estable"].item():
+        raise SistemaInestableError("c·μ tiene que ser mayor que lambda (λ)")
+    resultados = _escalares(lote)
+    resultados["c"] = int(c)
+    resultados["erlang_b"] = lote["erlang_b"].item()
+    resultados["erlang_c"] = lote["erlang_c"].item()
+    resultados["distribucion"] = DistribucionMultiservidor(lambda_, mu, c)
+    return resultados
+
+def calcular_mmck(lambda_, mu, c, K):
+    if K < c:
+        raise ValueError("la capacidad K tiene que ser al menos c")
+    lote = evaluar_lote_mmck(lambda_, mu, c, K)
+    resultados = _escalares(lote)
+    resultados["c"] = int(c)
+    resultados["K"] = int(K)
+    resultados["erlang_b"] = lote["erlang_b"].item()
+    resultados["prob_bloqueo"] = lote["prob_bloqueo"].item()
+    resultados["distribucion"] = DistribucionMultiservidor(lambda_, mu, c, K)
+    return resultados
@@ -0,0 +1,41 @@
+"""Rutas a los archivos de resources/ y registro de la fuente de la interfaz.
+
+Empaquetada con PyInstaller la aplicación encuentra sus datos en
+``sys._MEIPASS``; ejecutada desde el código fuente, junto a este módulo.
+"""
+import os
+import sys
+
+FUENTE = os.path.join("resources", "PressStart2P-Regular.ttf")
+FAMILIA_FUENTE = "Press Start 2P"
+
+def ruta_recurso(relativa):
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, relativa)
+
+def registrar_fuente(ruta):
+    """Hace visible la fuente para este proceso sin instalarla en el sistema.
+
+    Llamar antes de crear la ventana de Tk. En Windows se usa
+    AddFontResourceEx privado; en Linux/BSD, fontconfig (Tk con Xft). Devuelve
+    False si no se pudo; en macOS hay que instalarla a mano.
+    """
+    if not os.path.exists(ruta):
+        return False
+    import ctypes
+    import ctypes.util
+
+    try:
+        if sys.platform == "win32":
+            FR_PRIVATE = 0x10
+            return ctypes.windll.gdi32.AddFontResourceExW(ruta, FR_PRIVATE, 0) > 0
+        if sys.platform != "darwin":
+            biblioteca = ctypes.util.find_library("fontconfig")
+            if biblioteca is None:
+                return False
+            fontconfig = ctypes.CDLL(biblioteca)
+            fontconfig.FcConfigAppFontAddFile.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+            return bool(fontconfig.FcConfigAppFontAddFile(None, os.fsencode(ruta)))
+    except (OSError, AttributeError):
+        pass
+    return False
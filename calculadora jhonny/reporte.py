@@ -0,0 +1,336 @@
+"""Generación del reporte en PDF de un modelo de colas.
+
+reportlab se importa dentro de ``generar_reporte`` para que importar este
+módulo no cargue la librería. La distribución de probabilidad se escribe en
+tablas del tamaño de una página que se generan a medida que reportlab las
+consume, así que la memoria de objetos no crece con el número de estados.
+"""
+import os
+from datetime import datetime  # Para generar nombres únicos de archivos
+
+from incertidumbre import ETIQUETAS_METRICAS
+from instrumentacion import contar, etapa
+from simulacion import comparar
+
+# Filas de la distribución por tabla (una página carta con el estilo usado)
+FILAS_POR_PAGINA = 35
+# Con más estados que esto la distribución se corta en CUANTIL_COLA (y en este
+# número de estados como mucho); el resto va en una sola fila "> n"
+MAX_ESTADOS_REPORTE = 10000
+CUANTIL_COLA = 1 - 1e-9
+# Ancho fijo de columnas para que todas las páginas de la distribución se alineen
+ANCHOS_DISTRIBUCION = [100, 150, 150]
+ANCHOS_TRANSITORIO = [80, 90, 90, 90, 90]
+# Datos generales del reporte: (clave, etiqueta, formato)
+FILAS_GENERALES = [
+    ("lambda", "Tasa de llegada (λ)", "{}"),
+    ("mu", "Tasa de servicio (μ)", "{}"),
+    ("rho", "Rho (ρ)", "{:.4f}"),
+    ("Po", "Probabilidad de sistema vacío (P₀)", "{:.4f}"),
+    ("Ls", "Número esperado en el sistema (L)", "{:.4f}"),
+    ("Lq", "Número esperado en la cola (Lq)", "{:.4f}"),
+    ("Ws", "Tiempo esperado en el sistema (W)", "{:.4f}"),
+    ("Wq", "Tiempo esperado en la cola (Wq)", "{:.4f}"),
+    ("lambda_efectiva", "Tasa de llegada efectiva (λ_efectiva)", "{:.4f}"),
+]
+# Parámetros y métricas que no tienen todos los modelos: (clave, etiqueta, formato)
+FILAS_OPCIONALES = [
+    ("c", "Servidores (c)", "{}"),
+    ("K", "Capacidad del sistema (K)", "{}"),
+    ("erlang_b", "Erlang B", "{:.6f}"),
+    ("erlang_c", "Erlang C (probabilidad de esperar)", "{:.6f}"),
+    ("prob_bloqueo", "Probabilidad de bloqueo", "{:.6f}"),
+]
+
+class FlowablesPerezosos(list):
+    """Lista de flowables que se rellena desde un generador cuando se vacía.
+
+    ``doc.build`` consume la lista desde el frente y solo pregunta su largo,
+    así que nunca hay más de unos pocos flowables vivos a la vez.
+    """
+
+    def __init__(self, generador):
+        super().__init__()
+        self._generador = generador
+
+    def __len__(self):
+        if not super().__len__():
+            siguiente = next(self._generador, None)
+            if siguiente is not None:
+                self.append(siguiente)
+        return super().__len__()
+
+def _estilo_tabla(colors, TableStyle):
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+
+def nombre_unico(prefijo="reporte", extension=".pdf", carpeta="."):
+    """Reserva un nombre reporte_AAAAmmdd_HHMMSS[_n].pdf que no exista todavía.
+
+    El archivo se crea vacío en modo exclusivo, así que dos reportes del
+    mismo segundo (o de dos hilos a la vez) nunca comparten nombre.
+    """
+    fecha_hora = datetime.now().strftime("%Y%m%d_%H%M%S")
+    sufijo = 1
+    while True:
+        nombre = f"{prefijo}_{fecha_hora}" + (f"_{sufijo}" if sufijo > 1 else "") + extension
+        nombre = os.path.join(carpeta, nombre)
+        try:
+            with open(nombre, "x"):
+                return os.path.normpath(nombre)
+        except FileExistsError:
+            sufijo += 1
+
+def ultimo_estado(distribucion, cuantil_cola=None, max_estados=None):
+    """Último estado que se escribe: hasta el cuantil ``cuantil_cola`` y a lo sumo ``max_estados`` estados."""
+    ultimo = len(distribucion) - 1
+    if cuantil_cola is not None:
+        ultimo = min(ultimo, distribucion.cuantil(cuantil_cola))
+    if max_estados is not None:
+        ultimo = min(ultimo, max_estados - 1)
+    return ultimo
+
+def filas_distribucion(distribucion, cuantil_cola=None, filas_por_pagina=FILAS_POR_PAGINA, max_estados=None):
+    """Genera bloques de filas [estado, P(n), P(Acum)] del tamaño de una página.
+
+    Los estados posteriores a ``ultimo_estado`` se resumen en una sola fila
+    "> n" con la probabilidad restante.
+    """
+    ultimo = ultimo_estado(distribucion, cuantil_cola, max_estados)
+
+    for inicio in range(0, ultimo + 1, filas_por_pagina):
+        fin = min(inicio + filas_por_pagina, ultimo + 1)
+        bloque = [[str(i), f"{p_abs:.4f}", f"{p_acum:.4f}"] for i, p_abs, p_acum in distribucion.estados(inicio, fin)]
+        if fin == ultimo + 1 and ultimo < len(distribucion) - 1:
+            resto = 1 - distribucion.acumulada(ultimo)
+            bloque.append([f"> {ultimo}", f"{resto:.4f}", f"{1:.4f}"])
+        contar("estados", fin - inicio)
+        yield bloque, fin / (ultimo + 1)
+
+def filas_transitorio(transitorio, filas_por_pagina=FILAS_POR_PAGINA):
+    """Genera bloques de filas [t, E[L(t)], E[Lq(t)], P₀(t), P(N, t)] del tamaño de una página."""
+    columnas = [transitorio[clave] for clave in ("tiempos", "L", "Lq", "Po", "prob_bloqueo")]
+    total = len(columnas[0])
+    for inicio in range(0, total, filas_por_pagina):
+        fin = min(inicio + filas_por_pagina, total)
+        yield [[f"{t:.4g}"] + [f"{valor:.4f}" for valor in valores]
+               for t, *valores in zip(*(columna[inicio:fin] for columna in columnas))]
+
+def textos_incertidumbre(incertidumbre):
+    """Líneas con las distribuciones de entrada y P(ρ ≥ 1)."""
+    textos = [f"λ ~ {incertidumbre['lambda']}, μ ~ {incertidumbre['mu']}"
+              + (f", N ~ {incertidumbre['N']}" if incertidumbre["N"] is not None else "")]
+    textos.append(f"P(ρ ≥ 1) = {incertidumbre['prob_rho_mayor_1']:.4f}"
+                  + (" (sin estado estacionario; percentiles sobre las muestras estables)"
+                     if incertidumbre["modelo"] == "sin_limite" and incertidumbre["prob_rho_mayor_1"] > 0 else ""))
+    if incertidumbre["descartadas"]:
+        textos.append(f"Muestras descartadas (λ ≤ 0, μ ≤ 0 o N < 1): {incertidumbre['descartadas']:,}")
+    return textos
+
+def filas_incertidumbre(incertidumbre):
+    """Filas [métrica, media, desvío, percentiles...] del análisis de incertidumbre."""
+    filas = []
+    for clave, resumen in incertidumbre["metricas"].items():
+        valores = [resumen["media"], resumen["desvio"]] + resumen["percentiles"]
+        filas.append([ETIQUETAS_METRICAS[clave]] + [f"{valor:.4g}" for valor in valores])
+    return filas
+
+def filas_simulacion(resultados, simulacion):
+    """Filas [métrica, analítico, simulado, diferencia] de la comparación con la simulación."""
+    return [[etiqueta, f"{analitico:.4f}", f"{simulado:.4f}", "—" if diferencia != diferencia else f"{diferencia:+.2%}"]
+            for etiqueta, analitico, simulado, diferencia in comparar(resultados, simulacion)]
+
+def generar_reporte_lote(escenarios, filename=None, total=None, origen=None, al_progreso=None):
+    """Reporte consolidado de muchos escenarios: una fila por escenario.
+
+    ``escenarios`` es un iterable de dicts como los de ``lotes.leer_resultados``;
+    se consume de a una página, así que puede venir directo del archivo.
+    """
+    from reportlab.lib.pagesizes import letter, landscape
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+    reservado = filename is None
+    if reservado:
+        filename = nombre_unico("reporte_lote")
+
+    doc = SimpleDocTemplate(filename, pagesize=landscape(letter))
+    styles = getSampleStyleSheet()
+    estilo = _estilo_tabla(colors, TableStyle)
+    encabezado = ["#", "Modelo", "λ", "μ", "N/K", "c", "ρ", "Ls", "Lq", "Ws", "Wq", "P(bloqueo)", "Error"]
+    filas_pagina = FILAS_POR_PAGINA - 10  # Página apaisada: menos filas
+
+    def celda(valor, formato="{:.4f}"):
+        if valor is None:
+            return ""
+        if formato is None:
+            return str(valor)
+        try:
+            return formato.format(float(valor))
+        except (TypeError, ValueError):
+            return str(valor)  # Valor no numérico repetido tal cual desde la entrada
+
+    def elementos():
+        yield Paragraph("Reporte consolidado de escenarios", styles['Title'])
+        if origen is not None:
+            yield Paragraph(f"Archivo: {origen}", styles['Normal'])
+        yield Spacer(1, 12)
+
+        iterador = iter(escenarios)
+        escritas = 0
+        while True:
+            bloque = []
+            for escenario in iterador:
+                bloque.append([
+                    celda(escenario["fila"], None), escenario["modelo"],
+                    celda(escenario["lambda"], "{:.6g}"), celda(escenario["mu"], "{:.6g}"),
+                    celda(escenario["N"], None), celda(escenario["c"], None),
+                    *(celda(escenario[clave]) for clave in ("rho", "Ls", "Lq", "Ws", "Wq", "prob_bloqueo")),
+                    escenario["error"] or "",
+                ])
+                if len(bloque) == filas_pagina:
+                    break
+            if not bloque:
+                return
+            tabla = Table([encabezado] + bloque, repeatRows=1)
+            tabla.setStyle(estilo)
+            yield tabla
+            escritas += len(bloque)
+            if al_progreso is not None and total:
+                al_progreso(min(escritas / total, 1.0), "Generando reporte...")
+
+    try:
+        with etapa("pdf"):
+            doc.build(FlowablesPerezosos(elementos()))
+            contar("paginas_pdf", doc.page)
+    except BaseException:
+        if reservado and os.path.exists(filename):
+            os.remove(filename)
+        raise
+    return filename
+
+# Función para generar el reporte en PDF mejorado
+def generar_reporte(resultados, filename=None, cuantil_cola=None, al_progreso=None, max_estados=MAX_ESTADOS_REPORTE):
+    """Escribe el reporte y devuelve el nombre del archivo.
+
+    Si la distribución tiene más de ``max_estados`` estados se corta en
+    ``cuantil_cola`` (CUANTIL_COLA si no se indica) y en ``max_estados``, y el
+    reporte lo aclara; ``max_estados=None`` escribe todos los estados.
+    ``al_progreso(fraccion, texto)`` se llama después de cada página de la
+    distribución; si lanza una excepción el reporte se aborta sin escribir.
+    """
+    # reportlab se importa aquí para no cargarlo al arrancar la aplicación
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+    reservado = filename is None
+    if reservado:
+        # Generar un nombre de archivo único usando la fecha y hora actual
+        filename = nombre_unico()
+
+    # Crear un documento PDF
+    doc = SimpleDocTemplate(filename, pagesize=letter)
+    styles = getSampleStyleSheet()
+    estilo = _estilo_tabla(colors, TableStyle)
+
+    def elementos():
+        # Título del reporte
+        yield Paragraph("Reporte de Modelo de Colas", styles['Title'])
+        yield Spacer(1, 12)  # Espacio después del título
+
+        # Datos generales; las filas que el resultado no trae (multiservidor,
+        # valores centrales inestables en el análisis de incertidumbre) se omiten
+        data_general = [["Parámetro", "Valor"]]
+        for clave, etiqueta, formato in FILAS_GENERALES + FILAS_OPCIONALES:
+            if clave in resultados:
+                data_general.append([etiqueta, formato.format(resultados[clave])])
+
+        # Crear tabla de datos generales
+        table_general = Table(data_general)
+        table_general.setStyle(estilo)
+        yield table_general
+        yield Spacer(1, 12)  # Espacio después de la tabla
+
+        # Evolución en el tiempo si el resultado viene del análisis transitorio
+        transitorio = resultados.get("transitorio")
+        if transitorio is not None:
+            yield Paragraph(f"Análisis transitorio (estado inicial: {transitorio['estado_inicial']})", styles['Heading2'])
+            yield Spacer(1, 12)
+            for bloque in filas_transitorio(transitorio):
+                table_tiempo = Table([["t", "E[L(t)]", "E[Lq(t)]", "P₀(t)", "P(N, t)"]] + bloque, colWidths=ANCHOS_TRANSITORIO, repeatRows=1)
+                table_tiempo.setStyle(estilo)
+                yield table_tiempo
+            yield Spacer(1, 12)
+
+        # Percentiles si el resultado viene del análisis de incertidumbre
+        incertidumbre = resultados.get("incertidumbre")
+        if incertidumbre is not None:
+            yield Paragraph(f"Incertidumbre (Monte Carlo, {incertidumbre['validas']:,} muestras)", styles['Heading2'])
+            yield Spacer(1, 12)
+            for texto in textos_incertidumbre(incertidumbre):
+                yield Paragraph(texto, styles['Normal'])
+            yield Spacer(1, 12)
+            encabezado = ["Métrica", "Media", "Desvío"] + [f"P{p:g}" for p in incertidumbre["percentiles"]]
+            table_incertidumbre = Table([encabezado] + filas_incertidumbre(incertidumbre), repeatRows=1)
+            table_incertidumbre.setStyle(estilo)
+            yield table_incertidumbre
+            yield Spacer(1, 12)
+
+        # Comparación con la simulación si se pidió desde la ventana
+        simulacion = resultados.get("simulacion")
+        if simulacion is not None:
+            yield Paragraph(f"Comparación con la simulación ({simulacion['clientes']:,} clientes)", styles['Heading2'])
+            yield Spacer(1, 12)
+            table_simulacion = Table([["Métrica", "Analítico", "Simulado", "Diferencia"]] + filas_simulacion(resultados, simulacion), repeatRows=1)
+            table_simulacion.setStyle(estilo)
+            yield table_simulacion
+            yield Spacer(1, 12)
+
+        distribucion = resultados.get("distribucion")
+        if distribucion is None:
+            return
+
+        # Distribución de probabilidad
+        yield Paragraph("Distribución de Probabilidad", styles['Heading2'])
+        yield Spacer(1, 12)  # Espacio después del subtítulo
+
+        corte = cuantil_cola
+        if max_estados is not None and len(distribucion) > max_estados and corte is None:
+            corte = CUANTIL_COLA
+        ultimo = ultimo_estado(distribucion, corte, max_estados)
+        if ultimo < len(distribucion) - 1:
+            yield Paragraph(
+                f"Se muestran los estados 0 a {ultimo:,} de {len(distribucion):,}; la fila \"&gt; {ultimo}\" "
+                f"suma la probabilidad de los demás ({1 - distribucion.acumulada(ultimo):.3g}).",
+                styles['Normal']
+            )
+            yield Spacer(1, 12)
+
+        # Una tabla por página; si una se parte, repeatRows repite el encabezado
+        for bloque, avance in filas_distribucion(distribucion, corte, max_estados=max_estados):
+            table_prob = Table([["Estado", "P(n)", "P(Acum)"]] + bloque, colWidths=ANCHOS_DISTRIBUCION, repeatRows=1)
+            table_prob.setStyle(estilo)
+            yield table_prob
+            if al_progreso is not None:
+                al_progreso(avance, "Generando reporte...")
+
+    # Generar el PDF; si se cancela o falla no queda el archivo reservado vacío
+    try:
+        with etapa("pdf"):
+            doc.build(FlowablesPerezosos(elementos()))
+            contar("paginas_pdf", doc.page)
+    except BaseException:
+        if reservado and os.path.exists(filename):
+            os.remove(filename)
+        raise
+    return filename
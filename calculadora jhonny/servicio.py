@@ -0,0 +1,420 @@
+"""Modo servicio: cálculos de colas por HTTP/JSON local con asyncio.
+
+Se inicia con ``python main.py --servicio [--puerto 8765 | --socket RUTA]``.
+Rutas:
+
+    POST /calcular    {"modelo": "con_limite", "lambda": 2, "mu": 3, "N": 10,
+                       "cuantiles": [0.99], "estados": [0, 20], "simular": {"clientes": 100000}}
+    GET  /metricas    contadores de peticiones, lotes, latencia y rendimiento
+    GET  /salud
+
+"modelo" es "sin_limite" (sin N), "con_limite" (requiere N) o "multiservidor"
+(requiere c; N es la capacidad K y es opcional). "cuantiles", "estados" y
+"simular" son opcionales.
+
+Las peticiones livianas que llegan dentro de una ventana corta (2 ms por
+defecto) se agrupan por modelo y se evalúan en un solo lote vectorizado con
+``evaluar_lote_*``. Las pesadas (simulación, muchos estados de la
+distribución o muchos servidores) van a un pool de procesos para no frenar
+el bucle de eventos. El HTTP es mínimo (HTTP/1.1 con keep-alive, sin
+chunked) porque el servicio solo escucha en localhost.
+"""
+import asyncio
+import json
+import math
+import multiprocessing
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from colas import (
+    DistribucionEstados,
+    ErrorModeloColas,
+    SistemaInestableError,
+    calcular_sin_limite_cola,
+    calcular_con_limite_cola,
+    evaluar_lote_sin_limite,
+    evaluar_lote_con_limite,
+)
+from multiservidor import DistribucionMultiservidor, calcular_mmc, calcular_mmck, evaluar_lote_mmck
+
+PUERTO_PREDETERMINADO = 8765
+# Ventana de agrupación y tamaño máximo de un lote
+VENTANA_S = 0.002
+MAX_LOTE = 4096
+# Por encima de estos tamaños una petición se considera pesada
+UMBRAL_ESTADOS = 2000
+UMBRAL_SERVIDORES = 5000
+MAX_ESTADOS = 100000
+# Clientes como máximo en una simulación pedida por HTTP
+MAX_CLIENTES_SIMULACION = 10 ** 7
+# Latencias recientes guardadas para los percentiles
+MUESTRAS_LATENCIA = 10000
+
+MODELOS = ("sin_limite", "con_limite", "multiservidor")
+CLAVES_ESCALARES = ("lambda", "mu", "rho", "Po", "Ls", "Lq", "Ws", "Wq", "lambda_efectiva",
+                    "prob_bloqueo", "erlang_b", "erlang_c", "c", "K")
+
+class PeticionInvalida(ValueError):
+    """La petición no tiene el formato o los valores esperados (HTTP 400)."""
+
+class SimulacionNoDisponible(ValueError):
+    """La petición es válida pero su modelo no se puede simular (HTTP 422)."""
+
+def validar(peticion):
+    """Normaliza una petición de /calcular; lanza PeticionInvalida si no sirve."""
+    if not isinstance(peticion, dict):
+        raise PeticionInvalida("se esperaba un objeto JSON")
+    modelo = peticion.get("modelo")
+    if modelo not in MODELOS:
+        raise PeticionInvalida(f"modelo debe ser uno de {', '.join(MODELOS)}")
+    try:
+        normalizada = {"modelo": modelo, "lambda": float(peticion["lambda"]), "mu": float(peticion["mu"])}
+        N = peticion.get("N")
+        c = peticion.get("c")
+        normalizada["N"] = None if N is None else int(N)
+        normalizada["c"] = None if c is None else int(c)
+        normalizada["cuantiles"] = [float(q) for q in peticion.get("cuantiles", [])]
+        estados = peticion.get("estados")
+        normalizada["estados"] = None if estados is None else (int(estados[0]), int(estados[1]))
+        simular = peticion.get("simular")
+        if simular is not None and not isinstance(simular, dict):
+            raise TypeError("simular tiene que ser un objeto")
+        normalizada["simular"] = None if simular is None else {
+            "clientes": int(simular.get("clientes", 10 ** 5)),
+            "semilla": simular.get("semilla"),
+        }
+    except (KeyError, TypeError, ValueError, IndexError) as error:
+        raise PeticionInvalida(f"parámetros inválidos: {error}") from None
+
+    if not (normalizada["lambda"] > 0 and normalizada["mu"] > 0 and math.isfinite(normalizada["lambda"] + normalizada["mu"])):
+        raise PeticionInvalida("lambda y mu deben ser positivos")
+    if modelo == "sin_limite" and normalizada["N"] is not None:
+        # Con N la distribución de "estados" y "cuantiles" saldría truncada
+        raise PeticionInvalida("sin_limite no lleva N; usar con_limite")
+    if modelo == "con_limite" and (normalizada["N"] is None or normalizada["N"] < 1):
+        raise PeticionInvalida("con_limite requiere N ≥ 1")
+    if modelo == "multiservidor":
+        if normalizada["c"] is None or normalizada["c"] < 1:
+            raise PeticionInvalida("multiservidor requiere c ≥ 1")
+        if normalizada["N"] is not None and normalizada["N"] < normalizada["c"]:
+            raise PeticionInvalida("la capacidad N (K) tiene que ser al menos c")
+    if any(not 0 < q < 1 for q in normalizada["cuantiles"]):
+        raise PeticionInvalida("los cuantiles deben estar entre 0 y 1")
+    if normalizada["estados"] is not None:
+        inicio, fin = normalizada["estados"]
+        if not 0 <= inicio <= fin or fin - inicio > MAX_ESTADOS:
+            raise PeticionInvalida(f"estados debe ser [inicio, fin] con a lo sumo {MAX_ESTADOS} estados")
+    if normalizada["simular"] is not None:
+        if modelo == "multiservidor":
+            raise SimulacionNoDisponible("la simulación solo está disponible para los modelos de un servidor")
+        clientes, semilla = normalizada["simular"]["clientes"], normalizada["simular"]["semilla"]
+        if not 1 <= clientes <= MAX_CLIENTES_SIMULACION:
+            raise PeticionInvalida(f"simular.clientes debe estar entre 1 y {MAX_CLIENTES_SIMULACION}")
+        if semilla is not None and (type(semilla) is not int or semilla < 0):
+            raise PeticionInvalida("simular.semilla tiene que ser un entero no negativo")
+    return normalizada
+
+def es_pesada(peticion):
+    """Simulaciones, tramos largos de la distribución o c muy grande van al pool de procesos."""
+    if peticion["simular"] is not None:
+        return True
+    if peticion["estados"] is not None and peticion["estados"][1] - peticion["estados"][0] > UMBRAL_ESTADOS:
+        return True
+    return peticion["modelo"] == "multiservidor" and peticion["c"] > UMBRAL_SERVIDORES
+
+def _distribucion(peticion, rho):
+    if peticion["modelo"] == "multiservidor":
+        return DistribucionMultiservidor(peticion["lambda"], peticion["mu"], peticion["c"], peticion["N"])
+    return DistribucionEstados(rho, peticion["N"])
+
+def _extras(peticion, respuesta):
+    # Cuantiles y tramo de la distribución pedidos, sobre la distribución perezosa
+    if not peticion["cuantiles"] and peticion["estados"] is None:
+        return respuesta
+    distribucion = _distribucion(peticion, respuesta["resultados"]["rho"])
+    if peticion["cuantiles"]:
+        respuesta["cuantiles"] = {str(q): distribucion.cuantil(q) for q in peticion["cuantiles"]}
+    if peticion["estados"] is not None:
+        inicio, fin = peticion["estados"]
+        respuesta["estados"] = [list(fila) for fila in distribucion.estados(inicio, min(fin, len(distribucion)))]
+    return respuesta
+
+def atender_pesada(peticion):
+    """Resuelve una petición completa fuera del bucle de eventos (en el pool de procesos)."""
+    from simulacion import simular_sin_limite_cola, simular_con_limite_cola
+
+    modelo, lambda_, mu, N, c = (peticion[clave] for clave in ("modelo", "lambda", "mu", "N", "c"))
+    if modelo == "sin_limite":
+        resultados = calcular_sin_limite_cola(lambda_, mu)
+    elif modelo == "con_limite":
+        resultados = calcular_con_limite_cola(lambda_, mu, N)
+    else:
+        resultados = calcular_mmc(lambda_, mu, c) if N is None else calcular_mmck(lambda_, mu, c, N)
+    respuesta = _extras(peticion, {"resultados": {clave: resultados[clave] for clave in CLAVES_ESCALARES if clave in resultados}})
+
+    simular = peticion["simular"]
+    if simular is not None:
+        if modelo == "sin_limite":
+            simulacion = simular_sin_limite_cola(lambda_, mu, simular["clientes"], semilla=simular["semilla"])
+        elif modelo == "con_limite":
+            simulacion = simular_con_limite_cola(lambda_, mu, N, simular["clientes"], semilla=simular["semilla"])
+        else:
+            raise SimulacionNoDisponible("la simulación solo está disponible para los modelos de un servidor")
+        respuesta["simulacion"] = {clave: valor for clave, valor in simulacion.items() if clave != "histograma"}
+    return respuesta
+
+def evaluar_lote(modelo, peticiones):
+    """Evalúa peticiones livianas de un mismo modelo en un solo lote vectorizado.
+
+    Devuelve una respuesta o una excepción por petición, en el mismo orden.
+    """
+    lambda_ = np.array([p["lambda"] for p in peticiones])
+    mu = np.array([p["mu"] for p in peticiones])
+    if modelo == "sin_limite":
+        lote = evaluar_lote_sin_limite(lambda_, mu)
+    elif modelo == "con_limite":
+        lote = evaluar_lote_con_limite(lambda_, mu, np.array([p["N"] for p in peticiones]))
+    else:
+        c = np.array([p["c"] for p in peticiones])
+        K = np.array([np.inf if p["N"] is None else p["N"] for p in peticiones])
+        lote = evaluar_lote_mmck(lambda_, mu, c, K)
+        lote["erlang_c"] = np.where(np.isinf(K), lote["prob_espera"], np.nan)
+
+    # Una conversión por columna en lugar de una por celda
+    columnas = {clave: lote[clave].tolist() for clave in CLAVES_ESCALARES if clave in lote}
+    estable = lote["estable"].tolist()
+    salida = []
+    for i, peticion in enumerate(peticiones):
+        if not estable[i]:
+            salida.append(SistemaInestableError("el sistema es inestable: la capacidad de servicio tiene que superar a lambda (λ)"))
+            continue
+        resultados = {clave: valores[i] for clave, valores in columnas.items()}
+        if modelo == "multiservidor":
+            if peticion["N"] is None:
+                del resultados["K"], resultados["prob_bloqueo"]
+            else:
+                resultados["K"] = int(resultados["K"])
+                del resultados["erlang_c"]
+        try:
+            salida.append(_extras(peticion, {"resultados": resultados}))
+        except ErrorModeloColas as error:
+            salida.append(error)
+    return salida
+
+class Metricas:
+    """Contadores del servicio; todo se actualiza desde el hilo del bucle de eventos."""
+
+    def __init__(self):
+        self.inicio = time.monotonic()
+        self.peticiones = 0
+        self.errores = 0
+        self.en_curso = 0
+        self.pesadas = 0
+        self.lotes = 0
+        self.escenarios_en_lotes = 0
+        self.latencias = deque(maxlen=MUESTRAS_LATENCIA)  # (instante de fin, segundos)
+
+    def registrar(self, duracion, error=False):
+        self.peticiones += 1
+        self.errores += error
+        self.latencias.append((time.monotonic(), duracion))
+
+    def resumen(self):
+        ahora = time.monotonic()
+        duraciones = np.array([d for _, d in self.latencias]) if self.latencias else np.zeros(1)
+        recientes = sum(1 for fin, _ in self.latencias if ahora - fin <= 10)
+        p50, p90, p99 = np.percentile(duraciones, [50, 90, 99]) * 1000
+        return {
+            "peticiones": self.peticiones,
+            "errores": self.errores,
+            "en_curso": self.en_curso,
+            "pesadas": self.pesadas,
+            "lotes": self.lotes,
+            "tamano_medio_lote": self.escenarios_en_lotes / self.lotes if self.lotes else 0.0,
+            "latencia_ms": {"p50": p50, "p90": p90, "p99": p99, "max": float(duraciones.max()) * 1000},
+            "peticiones_por_s_10s": recientes / min(10.0, max(ahora - self.inicio, 1e-9)),
+            "peticiones_por_s_total": self.peticiones / max(ahora - self.inicio, 1e-9),
+            "segundos_activo": ahora - self.inicio,
+        }
+
+class ServicioColas:
+    def __init__(self, ventana=VENTANA_S, max_lote=MAX_LOTE, procesos=None):
+        self.ventana = ventana
+        self.max_lote = max_lote
+        self.procesos = procesos
+        self.metricas = Metricas()
+        self._pendientes = {modelo: [] for modelo in MODELOS}  # modelo -> [(petición, futuro)]
+        self._temporizadores = {}
+        self._ejecutor = None
+
+    # --- agrupación en lotes ---------------------------------------------
+
+    def _encolar(self, peticion):
+        futuro = asyncio.get_running_loop().create_future()
+        pendientes = self._pendientes[peticion["modelo"]]
+        pendientes.append((peticion, futuro))
+        if len(pendientes) >= self.max_lote:
+            self._vaciar(peticion["modelo"])
+        elif peticion["modelo"] not in self._temporizadores:
+            self._temporizadores[peticion["modelo"]] = asyncio.get_running_loop().call_later(
+                self.ventana, self._vaciar, peticion["modelo"]
+            )
+        return futuro
+
+    def _vaciar(self, modelo):
+        temporizador = self._temporizadores.pop(modelo, None)
+        if temporizador is not None:
+            temporizador.cancel()
+        pendientes, self._pendientes[modelo] = self._pendientes[modelo], []
+        if not pendientes:
+            return
+        self.metricas.lotes += 1
+        self.metricas.escenarios_en_lotes += len(pendientes)
+        try:
+            salida = evaluar_lote(modelo, [peticion for peticion, _ in pendientes])
+        except Exception as error:
+            salida = [error] * len(pendientes)
+        for (_, futuro), resultado in zip(pendientes, salida):
+            if futuro.done():
+                continue
+            if isinstance(resultado, Exception):
+                futuro.set_exception(resultado)
+            else:
+                futuro.set_result(resultado)
+
+    async def calcular(self, peticion):
+        peticion = validar(peticion)
+        if es_pesada(peticion):
+            self.metricas.pesadas += 1
+            if self._ejecutor is None:
+                # spawn: el proceso hijo no hereda el bucle de eventos ni sus hilos
+                self._ejecutor = ProcessPoolExecutor(self.procesos, mp_context=multiprocessing.get_context("spawn"))
+            return await asyncio.get_running_loop().run_in_executor(self._ejecutor, atender_pesada, peticion)
+        return await self._encolar(peticion)
+
+    # --- HTTP --------------------------------------------------------------
+
+    async def despachar(self, metodo, ruta, cuerpo):
+        """Devuelve (código HTTP, objeto JSON) para una petición."""
+        if ruta == "/salud" and metodo == "GET":
+            return 200, {"estado": "ok"}
+        if ruta == "/metricas" and metodo == "GET":
+            return 200, self.metricas.resumen()
+        if ruta != "/calcular":
+            return 404, {"error": "ruta desconocida"}
+        if metodo != "POST":
+            return 405, {"error": "usar POST"}
+        try:
+            return 200, await self.calcular(json.loads(cuerpo or b"null"))
+        except (PeticionInvalida, json.JSONDecodeError, UnicodeDecodeError) as error:
+            return 400, {"error": str(error)}
+        except (ErrorModeloColas, ValueError) as error:
+            return 422, {"error": str(error), "tipo": type(error).__name__}
+
+    async def responder(self, metodo, ruta, cuerpo):
+        """Código HTTP y cuerpo JSON ya serializado de una petición."""
+        self.metricas.en_curso += 1
+        try:
+            codigo, respuesta = await self.despachar(metodo, ruta.split("?")[0], cuerpo)
+            return codigo, json.dumps(respuesta, allow_nan=False, default=_json_extra).encode()
+        except ValueError as error:
+            # allow_nan=False: resultados no finitos (p. ej. λ = 1e300, μ = 1e-300)
+            return 422, json.dumps({"error": f"el resultado no es finito: {error}", "tipo": "ResultadoNoFinito"}).encode()
+        except Exception as error:
+            return 500, json.dumps({"error": str(error)}).encode()
+        finally:
+            self.metricas.en_curso -= 1
+
+    async def atender_conexion(self, reader, writer):
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                inicio = time.perf_counter()
+                try:
+                    metodo, ruta, version = linea.decode("latin-1").split()
+                except ValueError:
+                    break
+                cabeceras = {}
+                while True:
+                    cabecera = await reader.readline()
+                    if cabecera in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = cabecera.decode("latin-1").partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                try:
+                    largo = int(cabeceras.get("content-length", 0))
+                    if largo < 0:
+                        raise ValueError(largo)
+                except ValueError:
+                    # Sin un largo válido no se sabe dónde termina el cuerpo: se responde y se cierra
+                    codigo, mantener = 400, False
+                    datos = json.dumps({"error": "Content-Length inválido"}).encode()
+                else:
+                    cuerpo = await reader.readexactly(largo)
+                    codigo, datos = await self.responder(metodo, ruta, cuerpo)
+                    mantener = version == "HTTP/1.1" and cabeceras.get("connection", "").lower() != "close"
+                if ruta.startswith("/calcular"):
+                    self.metricas.registrar(time.perf_counter() - inicio, error=codigo != 200)
+
+                writer.write(
+                    f"HTTP/1.1 {codigo} {_TEXTOS_ESTADO.get(codigo, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(datos)}\r\n"
+                    f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n".encode("latin-1") + datos
+                )
+                await writer.drain()
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def servir(self, host="127.0.0.1", puerto=PUERTO_PREDETERMINADO, socket=None, al_iniciar=None):
+        if socket is not None:
+            servidor = await asyncio.start_unix_server(self.atender_conexion, path=socket)
+        else:
+            servidor = await asyncio.start_server(self.atender_conexion, host, puerto)
+        # SIGTERM/SIGINT cancelan serve_forever para que el finally cierre el
+        # pool de procesos (si no, quedan semáforos huérfanos)
+        bucle, tarea = asyncio.get_running_loop(), asyncio.current_task()
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                bucle.add_signal_handler(senal, tarea.cancel)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows o fuera del hilo principal: queda KeyboardInterrupt
+        if al_iniciar is not None:
+            al_iniciar(servidor)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            if self._ejecutor is not None:
+                self._ejecutor.shutdown(cancel_futures=True)
+
+_TEXTOS_ESTADO = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                  422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+def _json_extra(valor):
+    # Escalares de NumPy que llegan desde la simulación
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"no serializable: {type(valor).__name__}")
+
+def ejecutar_servicio(host="127.0.0.1", puerto=PUERTO_PREDETERMINADO, socket=None, ventana_ms=VENTANA_S * 1000, procesos=None):
+    """Punto de entrada bloqueante del modo servicio."""
+    servicio = ServicioColas(ventana=ventana_ms / 1000, procesos=procesos)
+
+    def anunciar(servidor):
+        direccion = socket or "http://{}:{}".format(*servidor.sockets[0].getsockname()[:2])
+        print(f"Servicio de colas escuchando en {direccion}", flush=True)
+
+    try:
+        asyncio.run(servicio.servir(host, puerto, socket, al_iniciar=anunciar))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
@@ -0,0 +1,225 @@
+"""Simulación de eventos discretos de los modelos M/M/1 y M/M/1/N.
+
+Los tiempos se generan en bloques grandes de NumPy y cada bloque se procesa de
+forma vectorizada, así que la memoria queda acotada por el tamaño del bloque y
+no por el número de clientes. Los resultados usan las mismas claves que
+``calcular_sin_limite_cola`` / ``calcular_con_limite_cola`` para poder
+compararlos con los valores analíticos (``comparar``).
+"""
+import math
+
+import numpy as np
+
+from colas import SistemaInestableError
+
+# Tamaño por defecto de los bloques de clientes/eventos procesados a la vez
+TAMANO_BLOQUE = 2 ** 20
+# Clientes simulados al comparar desde la interfaz
+CLIENTES_COMPARACION = 10 ** 6
+# Métricas comparadas con los valores analíticos: (clave, etiqueta)
+METRICAS_COMPARADAS = [
+    ("Po", "P₀"),
+    ("Ls", "L"),
+    ("Lq", "Lq"),
+    ("Ws", "W"),
+    ("Wq", "Wq"),
+    ("lambda_efectiva", "λ efectiva"),
+    ("prob_bloqueo", "P(bloqueo)"),
+]
+
+def _validar(lambda_, mu, clientes):
+    # Con λ = 0 no llega nadie y el bucle por clientes no terminaría
+    if not (lambda_ > 0 and mu > 0 and math.isfinite(lambda_ + mu)):
+        raise ValueError("lambda (λ) y mu (μ) deben ser positivos")
+    if clientes < 1:
+        raise ValueError("hay que simular al menos un cliente")
+
+def _lindley(U, espera_anterior):
+    # W_n = max(0, W_{n-1} + U_n) resuelto en bloque: W_n = C_n - min(-W_0, min_{k≤n} C_k)
+    C = np.cumsum(U)
+    minimo = np.minimum(np.minimum.accumulate(C), -espera_anterior)
+    return C - minimo
+
+def _componer_recortes(desplazamiento, inferior, superior):
+    """Prefijo (scan) de la composición de funciones x -> clip(x + a, lo, hi).
+
+    La composición de dos de estas funciones es otra del mismo tipo, así que
+    el estado tras cada evento de un paseo reflejado en [0, N] se obtiene con
+    log2(n) pasadas vectorizadas (Hillis-Steele). Modifica los arreglos en sitio.
+    """
+    n = len(desplazamiento)
+    paso = 1
+    while paso < n:
+        a_previo = desplazamiento[:-paso]
+        b = desplazamiento[paso:]
+        nuevo_inferior = np.clip(inferior[:-paso] + b, inferior[paso:], superior[paso:])
+        nuevo_superior = np.clip(superior[:-paso] + b, inferior[paso:], superior[paso:])
+        desplazamiento[paso:] = a_previo + b
+        inferior[paso:] = nuevo_inferior
+        superior[paso:] = nuevo_superior
+        paso *= 2
+
+def _acumular_histograma(histograma, estados, duraciones):
+    # Suma tiempos por estado ampliando el histograma cuando aparece un estado nuevo
+    parcial = np.bincount(estados, weights=duraciones)
+    if len(parcial) > len(histograma):
+        histograma = np.concatenate([histograma, np.zeros(len(parcial) - len(histograma))])
+    histograma[:len(parcial)] += parcial
+    return histograma
+
+def _resumen(lambda_, mu, histograma, tiempo_total, Ws, Wq, lambda_efectiva):
+    # Métricas empíricas a partir del tiempo pasado en cada estado
+    ocupacion = histograma / tiempo_total
+    estados = np.arange(len(ocupacion))
+    return {
+        "lambda": lambda_,
+        "mu": mu,
+        "rho": lambda_ / mu,
+        "Po": float(ocupacion[0]),
+        "Ls": float(np.dot(estados, ocupacion)),
+        "Lq": float(np.dot(np.maximum(estados - 1, 0), ocupacion)),
+        "Ws": float(Ws),
+        "Wq": float(Wq),
+        "lambda_efectiva": float(lambda_efectiva),
+        "histograma": ocupacion,
+        "tiempo_simulado": float(tiempo_total)
+    }
+
+def simular_sin_limite_cola(lambda_, mu, clientes=10 ** 6, bloque=TAMANO_BLOQUE, semilla=None):
+    """Simula un M/M/1 con la recursión de Lindley sobre los tiempos de espera.
+
+    Ws y Wq son promedios por cliente; Ls, Lq, Po y el histograma de estados
+    son promedios en el tiempo calculados a partir de llegadas y salidas.
+    """
+    _validar(lambda_, mu, clientes)
+    if mu <= lambda_:
+        raise SistemaInestableError("mu (μ) tiene que ser mayor que lambda (λ)")
+    rng = np.random.default_rng(semilla)
+
+    tiempo = 0.0            # Instante de la última llegada procesada
+    espera_anterior = 0.0   # W del último cliente del bloque anterior
+    servicio_anterior = 0.0
+    estado = 0              # Clientes en el sistema en `tiempo`
+    pendientes = np.empty(0)  # Salidas posteriores a `tiempo`
+    histograma = np.zeros(1)
+    suma_espera = 0.0
+    suma_servicio = 0.0
+
+    restantes = clientes
+    while restantes > 0:
+        m = min(bloque, restantes)
+        entre_llegadas = rng.exponential(1 / lambda_, m)
+        servicios = rng.exponential(1 / mu, m)
+
+        # Tiempos de espera en cola: U_n = S_{n-1} - A_n
+        U = np.empty(m)
+        U[0] = servicio_anterior - entre_llegadas[0]
+        U[1:] = servicios[:-1] - entre_llegadas[1:]
+        esperas = _lindley(U, espera_anterior)
+
+        llegadas = tiempo + np.cumsum(entre_llegadas)
+        salidas = np.concatenate([pendientes, llegadas + esperas + servicios])  # Ordenadas (FIFO)
+
+        # Eventos hasta la última llegada del bloque; el resto de salidas pasa al siguiente
+        horizonte = llegadas[-1]
+        corte = np.searchsorted(salidas, horizonte, side="right")
+        pendientes = salidas[corte:]
+        instantes = np.concatenate([llegadas, salidas[:corte]])
+        cambios = np.concatenate([np.ones(m, dtype=np.int64), -np.ones(corte, dtype=np.int64)])
+        orden = np.argsort(instantes, kind="stable")
+        instantes = instantes[orden]
+        estados = estado + np.cumsum(cambios[orden])
+
+        duraciones = np.diff(np.concatenate([[tiempo], instantes, [horizonte]]))
+        histograma = _acumular_histograma(
+            histograma, np.concatenate([[estado], estados]), duraciones
+        )
+
+        suma_espera += esperas.sum()
+        suma_servicio += servicios.sum()
+        tiempo = horizonte
+        estado = int(estados[-1])
+        espera_anterior = esperas[-1]
+        servicio_anterior = servicios[-1]
+        restantes -= m
+
+    Wq = suma_espera / clientes
+    Ws = (suma_espera + suma_servicio) / clientes
+    resultados = _resumen(lambda_, mu, histograma, tiempo, Ws, Wq, clientes / tiempo)
+    resultados["clientes"] = clientes
+    return resultados
+
+def simular_con_limite_cola(lambda_, mu, N, clientes=10 ** 6, bloque=TAMANO_BLOQUE, semilla=None):
+    """Simula un M/M/1/N (a lo sumo N clientes en el sistema) con bloqueo de llegadas.
+
+    Se simula la cadena uniformizada con tasa λ + μ: cada evento es una
+    llegada (bloqueada si hay N clientes) o un servicio (ficticio si el
+    sistema está vacío). El número en el sistema es un paseo reflejado en
+    [0, N] que se resuelve por bloques con ``_componer_recortes``. Ws y Wq se
+    obtienen por la ley de Little con la tasa efectiva observada.
+    """
+    _validar(lambda_, mu, clientes)
+    N = int(N)
+    if N < 1:
+        raise ValueError("el límite N tiene que ser al menos 1")
+    rng = np.random.default_rng(semilla)
+    tasa = lambda_ + mu
+    prob_llegada = lambda_ / tasa
+
+    estado = 0
+    tiempo = 0.0
+    histograma = np.zeros(N + 1)
+    llegadas = 0
+    bloqueadas = 0
+
+    while llegadas < clientes:
+        es_llegada = rng.random(bloque) < prob_llegada
+        # Recortar el bloque en la llegada que completa el número de clientes pedido
+        acumuladas = np.cumsum(es_llegada)
+        faltan = clientes - llegadas
+        if acumuladas[-1] >= faltan:
+            fin = int(np.searchsorted(acumuladas, faltan)) + 1
+            es_llegada = es_llegada[:fin]
+        m = len(es_llegada)
+        permanencias = rng.exponential(1 / tasa, m)
+
+        desplazamiento = np.where(es_llegada, 1, -1).astype(np.int64)
+        inferior = np.zeros(m, dtype=np.int64)
+        superior = np.full(m, N, dtype=np.int64)
+        _componer_recortes(desplazamiento, inferior, superior)
+        despues = np.clip(estado + desplazamiento, inferior, superior)
+        antes = np.concatenate([[estado], despues[:-1]])
+
+        histograma += np.bincount(antes, weights=permanencias, minlength=N + 1)
+        llegadas += int(es_llegada.sum())
+        bloqueadas += int(np.count_nonzero(es_llegada & (antes == N)))
+        tiempo += permanencias.sum()
+        estado = int(despues[-1])
+
+    lambda_efectiva = (llegadas - bloqueadas) / tiempo
+    ocupacion = histograma / tiempo
+    estados = np.arange(N + 1)
+    Ls = np.dot(estados, ocupacion)
+    Lq = np.dot(np.maximum(estados - 1, 0), ocupacion)
+    resultados = _resumen(lambda_, mu, histograma, tiempo, Ls / lambda_efectiva, Lq / lambda_efectiva, lambda_efectiva)
+    resultados["N"] = N
+    resultados["clientes"] = llegadas
+    resultados["prob_bloqueo"] = bloqueadas / llegadas
+    return resultados
+
+def simular_resultados(resultados, clientes=CLIENTES_COMPARACION, semilla=None):
+    """Simula el modelo de un resultado de ``calcular_sin_limite_cola`` / ``calcular_con_limite_cola``."""
+    N = resultados["distribucion"].N
+    if N is None:
+        return simular_sin_limite_cola(resultados["lambda"], resultados["mu"], clientes, semilla=semilla)
+    return simular_con_limite_cola(resultados["lambda"], resultados["mu"], N, clientes, semilla=semilla)
+
+def comparar(resultados, simulacion):
+    """Filas (etiqueta, analítico, simulado, diferencia relativa) de las métricas que tienen los dos."""
+    filas = []
+    for clave, etiqueta in METRICAS_COMPARADAS:
+        if clave in resultados and clave in simulacion:
+            analitico, simulado = resultados[clave], simulacion[clave]
+            diferencia = (simulado - analitico) / analitico if analitico else math.nan
+            filas.append((etiqueta, analitico, simulado, diferencia))
+    return filas
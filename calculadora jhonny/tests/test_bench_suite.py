@@ -0,0 +1,35 @@
+import os
+import sys
+
+import main
+from colas import calcular_con_limite_cola
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_suite import clase_ventana_prueba
+
+class _Widget:
+    """Reemplazo sin display de los widgets que crea mostrar_resultados."""
+
+    def __init__(self, *args, **kwargs):
+        self.tree = self
+        self.mostrado = None
+
+    def grid(self, **kwargs):
+        pass
+
+    def actualizar(self, resultados):
+        pass
+
+    def mostrar(self, distribucion):
+        self.mostrado = distribucion
+
+def test_ventana_prueba_tiene_lo_que_usa_mostrar_resultados(monkeypatch):
+    # Sin display no se puede medir la tabla, pero sí que el stub no se rompa
+    monkeypatch.setattr(main, "PanelResultados", _Widget)
+    monkeypatch.setattr(main, "TablaDistribucion", _Widget)
+    monkeypatch.setattr(main.ttk, "Label", _Widget)
+    ventana = clase_ventana_prueba()(resultados_frame=None)
+    ventana.resultados = calcular_con_limite_cola(0.9, 1.0, 10)
+    ventana.mostrar_resultados()
+    assert ventana.tabla_distribucion.mostrado is ventana.resultados["distribucion"]
@@ -0,0 +1,41 @@
+import threading
+
+from cache_resultados import CacheResultados, normalizar_clave, tamano_aproximado
+
+def test_desaloja_por_cantidad_de_entradas():
+    cache = CacheResultados(max_entradas=2)
+    for lambda_ in (1, 2, 3):
+        cache.obtener("con_limite", lambda_, 4, 10)
+    assert len(cache) == 2
+    assert normalizar_clave("con_limite", 1, 4, 10) not in cache
+    assert normalizar_clave("con_limite", "3", 4.0, 10) in cache
+    assert cache.estadisticas()["desalojos"] == 1
+
+def test_contadores_consistentes_entre_hilos():
+    cache = CacheResultados()
+
+    def pedir():
+        for _ in range(500):
+            cache.obtener("sin_limite", 1, 2)
+            len(cache)
+
+    hilos = [threading.Thread(target=pedir) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    estadisticas = cache.estadisticas()
+    assert estadisticas["aciertos"] + estadisticas["fallos"] == 8 * 500
+    assert estadisticas["entradas"] == 1
+
+def test_sin_limite_ignora_N_y_c():
+    assert normalizar_clave("sin_limite", 1, 2, 10, 3) == normalizar_clave("sin_limite", 1, 2)
+    assert normalizar_clave("con_limite", 1, 2, 10, 3) == normalizar_clave("con_limite", 1, 2, 10)
+
+def test_presupuesto_de_memoria_cuenta_los_arreglos_de_mmc():
+    cache = CacheResultados(memoria_maxima=2 * 1024 * 1024)
+    chica = cache.obtener("multiservidor", 4, 1, None, 5)
+    grande = cache.obtener("multiservidor", 40000, 1, None, 50000)
+    assert tamano_aproximado(grande) - tamano_aproximado(chica) >= 2 * 8 * (50000 - 5)
+    cache.obtener("multiservidor", 80000, 1, None, 100000)  # 1.6 MB de arreglos: desaloja las anteriores
+    assert len(cache) == 1 and cache.estadisticas()["memoria"] <= cache.memoria_maxima
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from colas import curva_capacidad, evaluar_lote_con_limite
+
+@pytest.mark.parametrize("lambda_, mu, N", [(2.0, 3.0, 5), (3.0, 2.0, 8), (1.0, 1.0, 4)])
+def test_lambda_efectiva_con_limite(lambda_, mu, N):
+    # Lo que entra es lo que sale: λ(1 - P_N) = μ(1 - P0), y Little con λ_ef
+    lote = evaluar_lote_con_limite(lambda_, mu, N)
+    assert lote["lambda_efectiva"] == pytest.approx(mu * (1 - lote["Po"]))
+    assert lote["Ls"] == pytest.approx(lote["lambda_efectiva"] * lote["Ws"])
+
+def test_curva_capacidad_coincide_con_el_lote():
+    curva = curva_capacidad(3.0, 2.0, 20)
+    lote = evaluar_lote_con_limite(3.0, 2.0, np.arange(1, 21))
+    assert curva["lambda_efectiva"] == pytest.approx(lote["lambda_efectiva"])
+    assert curva["Ws"] == pytest.approx(lote["Ws"])
@@ -0,0 +1,25 @@
+import pytest
+
+from diseno import N_minimo, mu_minimo
+
+@pytest.mark.parametrize("objetivos", [{"Wq": 0}, {"Lq": 0}, {"utilizacion": -0.5}, {"Ws": float("nan")}])
+@pytest.mark.parametrize("N", [None, 5])
+def test_objetivos_no_positivos(objetivos, N):
+    with pytest.raises(ValueError, match="positivo"):
+        mu_minimo(2.0, N=N, **objetivos)
+
+def test_N_minimo_rechaza_objetivos_no_positivos():
+    with pytest.raises(ValueError, match="positivo"):
+        N_minimo(2.0, 2.5, Lq=0)
+
+@pytest.mark.parametrize("objetivos", [{"Wq": 1e-300}, {"Lq": 1e-300}, {"utilizacion": 1e-300}, {"Ws": 1e-300}])
+@pytest.mark.parametrize("N", [None, 5])
+def test_objetivos_inalcanzables(objetivos, N):
+    # Antes se devolvía el μ ≈ 1e16 donde la métrica se redondea a 0
+    with pytest.raises(ValueError):
+        mu_minimo(2.0, N=N, **objetivos)
+
+def test_objetivo_chico_pero_alcanzable():
+    resultados = mu_minimo(2.0, Wq=1e-20)
+    assert 0 < resultados["Wq"] <= 1e-20
+    assert resultados["mu"] == pytest.approx((2.0 / 1e-20) ** 0.5, rel=1e-3)
@@ -0,0 +1,36 @@
+import sqlite3
+
+import historial
+from cache_resultados import CacheResultados
+from colas import calcular_con_limite_cola
+from historial import HistorialCalculos
+
+def test_buscar_ignora_filas_de_otra_version(tmp_path, monkeypatch):
+    base = HistorialCalculos(str(tmp_path / "h.db"))
+    base.registrar("con_limite", calcular_con_limite_cola(2, 3, 10), N=10)
+    assert base.buscar("con_limite", 2, 3, N=10) is not None
+    monkeypatch.setattr(historial, "VERSION_RESULTADOS", historial.VERSION_RESULTADOS + 1)
+    assert base.buscar("con_limite", 2, 3, N=10) is None
+
+    # La caché tibia recalcula en lugar de servir la fila vieja
+    cache = CacheResultados()
+    cache.obtener("con_limite", 2, 3, 10, historial=base)
+    assert cache.estadisticas()["aciertos_historial"] == 0
+    base.cerrar()
+
+def test_base_sin_columna_version(tmp_path):
+    ruta = str(tmp_path / "vieja.db")
+    conexion = sqlite3.connect(ruta)
+    conexion.execute("CREATE TABLE calculos (id INTEGER PRIMARY KEY, fecha REAL NOT NULL, modelo TEXT NOT NULL, "
+                     "lambda REAL NOT NULL, mu REAL NOT NULL, N INTEGER, c INTEGER, rho REAL, Po REAL, Ls REAL, "
+                     "Lq REAL, Ws REAL, Wq REAL, lambda_efectiva REAL, prob_bloqueo REAL, erlang_b REAL, erlang_c REAL)")
+    conexion.execute("INSERT INTO calculos (fecha, modelo, lambda, mu, N, rho, Ls) VALUES (0, 'con_limite', 2, 3, 10, 0.6, 1)")
+    conexion.commit()
+    conexion.close()
+
+    base = HistorialCalculos(ruta)
+    assert base.contar() == 1
+    assert base.buscar("con_limite", 2, 3, N=10) is None
+    base.registrar("con_limite", calcular_con_limite_cola(2, 3, 10), N=10)
+    assert base.buscar("con_limite", 2, 3, N=10)["version"] == historial.VERSION_RESULTADOS
+    base.cerrar()
@@ -0,0 +1,12 @@
+import pytest
+
+from incertidumbre import interpretar_distribucion, valores_centrales
+
+@pytest.mark.parametrize("lambda_, mu", [("2", "uniforme(-1, 1)"), ("normal(0, 1)", "3"), ("2", "-3")])
+def test_valores_centrales_no_positivos(lambda_, mu):
+    with pytest.raises(ValueError, match="positivos"):
+        valores_centrales(interpretar_distribucion(lambda_), interpretar_distribucion(mu))
+
+def test_valores_centrales():
+    N = interpretar_distribucion("uniforme(4, 7)")
+    assert valores_centrales(interpretar_distribucion("2 ± 0.2"), interpretar_distribucion("gamma(3, 0.3)"), N) == (2.0, 3.0, 6)
@@ -0,0 +1,55 @@
+import json
+
+from historial import HistorialCalculos
+from lotes import evaluar_bloque, leer_resultados, procesar_archivo
+from reporte import generar_reporte_lote
+
+def _filas_jsonl(texto):
+    return [json.loads(linea) for linea in texto.splitlines()]
+
+def test_jsonl_linea_invalida_no_frena_el_bloque():
+    lineas = ['{"lambda": 1, "mu": 2}\n', "\n", "no es json\n", "[1, 2]\n", '{"lambda": "abc", "mu": 2}\n']
+    texto, n, errores, _, _ = evaluar_bloque(lineas, "jsonl", None, "jsonl", 1)
+    filas = _filas_jsonl(texto)
+    assert (n, errores) == (4, 3)
+    assert [fila["fila"] for fila in filas] == [1, 3, 4, 5]
+    assert filas[0]["Po"] == 0.5
+    assert filas[1]["error"].startswith("JSON inválido")
+    assert filas[2]["error"] == "la línea no es un objeto JSON"
+    assert filas[3]["lambda"] == "abc"
+
+def test_csv_saltea_lineas_en_blanco_y_repite_el_texto_invalido():
+    lineas = ["1,2\n", "\n", "  \n", "abc,2\n"]
+    texto, n, errores, _, _ = evaluar_bloque(lineas, "csv", ["lambda", "mu"], "csv", 1)
+    filas = texto.splitlines()
+    assert (n, errores) == (2, 1)
+    assert filas[1].startswith("4,sin_limite,abc,2.0,")
+    assert filas[1].endswith("lambda no es un número")
+
+def test_reporte_lote_con_valores_no_numericos(tmp_path):
+    entrada, salida = tmp_path / "e.csv", tmp_path / "s.csv"
+    entrada.write_text("lambda,mu\n1,2\nabc,2\n", encoding="utf-8")
+    resumen = procesar_archivo(str(entrada), str(salida), procesos=1)
+    assert (resumen["filas"], resumen["errores"]) == (2, 1)
+    pdf = generar_reporte_lote(leer_resultados(str(salida)), filename=str(tmp_path / "r.pdf"))
+    assert (tmp_path / "r.pdf").stat().st_size > 0 and pdf.endswith("r.pdf")
+
+def test_historial_registra_solo_los_escenarios_estables(tmp_path):
+    entrada, salida = tmp_path / "e.jsonl", tmp_path / "s.jsonl"
+    entrada.write_text('{"lambda": 1, "mu": 2}\n{"lambda": 3, "mu": 2}\n{"lambda": 2, "mu": 3, "N": 10}\n'
+                       '{"lambda": 40, "mu": 1, "c": 50}\n{"lambda": "abc", "mu": 2}\n', encoding="utf-8")
+    historial = HistorialCalculos(str(tmp_path / "h.db"))
+    procesar_archivo(str(entrada), str(salida), procesos=1, historial=historial)
+    assert historial.contar() == 3
+    assert historial.buscar("sin_limite", 1, 2)["Po"] == 0.5
+    assert historial.buscar("con_limite", 2, 3, N=10)["N"] == 10
+    assert historial.buscar("multiservidor", 40, 1, c=50)["erlang_c"] is not None
+    historial.cerrar()
+
+def test_csv_con_campo_de_varias_lineas_no_se_parte_entre_bloques(tmp_path):
+    entrada, salida = tmp_path / "e.csv", tmp_path / "s.csv"
+    entrada.write_text('lambda,mu,nota\n1,2,"una\nnota ""larga""\nen tres líneas"\n1,4,x\n3,4,y\n', encoding="utf-8")
+    resumen = procesar_archivo(str(entrada), str(salida), procesos=2, filas_por_bloque=1)
+    filas = list(leer_resultados(str(salida)))
+    assert (resumen["filas"], resumen["errores"]) == (3, 0)
+    assert [(fila["fila"], fila["mu"]) for fila in filas] == [("1", "2.0"), ("2", "4.0"), ("3", "4.0")]
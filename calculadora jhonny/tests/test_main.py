@@ -0,0 +1,30 @@
+import pytest
+
+from main import VentanaConLimite, VentanaMultiservidor, VentanaSinLimite
+
+class _Entrada:
+    def __init__(self, texto):
+        self.texto = texto
+
+    def get(self):
+        return self.texto
+
+def _ventana(clase, **textos):
+    # Sin display: solo las entradas, sin crear la ventana de Tk
+    ventana = object.__new__(clase)
+    ventana.entradas = {clave: _Entrada(texto) for clave, texto in textos.items()}
+    return ventana
+
+def test_leer_parametros_en_el_orden_de_calcular_con_cache():
+    assert _ventana(VentanaSinLimite, **{"lambda": "2", "mu": " 3 "}).leer_parametros() == [2.0, 3.0]
+    assert _ventana(VentanaConLimite, **{"lambda": "2", "mu": "3", "N": "10"}).leer_parametros() == [2.0, 3.0, 10]
+    assert _ventana(VentanaMultiservidor, **{"lambda": "2", "mu": "3", "c": "4", "K": ""}).leer_parametros() == [2.0, 3.0, None, 4]
+
+@pytest.mark.parametrize("clase, textos", [
+    (VentanaSinLimite, {"lambda": "", "mu": "3"}),
+    (VentanaConLimite, {"lambda": "2", "mu": "3", "N": "1.5"}),
+    (VentanaMultiservidor, {"lambda": "2", "mu": "3", "c": "0", "K": ""}),
+])
+def test_leer_parametros_invalidos(clase, textos):
+    with pytest.raises(ValueError):
+        _ventana(clase, **textos).leer_parametros()
@@ -0,0 +1,36 @@
+import math
+
+import numpy as np
+import pytest
+
+from multiservidor import calcular_mmc, calcular_mmck, erlang_b, evaluar_lote_mmc
+
+# Carga liviana con muchos servidores: B es menor que el menor float pero
+# Po tiende a e^-a (el sistema se comporta como M/M/∞)
+CASOS_LIVIANOS = [(1.0, 1.0, 200), (10.0, 1.0, 500), (100.0, 1.0, 2000)]
+
+def test_erlang_b_recurrencia_clasica():
+    # B(5, 5) y B(5, 10) de las tablas de Erlang
+    assert erlang_b(5.0, [5, 10]) == pytest.approx([0.28486782, 0.01838457], rel=1e-7)
+    assert np.array_equal(erlang_b([5.0, 5.0], [5, 10]), erlang_b(5.0, [5, 10]))
+
+def test_lote_carga_liviana_c_grande():
+    lambda_, mu, c = (np.array(columna) for columna in zip(*CASOS_LIVIANOS))
+    lote = evaluar_lote_mmc(lambda_, mu, c)
+    a = lambda_ / mu
+    assert lote["Po"] == pytest.approx(np.exp(-a), rel=1e-9)
+    assert lote["Ls"] == pytest.approx(a, rel=1e-9)
+    assert np.all(np.isfinite(lote["Wq"]))
+
+@pytest.mark.parametrize("lambda_, mu, c", CASOS_LIVIANOS)
+def test_calcular_mmc_carga_liviana_c_grande(lambda_, mu, c):
+    resultados = calcular_mmc(lambda_, mu, c)
+    assert resultados["Po"] == pytest.approx(math.exp(-lambda_ / mu), rel=1e-9)
+    distribucion = resultados["distribucion"]
+    assert distribucion.acumulada(distribucion.ultimo_estado) >= 0.9999
+    assert distribucion.cuantil(1.0) <= c + 10
+
+def test_calcular_mmck_carga_liviana_c_grande():
+    resultados = calcular_mmck(1.0, 1.0, 200, 400)
+    assert resultados["Po"] == pytest.approx(math.exp(-1.0), rel=1e-9)
+    assert resultados["distribucion"].cuantil(0.9999) <= 400
@@ -0,0 +1,21 @@
+from colas import calcular_con_limite_cola
+from multiservidor import calcular_mmck
+from reporte import MAX_ESTADOS_REPORTE, filas_distribucion, generar_reporte, ultimo_estado
+
+def test_ultimo_estado_con_cuantil_y_tope():
+    distribucion = calcular_con_limite_cola(1.0, 1.0, 10 ** 6)["distribucion"]  # Uniforme: el cuantil no corta
+    assert ultimo_estado(distribucion) == 10 ** 6
+    assert ultimo_estado(distribucion, 1 - 1e-9, MAX_ESTADOS_REPORTE) == MAX_ESTADOS_REPORTE - 1
+
+def test_filas_distribucion_resume_la_cola():
+    distribucion = calcular_con_limite_cola(0.9, 1.0, 10 ** 6)["distribucion"]
+    bloques = [bloque for bloque, _ in filas_distribucion(distribucion, 1 - 1e-9)]
+    ultima = bloques[-1][-1]
+    assert ultima[0] == f"> {distribucion.cuantil(1 - 1e-9)}"
+    assert sum(len(bloque) for bloque in bloques) < 300
+
+def test_reporte_de_capacidad_enorme_se_corta(tmp_path):
+    # Antes recorría los 10⁹ estados de M/M/c/K
+    resultados = calcular_mmck(40, 1, 50, 10 ** 9)
+    destino = generar_reporte(resultados, filename=str(tmp_path / "r.pdf"))
+    assert (tmp_path / "r.pdf").stat().st_size < 100_000 and destino.endswith("r.pdf")
@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+import pytest
+
+from servicio import PeticionInvalida, ServicioColas, SimulacionNoDisponible, evaluar_lote, validar
+
+def test_sin_limite_rechaza_N():
+    with pytest.raises(PeticionInvalida):
+        validar({"modelo": "sin_limite", "lambda": 1, "mu": 2, "N": 3})
+
+def test_sin_limite_estados_sin_truncar():
+    peticion = validar({"modelo": "sin_limite", "lambda": 1, "mu": 2, "estados": [0, 3], "cuantiles": [0.5]})
+    respuesta, = evaluar_lote("sin_limite", [peticion])
+    assert respuesta["estados"][0][1] == pytest.approx(0.5)
+    assert respuesta["resultados"]["Po"] == pytest.approx(0.5)
+
+@pytest.mark.parametrize("simular", [{"clientes": 10 ** 12}, {"clientes": 0}, {"semilla": "1"}, {"semilla": 1.5}, [1]])
+def test_simular_invalido(simular):
+    with pytest.raises(PeticionInvalida):
+        validar({"modelo": "con_limite", "lambda": 1, "mu": 2, "N": 5, "simular": simular})
+
+def _pedir(solicitud):
+    # Primera línea de la respuesta a una solicitud HTTP cruda
+    async def pedir():
+        servicio = ServicioColas()
+        servidor = await asyncio.start_server(servicio.atender_conexion, "127.0.0.1", 0)
+        async with servidor:
+            reader, writer = await asyncio.open_connection(*servidor.sockets[0].getsockname()[:2])
+            writer.write(solicitud)
+            await writer.drain()
+            estado = await reader.readline()
+            writer.close()
+            return estado
+
+    return asyncio.run(pedir()).split()[1]
+
+def _post(peticion):
+    cuerpo = json.dumps(peticion).encode()
+    return _pedir(b"POST /calcular HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(cuerpo) + cuerpo)
+
+def test_resultado_no_finito_devuelve_422():
+    assert _post({"modelo": "con_limite", "lambda": 1e300, "mu": 1e-300, "N": 5}) == b"422"
+
+@pytest.mark.parametrize("largo", [b"abc", b"-5"])
+def test_content_length_invalido_devuelve_400(largo):
+    assert _pedir(b"POST /calcular HTTP/1.1\r\nContent-Length: " + largo + b"\r\n\r\n") == b"400"
+
+def test_simular_multiservidor_se_rechaza_al_validar():
+    with pytest.raises(SimulacionNoDisponible):
+        validar({"modelo": "multiservidor", "lambda": 1, "mu": 2, "c": 2, "simular": {}})
+    assert _post({"modelo": "multiservidor", "lambda": 1, "mu": 2, "c": 2, "simular": {}}) == b"422"
@@ -0,0 +1,21 @@
+import pytest
+
+from colas import calcular_con_limite_cola, calcular_sin_limite_cola
+from simulacion import comparar, simular_con_limite_cola, simular_resultados, simular_sin_limite_cola
+
+@pytest.mark.parametrize("simular, argumentos", [
+    (simular_sin_limite_cola, (0.0, 1.0)),
+    (simular_con_limite_cola, (0.0, 1.0, 5)),
+    (simular_con_limite_cola, (1.0, 0.0, 5)),
+    (simular_con_limite_cola, (1.0, 2.0, 0)),
+])
+def test_parametros_invalidos(simular, argumentos):
+    with pytest.raises(ValueError):
+        simular(*argumentos, clientes=10)
+
+@pytest.mark.parametrize("resultados", [calcular_sin_limite_cola(2.0, 3.0), calcular_con_limite_cola(3.0, 2.0, 6)])
+def test_comparacion_con_el_analitico(resultados):
+    filas = comparar(resultados, simular_resultados(resultados, 2 * 10 ** 5, semilla=0))
+    assert len(filas) >= 6
+    for etiqueta, _, _, diferencia in filas:
+        assert abs(diferencia) < 0.05, etiqueta
@@ -0,0 +1,118 @@
+"""Ejecución de trabajos pesados fuera del hilo principal de Tk.
+
+Los trabajos corren en un ThreadPoolExecutor y sus resultados se entregan en
+el hilo de Tk sondeando una cola con ``after()``. Cada trabajo pertenece a un
+canal (p. ej. "calculo" o "reporte"): enviar un trabajo nuevo a un canal
+cancela el anterior y descarta su resultado aunque ya haya terminado.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class TrabajoCancelado(Exception):
+    """Lanzada dentro de un trabajo cuando se pidió su cancelación."""
+
+class Trabajo:
+    """Identifica un trabajo en curso; se pasa como único argumento a la función."""
+
+    def __init__(self, canal, cola):
+        self.canal = canal
+        self.cancelado = threading.Event()
+        self.futuro = None
+        self._cola = cola
+
+    def verificar(self):
+        if self.cancelado.is_set():
+            raise TrabajoCancelado()
+
+    def informar(self, fraccion=None, texto=None):
+        """Publica el avance (0..1) y comprueba si el trabajo fue cancelado."""
+        self.verificar()
+        self._cola.put((self, "progreso", (fraccion, texto)))
+
+class GestorTrabajos:
+    def __init__(self, widget, max_hilos=2, intervalo_ms=50):
+        self.widget = widget
+        self.intervalo_ms = intervalo_ms
+        self._ejecutor = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="calculadora")
+        self._cola = queue.Queue()
+        self._actuales = {}  # canal -> (trabajo, al_terminar, al_fallar, al_progreso)
+        self._after_id = None
+        self._cerrado = False
+
+    def enviar(self, canal, funcion, al_terminar, al_fallar=None, al_progreso=None):
+        """Ejecuta ``funcion(trabajo)`` en segundo plano.
+
+        Los callbacks se llaman en el hilo de Tk y solo si el trabajo sigue
+        siendo el más reciente de su canal.
+        """
+        self.cancelar(canal)
+        trabajo = Trabajo(canal, self._cola)
+        self._actuales[canal] = (trabajo, al_terminar, al_fallar, al_progreso)
+        trabajo.futuro = self._ejecutor.submit(self._ejecutar, trabajo, funcion)
+        self._programar_sondeo()
+        return trabajo
+
+    def _ejecutar(self, trabajo, funcion):
+        try:
+            resultado = funcion(trabajo)
+        except TrabajoCancelado:
+            return
+        except Exception as error:
+            self._cola.put((trabajo, "error", error))
+            return
+        self._cola.put((trabajo, "ok", resultado))
+
+    def cancelar(self, canal):
+        actual = self._actuales.pop(canal, None)
+        if actual is not None:
+            trabajo = actual[0]
+            trabajo.cancelado.set()
+            trabajo.futuro.cancel()
+
+    def cancelar_todos(self):
+        for canal in list(self._actuales):
+            self.cancelar(canal)
+
+    def ocupado(self, canal=None):
+        return canal in self._actuales if canal is not None else bool(self._actuales)
+
+    def _programar_sondeo(self):
+        if self._after_id is None and not self._cerrado:
+            self._after_id = self.widget.after(self.intervalo_ms, self._sondear)
+
+    def _sondear(self):
+        self._after_id = None
+        while not self._cerrado:
+            try:
+                trabajo, tipo, valor = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            actual = self._actuales.get(trabajo.canal)
+            if actual is None or actual[0] is not trabajo:
+                continue  # Resultado obsoleto o cancelado
+            _, al_terminar, al_fallar, al_progreso = actual
+
+            if tipo == "progreso":
+                if al_progreso is not None:
+                    al_progreso(*valor)
+                continue
+            del self._actuales[trabajo.canal]
+            if tipo == "ok":
+                al_terminar(valor)
+            elif al_fallar is not None:
+                al_fallar(valor)
+            else:
+                self.widget.report_callback_exception(type(valor), valor, valor.__traceback__)
+
+        if self._actuales:
+            self._programar_sondeo()
+
+    def cerrar(self):
+        """Cancela todo y deja de sondear; llamar antes de destruir el widget."""
+        self.cancelar_todos()
+        self._cerrado = True
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._ejecutor.shutdown(wait=False, cancel_futures=True)
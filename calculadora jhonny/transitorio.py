@@ -0,0 +1,197 @@
+"""Análisis transitorio del modelo M/M/1/N por uniformización.
+
+Con q = λ + μ la cadena uniformizada tiene matriz P = I + Q/q, tridiagonal
+(subir con λ/q, bajar con μ/q, quedarse en los bordes), y
+
+    p(t) = Σ_k Pois(k; q·t) · v_k,    v_{k+1} = v_k · P,  v_0 = estado inicial.
+
+Los vectores v_k se calculan una sola vez para todos los tiempos pedidos, con
+tres operaciones de arreglos por paso (O(N)). Los pesos de Poisson salen de
+una tabla de log k! compartida y se evalúan por bloques de pasos; cada bloque
+se acumula con un producto de matrices (BLAS) solo en las filas de los
+tiempos cuya ventana de Poisson lo toca. Cuando v_k ya coincide con la
+distribución estacionaria (conocida en forma cerrada) se deja de iterar y el
+peso restante se asigna a la estacionaria.
+"""
+import math
+
+import numpy as np
+
+from colas import DistribucionEstados, ErrorModeloColas, calcular_con_limite_cola
+from instrumentacion import contar
+
+# Ancho de la ventana de Poisson en desvíos estándar (cola despreciable)
+DESVIOS_POISSON = 9.0
+# Límite de memoria del bloque de vectores v_k
+BYTES_BLOQUE = 16 * 1024 * 1024
+# Más elementos que esto en la matriz P(n, t) no se guardan por defecto
+MAX_ELEMENTOS_DISTRIBUCIONES = 5 * 10 ** 7
+
+class DistribucionTabulada(DistribucionEstados):
+    """Distribución dada por un vector de probabilidades, con la interfaz de DistribucionEstados."""
+
+    def __init__(self, probabilidades):
+        self.p = np.asarray(probabilidades, dtype=float)
+        self.acumuladas = np.cumsum(self.p)
+        self.N = len(self.p) - 1
+        self.ultimo_estado = self.N
+
+    def probabilidad(self, n):
+        return float(self.p[n]) if 0 <= n <= self.N else 0.0
+
+    def acumulada(self, n):
+        if n < 0:
+            return 0.0
+        return 1.0 if n >= self.N else min(float(self.acumuladas[n]), 1.0)
+
+    def cuantil(self, q):
+        return min(int(np.searchsorted(self.acumuladas, q)), self.N)
+
+def _ventanas_poisson(qt):
+    # Rango [izquierda, derecha] de k con peso no despreciable para cada q·t
+    desvio = DESVIOS_POISSON * np.sqrt(qt)
+    izquierda = np.maximum(np.floor(qt - desvio), 0).astype(np.int64)
+    derecha = np.ceil(qt + desvio + DESVIOS_POISSON ** 2).astype(np.int64)
+    return izquierda, derecha
+
+def transitorio_con_limite(lambda_, mu, N, tiempos, estado_inicial=0, distribuciones=None, tol=1e-12):
+    """P(n, t) y E[L(t)] del M/M/1/N para una lista de tiempos.
+
+    ``estado_inicial`` es un número de clientes o un vector de N+1
+    probabilidades. Con ``distribuciones`` (por defecto, si la matriz cabe en
+    MAX_ELEMENTOS_DISTRIBUCIONES) se devuelve P con forma (tiempos, N+1);
+    si no, solo las curvas L, Lq, Po y prob_bloqueo.
+    """
+    N = int(N)
+    tiempos = np.asarray(tiempos, dtype=float).ravel()
+    if N < 1:
+        raise ValueError("N tiene que ser al menos 1")
+    if lambda_ <= 0 or mu <= 0:
+        raise ValueError("λ y μ tienen que ser positivos")
+    if tiempos.size == 0 or np.any(tiempos < 0) or not np.all(np.isfinite(tiempos)):
+        raise ValueError("los tiempos tienen que ser finitos y no negativos")
+    if distribuciones is None:
+        distribuciones = tiempos.size * (N + 1) <= MAX_ELEMENTOS_DISTRIBUCIONES
+
+    if np.ndim(estado_inicial) == 0:
+        if not 0 <= int(estado_inicial) <= N:
+            raise ValueError("el estado inicial tiene que estar entre 0 y N")
+        v = np.zeros(N + 1)
+        v[int(estado_inicial)] = 1.0
+    else:
+        v = np.asarray(estado_inicial, dtype=float).copy()
+        if v.shape != (N + 1,) or np.any(v < 0) or abs(v.sum() - 1) > 1e-9:
+            raise ErrorModeloColas("la distribución inicial tiene que tener N+1 probabilidades que sumen 1")
+
+    q = lambda_ + mu
+    subir, bajar = lambda_ / q, mu / q
+    estacionario = calcular_con_limite_cola(lambda_, mu, N)
+    # Estacionaria vectorizada: pesos ρ^n relativos al estado más probable (0 o N)
+    log_rho = math.log(lambda_ / mu)
+    pi = np.exp((np.arange(N + 1) - (N if log_rho > 0 else 0)) * log_rho)
+    pi /= pi.sum()
+
+    qt = q * tiempos
+    izquierda, derecha = _ventanas_poisson(qt)
+    k_max = int(derecha.max())
+    log_qt = np.log(np.where(qt > 0, qt, 1.0))
+    # log k! compartido por todos los tiempos y bloques
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, k_max + 1)))])
+
+    # Proyecciones que se acumulan siempre: n, 1{n=0}, 1{n=N}
+    estados = np.arange(N + 1, dtype=float)
+    proyeccion = np.zeros((N + 1, 3))
+    proyeccion[:, 0] = estados
+    proyeccion[0, 1] = 1.0
+    proyeccion[N, 2] = 1.0
+
+    T = tiempos.size
+    curvas = np.zeros((T, 3))
+    P = np.zeros((T, N + 1)) if distribuciones else None
+    peso_acumulado = np.zeros(T)
+
+    bloque = max(1, min(256, BYTES_BLOQUE // (8 * (N + 1))))
+    V = np.empty((bloque, N + 1))
+    k = 0
+    convergio = False
+    while k <= k_max and not convergio:
+        # Llenar el bloque con v_k, v_{k+1}, ... (un paso tridiagonal por fila)
+        filas = 0
+        while filas < bloque and k + filas <= k_max:
+            V[filas] = v
+            filas += 1
+            siguiente = np.empty_like(v)
+            siguiente[1:] = subir * v[:-1]
+            siguiente[0] = bajar * v[0]  # Vacío: el servicio es ficticio
+            siguiente[:-1] += bajar * v[1:]
+            siguiente[-1] += subir * v[-1]  # Lleno: la llegada se bloquea
+            v = siguiente
+        k_inicio, k_fin = k, k + filas
+        k = k_fin
+        # Convergencia revisada por bloque: v_k para k ≥ k_fin ya es la estacionaria
+        convergio = np.abs(v - pi).sum() < tol
+
+        # Solo los tiempos cuya ventana de Poisson toca este bloque
+        activos = np.nonzero((izquierda < k_fin) & (derecha >= k_inicio))[0]
+        if activos.size == 0:
+            continue
+        ks = np.arange(k_inicio, k_fin)
+        with np.errstate(invalid="ignore"):
+            log_peso = -qt[activos, None] + np.where(ks == 0, 0.0, ks * log_qt[activos, None]) - log_factorial[ks]
+        pesos = np.where(qt[activos, None] > 0, np.exp(log_peso), (ks == 0).astype(float))
+        peso_acumulado[activos] += pesos.sum(axis=1)
+        curvas[activos] += pesos @ (V[:filas] @ proyeccion)
+        if P is not None:
+            P[activos] += pesos @ V[:filas]
+
+    if convergio:
+        # El peso de Poisson que queda después de la convergencia va a la estacionaria
+        resto = np.clip(1 - peso_acumulado, 0, None)
+        curvas += resto[:, None] * (pi @ proyeccion)
+        if P is not None:
+            P += resto[:, None] * pi
+    else:
+        # Se renormaliza por la cola de Poisson truncada
+        curvas /= peso_acumulado[:, None]
+        if P is not None:
+            P /= peso_acumulado[:, None]
+
+    contar("pasos_uniformizacion", k)
+    contar("estados", N + 1)
+    L, Po, P_N = curvas.T
+    return {
+        "lambda": lambda_,
+        "mu": mu,
+        "N": N,
+        "rho": lambda_ / mu,
+        "estado_inicial": estado_inicial if np.ndim(estado_inicial) == 0 else None,
+        "tiempos": tiempos,
+        "L": L,
+        "Lq": L - (1 - Po),
+        "Po": Po,
+        "prob_bloqueo": P_N,
+        "P": P,
+        "pasos": k,
+        "convergio": convergio,
+        "estacionario": estacionario,
+    }
+
+def distribucion_en(transitorio, i):
+    """DistribucionTabulada de P(n, t_i) para mostrarla en tablas y reportes."""
+    if transitorio["P"] is None:
+        raise ErrorModeloColas("el cálculo se hizo sin guardar las distribuciones P(n, t)")
+    return DistribucionTabulada(transitorio["P"][i])
+
+def interpretar_tiempos(texto, max_puntos=10000):
+    """Lee "inicio:fin:puntos" (equiespaciados) o una lista separada por comas."""
+    texto = texto.strip()
+    if ":" in texto:
+        inicio, fin, puntos = texto.split(":")
+        puntos = int(puntos)
+        if not 1 <= puntos <= max_puntos:
+            raise ValueError(f"la cantidad de puntos tiene que estar entre 1 y {max_puntos}")
+        return np.linspace(float(inicio), float(fin), puntos)
+    tiempos = np.array([float(parte) for parte in texto.replace(";", ",").split(",") if parte.strip()])
+    if not 1 <= tiempos.size <= max_puntos:
+        raise ValueError(f"hay que indicar entre 1 y {max_puntos} tiempos")
+    return tiempos